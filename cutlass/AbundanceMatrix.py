@@ -4,7 +4,6 @@ Models the abundance matrix object.
 
 # pylint: disable=W0703, C1801
 
-import json
 import logging
 import os
 import string
@@ -471,6 +470,7 @@ class AbundanceMatrix(Base):
         return ("checksums", "comment", "format", "format_doc",
                 "matrix_type", "size", "study")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -532,26 +532,28 @@ class AbundanceMatrix(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"abundance_matrix"[node_type]':
-            query = '({}) && "abundance_matrix"[node_type]'.format(query)
+        return list(AbundanceMatrix.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        matrix_data = session.get_osdf().oql_query(AbundanceMatrix.namespace, query)
+    @staticmethod
+    def iter_search(query="\"abundance_matrix\"[node_type]"):
+        """
+        Searches OSDF for AbundanceMatrix nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = matrix_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         AbundanceMatrix node type.
 
-        result_list = list()
+        Returns:
+            An iterator of AbundanceMatrix objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                matrix_result = AbundanceMatrix.load(result['id'])
-                result_list.append(matrix_result)
+        loader = AbundanceMatrix.load_abundance_matrix
 
-        return result_list
+        return AbundanceMatrix._iter_search("abundance_matrix", query, loader)
 
     @staticmethod
     def load_abundance_matrix(matrix_data):
@@ -736,9 +738,9 @@ class AbundanceMatrix(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -767,8 +769,7 @@ class AbundanceMatrix(Base):
                 osdf.edit_node(matrix_data)
                 self.logger.info("Update for %s %s successful.", __name__, matrix_id)
 
-                matrix_data = osdf.get_node(matrix_id)
-                latest_version = matrix_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now %s", __name__, str(latest_version))
                 self._version = latest_version
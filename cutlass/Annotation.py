@@ -2,12 +2,11 @@
 Models the annotation object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Base import Base
 from cutlass.aspera import aspera
 from cutlass.Util import *
@@ -568,6 +567,7 @@ class Annotation(Base):
         return ("annotation_pipeline", "checksums", "format", "format_doc",
                 "orf_process", "size", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -629,26 +629,28 @@ class Annotation(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"annotation"[node_type]':
-            query = '({}) && "annotation"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(Annotation.iter_search(query))
 
-        annot_data = session.get_osdf().oql_query(Annotation.namespace, query)
+    @staticmethod
+    def iter_search(query="\"annotation\"[node_type]"):
+        """
+        Searches OSDF for Annotation nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        all_results = annot_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Annotation node type.
 
-        result_list = list()
+        Returns:
+            An iterator of Annotation objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                annot_result = Annotation.load_annotation(result)
-                result_list.append(annot_result)
+        loader = Annotation.load_annotation
 
-        return result_list
+        return Annotation._iter_search("annotation", query, loader)
 
     @staticmethod
     def load_annotation(annot_data):
@@ -815,9 +817,9 @@ class Annotation(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -844,8 +846,7 @@ class Annotation(Base):
                 osdf.edit_node(annot_data)
                 self.logger.info("Update for %s %s successful.", __name__, annot_id)
 
-                annot_data = osdf.get_node(annot_id)
-                latest_version = annot_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__,
@@ -869,18 +870,7 @@ class Annotation(Base):
 
         linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
 
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.ClusteredSeqSet import ClusteredSeqSet
 
-        for page_no in count(1):
-            res = query(Annotation.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield ClusteredSeqSet.load_clustered_seq_set(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in Paginator(Annotation.namespace, linkage_query):
+            yield ClusteredSeqSet.load_clustered_seq_set(doc)
@@ -0,0 +1,147 @@
+"""
+The AsyncIHMPSession module provides an iHMP session that can keep many
+OSDF requests in flight at once. Operations are submitted to a pool of
+worker threads, each borrowing a keep-alive connection from the session's
+connection pool, and a handle to the pending result is returned
+immediately.
+"""
+
+import logging
+from multiprocessing.pool import ThreadPool
+from cutlass.iHMPSession import iHMPSession
+from cutlass.SchemaValidator import DEFAULT_CACHE_DIR
+
+class AsyncIHMPSession(iHMPSession):
+    """
+    An iHMP session for asynchronous work. In addition to everything an
+    iHMPSession offers, work can be submitted to the session's worker
+    threads with submit() and map(), and node objects gain asynchronous
+    counterparts of their save(), load(), search() and delete() methods
+    (save_async(), load_async(), search_async() and delete_async()), as
+    well as collect_async() for their child iterators.
+
+    Each asynchronous call returns a multiprocessing AsyncResult. Call get()
+    on it to wait for and retrieve the value (or re-raise the exception) of
+    the operation, or use gather() to wait on many at once.
+    """
+
+    def __init__(self, username, password, server="osdf.ihmpdcc.org", port=8123,
+                 ssl=True, concurrency=8, cache_size=None, cache_ttl=None,
+                 local_validation=False, schema_cache_dir=DEFAULT_CACHE_DIR,
+                 retry_policy=None, circuit_breaker=None):
+        """
+        The initialization of the AsyncIHMPSession for the user.
+
+        Args:
+            username (str): The username for OSDF access.
+            password (str): The password for OSDF access.
+            server (str): The server domain name containing the OSDF instance.
+                          Defaults to 'osdf.ihmpdcc.org'.
+            port (int): The port allowing access to the OSDF instance.
+            ssl (bool): Whether the OSDF server is behind SSL/TLS or not.
+                        Defaults to true.
+            concurrency (int): The maximum number of OSDF requests to have
+                               in flight at once. Defaults to 8.
+            cache_size (int): If provided, the maximum number of nodes to
+                              keep in the session's node cache. Defaults to
+                              no caching.
+            cache_ttl (float): The number of seconds cached entries remain
+                               valid. Defaults to no expiry.
+            local_validation (bool): Whether to validate documents on the
+                                     client rather than the server. Defaults
+                                     to false.
+            schema_cache_dir (str): The directory in which fetched schemas
+                                    are cached between sessions.
+            retry_policy (RetryPolicy): If provided, how to retry OSDF calls
+                                        that fail transiently.
+            circuit_breaker (CircuitBreaker): If provided, the breaker that
+                                              stops OSDF calls while the
+                                              server is down.
+        """
+        super(AsyncIHMPSession, self).__init__(username, password,
+                                               server=server, port=port,
+                                               ssl=ssl, pool_size=concurrency,
+                                               cache_size=cache_size,
+                                               cache_ttl=cache_ttl,
+                                               local_validation=local_validation,
+                                               schema_cache_dir=schema_cache_dir,
+                                               retry_policy=retry_policy,
+                                               circuit_breaker=circuit_breaker)
+
+        self.logger = logging.getLogger(self.__module__ + '.' + \
+                                        self.__class__.__name__)
+
+        self._concurrency = concurrency
+        self._workers = ThreadPool(concurrency)
+
+    @property
+    def concurrency(self):
+        """
+        int: The maximum number of operations the session runs at once.
+        """
+        self.logger.debug("In 'concurrency' getter.")
+        return self._concurrency
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Schedules func(*args, **kwargs) to run on one of the session's
+        worker threads.
+
+        Args:
+            func (callable): The function to run.
+
+        Returns:
+            An AsyncResult for the eventual return value of func.
+        """
+        self.logger.debug("In submit.")
+        return self._workers.apply_async(func, args, kwargs)
+
+    def map(self, func, iterable):
+        """
+        Schedules func to be applied to every item of iterable on the
+        session's worker threads.
+
+        Args:
+            func (callable): The function to apply.
+            iterable (iterable): The items to apply func to.
+
+        Returns:
+            An AsyncResult for the list of return values, in input order.
+        """
+        self.logger.debug("In map.")
+        return self._workers.map_async(func, iterable)
+
+    @staticmethod
+    def gather(results, timeout=None):
+        """
+        Waits for several pending operations to complete.
+
+        Args:
+            results (list): The AsyncResults to wait on.
+            timeout (float): How many seconds to wait for each result.
+                             Defaults to waiting forever.
+
+        Returns:
+            A list of the values of the operations, in the same order as the
+            provided results. If any operation raised an exception, it is
+            re-raised here.
+        """
+        return [result.get(timeout) for result in results]
+
+    def close(self):
+        """
+        Waits for all submitted work to finish, then shuts down the worker
+        threads and closes the pooled connections. No further work may be
+        submitted afterwards.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.logger.debug("In close.")
+
+        self._workers.close()
+        self._workers.join()
+        self._osdf.close()
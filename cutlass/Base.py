@@ -3,6 +3,7 @@ import logging
 from osdf import OSDF
 from itertools import islice
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Util import *
 
 # Create a module logger named after the module
@@ -238,13 +239,76 @@ class Base(object):
 
         self.logger.info("Got iHMP session.")
 
+    @classmethod
+    def _iter_search(cls, node_type, query, loader):
+        """
+        Builds the Paginator behind the iter_search() method of each node
+        class. The query is restricted to nodes of the given node type.
+        """
+        type_query = '"{}"[node_type]'.format(node_type)
+
+        if query != type_query:
+            query = '({}) && {}'.format(query, type_query)
+
+        module_logger.debug("Submitting OQL query: %s", query)
+
+        return Paginator(cls.namespace, query, loader)
+
+    def _linked_query(self, edge, types=None):
+        """
+        Builds the OQL query for the nodes linked to this node through the
+        given edge, restricted, when types are given, to those node types so
+        that OSDF does the filtering.
+        """
+        return linkage_query([self._id], edge, types)
+
+    def _linked_docs(self, edge, types=None):
+        """
+        Returns a Paginator over the documents of the nodes linked to this
+        node through the given edge, optionally only those of the given node
+        types.
+        """
+        return Paginator(self.namespace, self._linked_query(edge, types))
+
+    def linked(self, edge, types=None):
+        """
+        Iterates over the nodes linked to this node through the given edge,
+        such as "prepared_from" or "derived_from". Filtering by node type is
+        done by OSDF, so documents of other types are never retrieved.
+
+        Args:
+            edge (str): The name of the linkage pointing at this node.
+            types (list): The node types to include, such as
+                          ["wgs_dna_prep"]. Defaults to all node types.
+
+        Returns:
+            A Paginator yielding an object of the appropriate class for each
+            linked node.
+        """
+        self.logger.debug("In linked. Edge: %s", edge)
+
+        if self._id is None:
+            raise Exception("Node does not have an ID.")
+
+        session = iHMPSession.get_session()
+        query = self._linked_query(edge, types)
+
+        return Paginator(self.namespace, query, session.load_document)
+
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object. The object must already have been saved/present
         in the OSDF instance, so an ID for the object must have been already set.
+        Every node class's delete() is decorated with recursive_delete, which
+        adds the following arguments.
 
         Args:
-            None
+            recursive (bool): Whether to delete every node beneath this one
+                              along with it. See delete_tree(). Defaults to
+                              false.
+            concurrency (int): The maximum number of simultaneous
+                               deletions when deleting recursively.
 
         Returns:
             True if the object was successfully deleted, False otherwise
@@ -276,26 +340,370 @@ class Base(object):
 
         return success
 
-    def children(self, flatten=False):
-        """ Returns the children of this node. """
+    def delete_tree(self, concurrency=8):
+        """
+        Deletes this node along with every node beneath it, as found by
+        children(). As nodes are deleted from the leaves up, the whole
+        subtree is first retrieved with snapshot(), and held in memory until
+        the deletions are done. The nodes of each level are then deleted
+        concurrently.
+
+        Args:
+            concurrency (int): The maximum number of simultaneous deletions.
+                               Defaults to 8.
+
+        Returns:
+            A tuple with the list of nodes that were deleted and a list of
+            (node, reason) tuples for those that were not. A node that is
+            still linked to by a node that could not be deleted is not
+            attempted.
+        """
+        self.logger.debug("In delete_tree.")
+
+        if self._id is None:
+            self.logger.warn("Attempt to delete a node with no ID.")
+            raise Exception("Node does not have an ID.")
+
+        nodes = list(self.snapshot())
+
+        self.logger.info("Deleting %s and %s nodes beneath it.", self, len(nodes) - 1)
+
+        session = iHMPSession.get_session()
+        (deleted, failed) = session.delete_all(nodes, concurrency)
+
+        self.logger.info("Deleted %s nodes. Unable to delete %s nodes.",
+                         len(deleted), len(failed))
+
+        for (node, reason) in failed:
+            self.logger.error("Unable to delete %s. Reason: %s", node, reason)
+
+        return (deleted, failed)
+
+    def _get_updated_version(self):
+        """
+        Determines the version of this node after a successful edit_node().
+        OSDF increments the version of a node by one with every update, so
+        the new version is normally derived without another request. If the
+        session is set to verify versions, or the current version is not
+        known, the node is retrieved from OSDF instead.
+
+        Args:
+            None
+
+        Returns:
+            The new version of the node.
+        """
+        session = iHMPSession.get_session()
+
+        if self._version is None or session.verify_versions:
+            self.logger.debug("Retrieving the new version of %s.", self._id)
+            return session.get_osdf().get_node(self._id)['ver']
+
+        return self._version + 1
+
+    @staticmethod
+    def _get_async_session():
+        """
+        Returns the current session, making sure it is able to run
+        asynchronous operations.
+        """
+        from cutlass.AsyncIHMPSession import AsyncIHMPSession
+
+        session = iHMPSession.get_session()
+
+        if not isinstance(session, AsyncIHMPSession):
+            raise Exception("Asynchronous operations require an AsyncIHMPSession.")
+
+        return session
+
+    def save_async(self):
+        """
+        Schedules save() to run on one of the session's worker threads. The
+        current session must be an AsyncIHMPSession.
+
+        Args:
+            None
+
+        Returns:
+            An AsyncResult whose value is the return value of save().
+        """
+        self.logger.debug("In save_async.")
+        return self._get_async_session().submit(self.save)
+
+    def delete_async(self):
+        """
+        Schedules delete() to run on one of the session's worker threads. The
+        current session must be an AsyncIHMPSession.
+
+        Args:
+            None
+
+        Returns:
+            An AsyncResult whose value is the return value of delete().
+        """
+        self.logger.debug("In delete_async.")
+        return self._get_async_session().submit(self.delete)
+
+    @classmethod
+    def load_async(cls, node_id):
+        """
+        Schedules the loading of a node of this class on one of the session's
+        worker threads. The current session must be an AsyncIHMPSession.
+
+        Args:
+            node_id (str): The OSDF ID for the document to load.
+
+        Returns:
+            An AsyncResult whose value is the loaded object.
+        """
+        module_logger.debug("In load_async. Specified ID: %s", node_id)
+        return cls._get_async_session().submit(cls.load, node_id)
+
+    @classmethod
+    def load_many(cls, node_ids, concurrency=8):
+        """
+        Loads many nodes of this class concurrently, rather than one
+        load() round trip after another.
+
+        Args:
+            node_ids (list): The OSDF IDs of the documents to load.
+            concurrency (int): The maximum number of simultaneous requests
+                               to OSDF. Defaults to 8.
+
+        Returns:
+            A tuple with the list of loaded objects, in the same order as
+            node_ids, and a dict mapping the IDs that could not be loaded to
+            the exception explaining why. The entries for those IDs in the
+            list are None.
+        """
+        module_logger.debug("In load_many. Loading %s nodes.", len(node_ids))
+
+        outcomes = run_concurrently(cls.load, node_ids, concurrency)
+
+        return collect_outcomes(node_ids, outcomes)
+
+    @classmethod
+    def search_async(cls, query=None):
+        """
+        Schedules a search for nodes of this class on one of the session's
+        worker threads. The current session must be an AsyncIHMPSession.
+
+        Args:
+            query (str): The OQL query to search with. Defaults to all nodes
+                         of this class.
+
+        Returns:
+            An AsyncResult whose value is the list of matching objects.
+        """
+        module_logger.debug("In search_async.")
+
+        session = cls._get_async_session()
+
+        if query is None:
+            return session.submit(cls.search)
+
+        return session.submit(cls.search, query)
+
+    def collect_async(self, accessor, *args):
+        """
+        Schedules one of this node's iterators, such as Subject.visits() or
+        Sample.preps(), to be exhausted on one of the session's worker
+        threads. The current session must be an AsyncIHMPSession.
+
+        Args:
+            accessor (str): The name of the iterator method to run.
+
+        Returns:
+            An AsyncResult whose value is the list of yielded objects.
+        """
+        self.logger.debug("In collect_async. Accessor: %s", accessor)
+
+        method = getattr(self, accessor)
+
+        return self._get_async_session().submit(lambda: list(method(*args)))
+
+    def parents(self, concurrency=8):
+        """
+        Retrieves the nodes this node links to, such as the visit a sample
+        was collected during.
+
+        Args:
+            concurrency (int): The maximum number of simultaneous requests
+                               to OSDF. Defaults to 8.
+
+        Returns:
+            A list of objects of the appropriate classes.
+        """
+        self.logger.debug("In parents.")
+
+        session = iHMPSession.get_session()
+
+        return session.ancestors_of([self], max_depth=1,
+                                    concurrency=concurrency)[self._id]
+
+    def ancestors(self, until=None, concurrency=8):
+        """
+        Retrieves the nodes above this node, following its links up level by
+        level, such as the prep, sample, visit, subject and study above a
+        sequence set. See iHMPSession.ancestors_of() for doing this for many
+        nodes at once.
+
+        Args:
+            until (str): A node type, or list of node types, above which not
+                         to go, such as "subject". Defaults to following the
+                         links all the way up.
+            concurrency (int): The maximum number of simultaneous requests
+                               to OSDF. Defaults to 8.
+
+        Returns:
+            A list of objects of the appropriate classes, nearest first.
+        """
+        self.logger.debug("In ancestors.")
+
+        session = iHMPSession.get_session()
+
+        return session.ancestors_of([self], until=until,
+                                    concurrency=concurrency)[self._id]
+
+    def snapshot(self, max_depth=None, types=None, exclude_types=None,
+                 chunk_size=50, concurrency=8):
+        """
+        Retrieves this node and the nodes beneath it into an in-memory graph.
+        The tree is walked breadth first, and the children of all the nodes
+        of a level are retrieved with a few batched queries run
+        concurrently, rather than a query per node.
+
+        Args:
+            max_depth (int): How many levels beneath this node to retrieve.
+                             Defaults to all of them.
+            types (list): The node types to retrieve, such as ["visit",
+                          "sample"]. Nodes of other types, and the nodes
+                          beneath them, are left out. Defaults to all types.
+            exclude_types (list): Node types to leave out, along with the
+                                  nodes beneath them.
+            chunk_size (int): The maximum number of parents per query.
+                              Defaults to 50.
+            concurrency (int): The maximum number of simultaneous queries.
+                               Defaults to 8.
+
+        Returns:
+            A Snapshot, which can be iterated over, queried for the children,
+            parents or types of its nodes, and serialized.
+        """
+        self.logger.debug("In snapshot.")
+
+        # local import to avoid cyclic imports
+        from cutlass.Snapshot import Snapshot
+
+        return Snapshot.build(self, max_depth=max_depth, types=types,
+                              exclude_types=exclude_types,
+                              chunk_size=chunk_size, concurrency=concurrency)
+
+    def export(self, stream, max_depth=None, exclude_types=None,
+               chunk_size=50, concurrency=8):
+        """
+        Writes this node and the nodes beneath it to a stream as newline
+        delimited JSON, one OSDF document per line. Nodes are written as
+        they are retrieved, in batches, so the tree is never held in memory.
+
+        Args:
+            stream (file): The stream to write to, such as sys.stdout.
+            max_depth (int): How many levels beneath this node to export.
+                             Defaults to all of them.
+            exclude_types (list): Node types to leave out, along with the
+                                  nodes beneath them.
+            chunk_size (int): The maximum number of parents per query.
+                              Defaults to 50.
+            concurrency (int): The maximum number of simultaneous queries.
+                               Defaults to 8.
+
+        Returns:
+            The number of nodes written.
+        """
+        self.logger.debug("In export.")
+
+        # local import to avoid cyclic imports
+        from cutlass.export import export_tree
+
+        return export_tree(self, stream, max_depth=max_depth,
+                           exclude_types=exclude_types,
+                           chunk_size=chunk_size, concurrency=concurrency)
+
+    def children(self, flatten=False, max_depth=None, include_types=None,
+                 exclude_types=None, parallel=None, ordered=False):
+        """
+        Returns the children of this node.
+
+        By default, a lazily evaluated nested structure of generators is
+        returned. With flatten, the same depth-first traversal is returned as
+        a flat generator, still retrieving each node's children only as it
+        is reached; a node with several parents is yielded under each of
+        them. With max_depth, include_types or exclude_types, the nodes are
+        instead retrieved level by level with snapshot(), held in memory,
+        and returned breadth first, each node once. Branches that cannot
+        lead to a wanted node are pruned before they are queried.
+
+        Args:
+            flatten (bool): Whether to return a flat iterator.
+            max_depth (int): How many levels beneath this node to descend.
+            include_types (list): The node types to return, such as
+                                  ["16s_raw_seq_set"]. Only the branches
+                                  that can lead to these types are walked.
+            exclude_types (list): Node types to skip, along with everything
+                                  beneath them, such as ["sample_attr"].
+            parallel (int): If provided, the children of this many nodes
+                            are retrieved at once on a pool of threads, and
+                            a flat iterator yields the nodes as they arrive.
+                            Cannot be combined with include_types or
+                            exclude_types.
+            ordered (bool): With parallel, whether to yield the nodes in
+                            the same depth-first order as the sequential
+                            traversal. Defaults to false.
+
+        Returns:
+            An iterator of the child nodes.
+        """
         self.logger.debug("In children.")
 
         # local imports to avoid cyclic imports
-        from .dependency import dependency_methods
-        from .dependency import generator_flatten
+        from .dependency import dependencies, generator_flatten
+        from .dependency import parallel_walk, types_leading_to
+
+        if parallel is not None:
+            if include_types is not None or exclude_types is not None:
+                raise ValueError("Parallel traversal does not support " + \
+                                 "include_types or exclude_types.")
+
+            return parallel_walk(self, parallel, ordered, max_depth)
+
+        if max_depth is not None or include_types is not None or \
+           exclude_types is not None:
+            types = None
+
+            if include_types is not None:
+                types = types_leading_to(include_types, exclude_types)
+
+            # Retrieved level by level rather than node by node
+            snapshot = self.snapshot(max_depth, types, exclude_types)
+            nodes = snapshot.descendants()
+
+            if include_types is not None:
+                nodes = [node for node in nodes
+                         if snapshot.node_type(node) in include_types]
+
+            return iter(nodes)
 
         def _children(obj):
             yield obj
-            name = obj.__class__.__name__
-            dep_method = getattr(obj, dependency_methods.get(name, ''), None)
-            if dep_method:
-                for child in dep_method():
-                    yield _children(child)
-        cs = islice(_children(self), 1, None)
+            for child in dependencies(obj):
+                yield _children(child)
+
+        nested = islice(_children(self), 1, None)
+
         if flatten:
-            return generator_flatten(cs)
-        else:
-            return cs
+            return generator_flatten(nested)
+
+        return nested
 
     def __call__(self):
         return self
@@ -4,7 +4,6 @@ Models the clustered sequence set object.
 
 # pylint: disable=W0703, C1801
 
-import json
 import logging
 import os
 import string
@@ -536,6 +535,7 @@ class ClusteredSeqSet(Base):
         return ("checksums", "clustering_process", "comment", "format",
                 "local_file", "sequence_type", "size", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -597,28 +597,28 @@ class ClusteredSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        # Searching without any parameters will return all different results
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"clustered_seq_set"[node_type]':
-            query = '({}) && "clustered_seq_set"[node_type]'.format(query)
+        return list(ClusteredSeqSet.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        # css = clustered seq set
-        css_data = session.get_osdf().oql_query(ClusteredSeqSet.namespace, query)
+    @staticmethod
+    def iter_search(query="\"clustered_seq_set\"[node_type]"):
+        """
+        Searches OSDF for ClusteredSeqSet nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = css_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         ClusteredSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of ClusteredSeqSet objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                css_result = ClusteredSeqSet.load_clustered_seq_set(result)
-                result_list.append(css_result)
+        loader = ClusteredSeqSet.load_clustered_seq_set
 
-        return result_list
+        return ClusteredSeqSet._iter_search("clustered_seq_set", query, loader)
 
     @staticmethod
     def load_clustered_seq_set(css_data):
@@ -778,9 +778,9 @@ class ClusteredSeqSet(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -811,8 +811,7 @@ class ClusteredSeqSet(Base):
                 osdf.edit_node(css_data)
                 self.logger.info("Update for %s %s successful.", __name__, css_id)
 
-                css_data = osdf.get_node(css_id)
-                latest_version = css_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version)
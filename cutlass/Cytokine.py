@@ -2,7 +2,6 @@
 Models the cytokine object.
 """
 
-import json
 import logging
 import os
 import string
@@ -398,6 +397,7 @@ class Cytokine(Base):
         module_logger.debug("In required fields.")
         return ("checksums", "local_file", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -459,27 +459,26 @@ class Cytokine(Base):
         """
         module_logger.debug("In search.")
 
-        # Searching without any parameters will return all different results
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"cytokine"[node_type]':
-            query = '({}) && "cytokine"[node_type]'.format(query)
+        return list(Cytokine.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        cyto_data = session.get_osdf().oql_query(Cytokine.namespace, query)
-
-        all_results = cyto_data['results']
+    @staticmethod
+    def iter_search(query="\"cytokine\"[node_type]"):
+        """
+        Searches OSDF for Cytokine nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Cytokine node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                cyto_result = Cytokine.load_cytokine(result)
-                result_list.append(cyto_result)
+        Returns:
+            An iterator of Cytokine objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Cytokine._iter_search("cytokine", query, Cytokine.load_cytokine)
 
     @staticmethod
     def load_cytokine(cyto_data):
@@ -635,9 +634,9 @@ class Cytokine(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new " + __name__ + " OSDF node.")
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -665,8 +664,7 @@ class Cytokine(Base):
                 osdf.edit_node(cyto_data)
                 self.logger.info("Update for %s %s successful.", __name__, cyto_id)
 
-                cyto_data = osdf.get_node(cyto_id)
-                latest_version = cyto_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version))
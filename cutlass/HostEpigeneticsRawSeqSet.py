@@ -2,7 +2,6 @@
 This module models the host epigenetics raw sequence set object.
 """
 
-import json
 import logging
 import os
 import string
@@ -575,27 +574,30 @@ class HostEpigeneticsRawSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"host_epigenetics_raw_seq_set"[node_type]':
-            query = '({}) && "host_epigenetics_raw_seq_set"[node_type]'.format(query)
+        return list(HostEpigeneticsRawSeqSet.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        raw_seq_set_data = session.get_osdf().oql_query("ihmp", query)
+    @staticmethod
+    def iter_search(query="\"host_epigenetics_raw_seq_set\"[node_type]"):
+        """
+        Searches OSDF for HostEpigeneticsRawSeqSet nodes, just like
+        search(), but rather than retrieving every result up front, streams
+        them from OSDF one page at a time as they are consumed.
 
-        all_results = raw_seq_set_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         HostEpigeneticsRawSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of HostEpigeneticsRawSeqSet objects, with the total
+            number of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                raw_seq_set_result = HostEpigeneticsRawSeqSet. \
-                                      load_host_epigenetics_raw_seq_set(result)
-                result_list.append(raw_seq_set_result)
+        loader = HostEpigeneticsRawSeqSet.load_host_epigenetics_raw_seq_set
 
-        return result_list
+        return HostEpigeneticsRawSeqSet._iter_search(
+            "host_epigenetics_raw_seq_set", query, loader
+        )
 
     @staticmethod
     def load_host_epigenetics_raw_seq_set(seq_set_data):
@@ -753,9 +755,9 @@ class HostEpigeneticsRawSeqSet(Base):
         if self.id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.info("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.info("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -786,8 +788,7 @@ class HostEpigeneticsRawSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now %s",
                                   __name__, str(latest_version)
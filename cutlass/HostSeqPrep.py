@@ -3,10 +3,10 @@ This module models the HostSeqPrep object.
 """
 
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.mims import MIMS, MimsException
 from cutlass.Base import Base
+from cutlass.registry import load_document
 from cutlass.Util import *
 
 # pylint: disable=W0703, R0912, R0915, C1801
@@ -1025,6 +1025,7 @@ class HostSeqPrep(Base):
             try:
                 self.logger.info("Attempting to update %s with ID: %s.", __name__, self._id)
                 session.get_osdf().edit_node(prep_data)
+                self._version = self._get_updated_version()
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
                 success = True
             except Exception as edit_exception:
@@ -1058,43 +1059,33 @@ class HostSeqPrep(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"host_seq_prep"[node_type]':
-            query = '({}) && "host_seq_prep"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(HostSeqPrep.iter_search(query))
 
-        prep_data = session.get_osdf().oql_query(HostSeqPrep.namespace, query)
+    @staticmethod
+    def iter_search(query="\"host_seq_prep\"[node_type]"):
+        """
+        Searches OSDF for HostSeqPrep nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        all_results = prep_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         HostSeqPrep node type.
 
-        result_list = list()
+        Returns:
+            An iterator of HostSeqPrep objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                prep_result = HostSeqPrep.load_host_seq_prep(result)
-                result_list.append(prep_result)
+        loader = HostSeqPrep.load_host_seq_prep
 
-        return result_list
+        return HostSeqPrep._iter_search("host_seq_prep", query, loader)
 
-    def _derived_docs(self):
+    def _derived_docs(self, types=None):
         self.logger.debug("In _derived_docs().")
 
-        linkage_query = '"{}"[linkage.sequenced_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(HostSeqPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("sequenced_from", types)
 
     def derivations(self):
         """
@@ -1102,14 +1093,9 @@ class HostSeqPrep(Base):
         """
         self.logger.debug("In derivations().")
 
-        from cutlass.HostWgsRawSeqSet import HostWgsRawSeqSet
-        from cutlass.HostTranscriptomicsRawSeqSet import HostTranscriptomicsRawSeqSet
-        from cutlass.HostEpigeneticsRawSeqSet import HostEpigeneticsRawSeqSet
-
-        for doc in self._derived_docs():
-            if doc['node_type'] == "host_transcriptomics_raw_seq_set":
-                yield HostTranscriptomicsRawSeqSet.load_host_transcriptomics_raw_seq_set(doc)
-            elif doc['node_type'] == "host_wgs_raw_seq_set":
-                yield HostWgsRawSeqSet.load_hostWgsRawSeqSet(doc)
-            elif doc['node_type'] == "host_epigenetics_raw_seq_set":
-                yield HostEpigeneticsRawSeqSet.load_host_epigenetics_raw_seq_set(doc)
+        derived_types = ["host_transcriptomics_raw_seq_set",
+                         "host_wgs_raw_seq_set",
+                         "host_epigenetics_raw_seq_set"]
+
+        for doc in self._derived_docs(derived_types):
+            yield load_document(doc)
@@ -2,13 +2,12 @@
 This module models the host transcriptomics raw sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
+from cutlass.registry import load_document
 from cutlass.aspera import aspera
 from cutlass.Util import *
 
@@ -545,27 +544,30 @@ class HostTranscriptomicsRawSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"host_transcriptomics_raw_seq_set"[node_type]':
-            query = '({}) && "host_transcriptomics_raw_seq_set"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(HostTranscriptomicsRawSeqSet.iter_search(query))
 
-        raw_seq_set_data = session.get_osdf().oql_query("ihmp", query)
+    @staticmethod
+    def iter_search(query="\"host_transcriptomics_raw_seq_set\"[node_type]"):
+        """
+        Searches OSDF for HostTranscriptomicsRawSeqSet nodes, just like
+        search(), but rather than retrieving every result up front, streams
+        them from OSDF one page at a time as they are consumed.
 
-        all_results = raw_seq_set_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         HostTranscriptomicsRawSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of HostTranscriptomicsRawSeqSet objects, with the
+            total number of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                raw_seq_set_result = HostTranscriptomicsRawSeqSet. \
-                                      load_host_transcriptomics_raw_seq_set(result)
-                result_list.append(raw_seq_set_result)
+        loader = HostTranscriptomicsRawSeqSet.load_host_transcriptomics_raw_seq_set
 
-        return result_list
+        return HostTranscriptomicsRawSeqSet._iter_search(
+            "host_transcriptomics_raw_seq_set", query, loader
+        )
 
     @staticmethod
     def load_host_transcriptomics_raw_seq_set(seq_set_data):
@@ -723,9 +725,9 @@ class HostTranscriptomicsRawSeqSet(Base):
         if self.id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.info("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.info("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -756,8 +758,7 @@ class HostTranscriptomicsRawSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now %s",
                                   __name__, str(latest_version)
@@ -776,22 +777,10 @@ class HostTranscriptomicsRawSeqSet(Base):
         return success
 
 
-    def _derived_docs(self):
+    def _derived_docs(self, types=None):
         self.logger.debug("In _derived_docs().")
 
-        linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(HostTranscriptomicsRawSeqSet.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("computed_from", types)
 
     def derivations(self):
         """
@@ -800,9 +789,6 @@ class HostTranscriptomicsRawSeqSet(Base):
         """
         self.logger.debug("In derivations().")
 
-        from cutlass.AbundanceMatrix import AbundanceMatrix
-
-        for doc in self._derived_docs():
-            if doc['node_type'] == "abundance_matrix":
-                yield AbundanceMatrix.load_abundance_matrix(doc)
+        for doc in self._derived_docs(["abundance_matrix"]):
+            yield load_document(doc)
    
@@ -2,7 +2,6 @@
 This module models the host variant call object.
 """
 
-import json
 import logging
 import os
 import string
@@ -571,26 +570,28 @@ class HostVariantCall(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"host_variant_call"[node_type]':
-            query = '({}) && "host_variant_call"[node_type]'.format(query)
+        return list(HostVariantCall.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        data = session.get_osdf().oql_query("ihmp", query)
+    @staticmethod
+    def iter_search(query="\"host_variant_call\"[node_type]"):
+        """
+        Searches OSDF for HostVariantCall nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         HostVariantCall node type.
 
-        result_list = list()
+        Returns:
+            An iterator of HostVariantCall objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                loaded_result = HostVariantCall.load_host_variant_call(result)
-                result_list.append(loaded_result)
+        loader = HostVariantCall.load_host_variant_call
 
-        return result_list
+        return HostVariantCall._iter_search("host_variant_call", query, loader)
 
     @staticmethod
     def load_host_variant_call(call_data):
@@ -749,9 +750,9 @@ class HostVariantCall(Base):
         if self.id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.info("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.info("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -782,8 +783,7 @@ class HostVariantCall(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now %s",
                                   __name__, str(latest_version)
@@ -2,7 +2,6 @@
 Models the HostWgsRawSeqSet object.
 """
 
-import json
 import logging
 import os
 import string
@@ -548,26 +547,30 @@ class HostWgsRawSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"host_wgs_raw_seq_set"[node_type]':
-            query = '({}) && "host_wgs_raw_seq_set"[node_type]'.format(query)
+        return list(HostWgsRawSeqSet.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        seqSet_data = session.get_osdf().oql_query("ihmp", query)
+    @staticmethod
+    def iter_search(query="\"host_wgs_raw_seq_set\"[node_type]"):
+        """
+        Searches OSDF for HostWgsRawSeqSet nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = seqSet_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         HostWgsRawSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of HostWgsRawSeqSet objects, with the total number
+            of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for hit in all_results:
-                result = HostWgsRawSeqSet.load_hostWgsRawSeqSet(hit)
-                result_list.append(result)
+        loader = HostWgsRawSeqSet.load_hostWgsRawSeqSet
 
-        return result_list
+        return HostWgsRawSeqSet._iter_search(
+            "host_wgs_raw_seq_set", query, loader
+        )
 
     @staticmethod
     def load_hostWgsRawSeqSet(seq_set_data):
@@ -726,9 +729,9 @@ class HostWgsRawSeqSet(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -760,8 +763,7 @@ class HostWgsRawSeqSet(Base):
                                  __name__, seq_set_id
                                 )
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug(
                     "The version of this %s is now: %s",
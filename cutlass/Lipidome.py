@@ -2,7 +2,6 @@
 Models the lipidome object.
 """
 
-import json
 import logging
 import os
 import string
@@ -419,6 +418,7 @@ class Lipidome(Base):
         module_logger.debug("In required fields.")
         return ("checksums", "subtype", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -480,27 +480,26 @@ class Lipidome(Base):
         """
         module_logger.debug("In search.")
 
-        # Searching without any parameters will return all different results
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"lipidome"[node_type]':
-            query = '({}) && "lipidome"[node_type]'.format(query)
+        return list(Lipidome.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        lip_data = session.get_osdf().oql_query(Lipidome.namespace, query)
-
-        all_results = lip_data['results']
+    @staticmethod
+    def iter_search(query="\"lipidome\"[node_type]"):
+        """
+        Searches OSDF for Lipidome nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Lipidome node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                lip_result = Lipidome.load_lipidome(result)
-                result_list.append(lip_result)
+        Returns:
+            An iterator of Lipidome objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Lipidome._iter_search("lipidome", query, Lipidome.load_lipidome)
 
     @staticmethod
     def load_lipidome(lip_data):
@@ -657,9 +656,9 @@ class Lipidome(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -688,8 +687,7 @@ class Lipidome(Base):
                 osdf.edit_node(lip_data)
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
 
-                lip_data = osdf.get_node(lip_id)
-                latest_version = lip_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s", __name__,
                                   str(latest_version))
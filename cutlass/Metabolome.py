@@ -2,7 +2,6 @@
 Models the metabolome object.
 """
 
-import json
 import logging
 import os
 import string
@@ -416,6 +415,7 @@ class Metabolome(Base):
 
         return ("checksums", "subtype", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -477,26 +477,28 @@ class Metabolome(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"metabolome"[node_type]':
-            query = '({}) && "metabolome"[node_type]'.format(query)
+        return list(Metabolome.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        data = session.get_osdf().oql_query(Metabolome.namespace, query)
+    @staticmethod
+    def iter_search(query="\"metabolome\"[node_type]"):
+        """
+        Searches OSDF for Metabolome nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        all_results = data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Metabolome node type.
 
-        result_list = list()
+        Returns:
+            An iterator of Metabolome objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                node_result = Metabolome.load_metabolome(result)
-                result_list.append(node_result)
+        loader = Metabolome.load_metabolome
 
-        return result_list
+        return Metabolome._iter_search("metabolome", query, loader)
 
     @staticmethod
     def load_metabolome(data):
@@ -653,9 +655,9 @@ class Metabolome(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -683,8 +685,7 @@ class Metabolome(Base):
                 osdf.edit_node(node_data)
                 self.logger.info("Update for %s %s successful.", __name__, node_id)
 
-                node_data = session.get_osdf().get_node(node_id)
-                latest_version = node_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__,
@@ -2,13 +2,12 @@
 Models the microbtranscriptomics raw sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
+from cutlass.registry import load_document
 from cutlass.aspera import aspera
 from cutlass.Util import *
 
@@ -539,27 +538,30 @@ class MicrobTranscriptomicsRawSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"microb_transcriptomics_raw_seq_set"[node_type]':
-            query = '({}) && "microb_transcriptomics_raw_seq_set"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(MicrobTranscriptomicsRawSeqSet.iter_search(query))
 
-        rawSeqSet_data = session.get_osdf().oql_query("ihmp", query)
+    @staticmethod
+    def iter_search(query="\"microb_transcriptomics_raw_seq_set\"[node_type]"):
+        """
+        Searches OSDF for MicrobTranscriptomicsRawSeqSet nodes, just like
+        search(), but rather than retrieving every result up front, streams
+        them from OSDF one page at a time as they are consumed.
 
-        all_results = rawSeqSet_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         MicrobTranscriptomicsRawSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of MicrobTranscriptomicsRawSeqSet objects, with the
+            total number of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                rawSeqSet_result = MicrobTranscriptomicsRawSeqSet. \
-                                      load_microb_transcriptomics_raw_seq_set(result)
-                result_list.append(rawSeqSet_result)
+        loader = MicrobTranscriptomicsRawSeqSet.load_microb_transcriptomics_raw_seq_set
 
-        return result_list
+        return MicrobTranscriptomicsRawSeqSet._iter_search(
+            "microb_transcriptomics_raw_seq_set", query, loader
+        )
 
     @staticmethod
     def load_microb_transcriptomics_raw_seq_set(seq_set_data):
@@ -723,9 +725,9 @@ class MicrobTranscriptomicsRawSeqSet(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -753,8 +755,7 @@ class MicrobTranscriptomicsRawSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version))
@@ -769,22 +770,10 @@ class MicrobTranscriptomicsRawSeqSet(Base):
         return success
 
 
-    def _derived_docs(self):
+    def _derived_docs(self, types=None):
         self.logger.debug("In _derived_docs().")
 
-        linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(MicrobTranscriptomicsRawSeqSet.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("computed_from", types)
 
     def derivations(self):
         """
@@ -793,8 +782,5 @@ class MicrobTranscriptomicsRawSeqSet(Base):
         """
         self.logger.debug("In derivations().")
 
-        from cutlass.AbundanceMatrix import AbundanceMatrix
-
-        for doc in self._derived_docs():
-            if doc['node_type'] == "abundance_matrix":
-                yield AbundanceMatrix.load_abundance_matrix(doc)
+        for doc in self._derived_docs(["abundance_matrix"]):
+            yield load_document(doc)
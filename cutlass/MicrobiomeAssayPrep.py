@@ -2,11 +2,10 @@
 Models the MicrobiomeAssayPrep object.
 """
 
-import json
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
+from cutlass.registry import load_document
 from cutlass.Util import *
 
 # pylint: disable=W0703, C0302, C1801
@@ -731,6 +730,7 @@ class MicrobiomeAssayPrep(Base):
                 "center", "contact", "prep_id", "storage_duration",
                 "experiment_type", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -792,28 +792,30 @@ class MicrobiomeAssayPrep(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"microb_assay_prep"[node_type]':
-            query = '({}) && "microb_assay_prep"[node_type]'.format(query)
+        return list(MicrobiomeAssayPrep.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        prep_data = session.get_osdf().oql_query(
-            MicrobiomeAssayPrep.namespace, query
-        )
+    @staticmethod
+    def iter_search(query="\"microb_assay_prep\"[node_type]"):
+        """
+        Searches OSDF for MicrobiomeAssayPrep nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = prep_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         MicrobiomeAssayPrep node type.
 
-        result_list = list()
+        Returns:
+            An iterator of MicrobiomeAssayPrep objects, with the total
+            number of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                prep_result = MicrobiomeAssayPrep.load_microassayprep(result)
-                result_list.append(prep_result)
+        loader = MicrobiomeAssayPrep.load_microassayprep
 
-        return result_list
+        return MicrobiomeAssayPrep._iter_search(
+            "microb_assay_prep", query, loader
+        )
 
     @staticmethod
     def load_microassayprep(prep_data):
@@ -942,9 +944,9 @@ class MicrobiomeAssayPrep(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 node_id = osdf.insert_node(data)
@@ -967,8 +969,7 @@ class MicrobiomeAssayPrep(Base):
                 self.logger.debug("%s OSDF ID to update: %s.", __name__, prep_id)
                 osdf.edit_node(prep_data)
 
-                prep_data = osdf.get_node(prep_id)
-                latest_version = prep_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version))
@@ -986,23 +987,10 @@ class MicrobiomeAssayPrep(Base):
         """
         self.logger.debug("In cytokines().")
 
-        linkage_query = '"{}"[linkage.derived_from] && "cytokine"[node_type]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.Cytokine import Cytokine
 
-        for page_no in count(1):
-            res = query(MicrobiomeAssayPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield Cytokine.load_cytokine(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in self._derived_docs(["cytokine"]):
+            yield Cytokine.load_cytokine(doc)
 
     def lipidomes(self):
         """
@@ -1011,23 +999,10 @@ class MicrobiomeAssayPrep(Base):
         """
         self.logger.debug("In lipidomes().")
 
-        linkage_query = '"{}"[linkage.derived_from] and "lipidome"[node_type]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.Lipidome import Lipidome
 
-        for page_no in count(1):
-            res = query(MicrobiomeAssayPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield Lipidome.load_lipidome(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in self._derived_docs(["lipidome"]):
+            yield Lipidome.load_lipidome(doc)
 
     def metabolomes(self):
         """
@@ -1036,23 +1011,10 @@ class MicrobiomeAssayPrep(Base):
         """
         self.logger.debug("In metabolomes().")
 
-        linkage_query = '"{}"[linkage.derived_from] && "metabolome"[node_type]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.Metabolome import Metabolome
 
-        for page_no in count(1):
-            res = query(MicrobiomeAssayPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield Metabolome.load_metabolome(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in self._derived_docs(["metabolome"]):
+            yield Metabolome.load_metabolome(doc)
 
     def proteomes(self):
         """
@@ -1061,40 +1023,15 @@ class MicrobiomeAssayPrep(Base):
         """
         self.logger.debug("In proteomes().")
 
-        linkage_query = '"{}"[linkage.derived_from] && "proteome"[node_type]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.Proteome import Proteome
 
-        for page_no in count(1):
-            res = query(MicrobiomeAssayPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
+        for doc in self._derived_docs(["proteome"]):
+            yield Proteome.load_proteome(doc)
 
-            for doc in res['results']:
-                yield Proteome.load_proteome(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
-
-    def _derived_docs(self):
+    def _derived_docs(self, types=None):
         self.logger.debug("In _derived_docs.")
 
-        linkage_query = '"{}"[linkage.derived_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(MicrobiomeAssayPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("derived_from", types)
 
     def derivations(self):
         """
@@ -1103,17 +1040,7 @@ class MicrobiomeAssayPrep(Base):
         """
         self.logger.debug("In _derived_docs.")
 
-        from cutlass.Cytokine import Cytokine
-        from cutlass.Lipidome import Lipidome
-        from cutlass.Metabolome import Metabolome
-        from cutlass.Proteome import Proteome
+        derived_types = ["cytokine", "lipidome", "metabolome", "proteome"]
 
-        for doc in self._derived_docs():
-            if doc['node_type'] == "cytokine":
-                yield Cytokine.load_cytokine(doc)
-            elif doc['node_type'] == "lipidome":
-                yield Lipidome.load_lipidome(doc)
-            elif doc['node_type'] == "metabolome":
-                yield Metabolome.load_metabolome(doc)
-            elif doc['node_type'] == "proteome":
-                yield Proteome.load_proteome(doc)
+        for doc in self._derived_docs(derived_types):
+            yield load_document(doc)
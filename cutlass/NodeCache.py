@@ -0,0 +1,201 @@
+"""
+The NodeCache module provides a session-scoped identity map of OSDF
+documents. Documents are keyed by node ID (and, for historical versions,
+by node ID and version), held in least-recently-used order up to a size
+limit, and optionally expire after a time-to-live. The pages of OQL query
+results are cached alongside them so that repeated traversals of the same
+linkages do not go back to the server.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+class NodeCache(object):
+    """
+    A thread-safe LRU cache of OSDF node documents and OQL result pages.
+    Cached values are copied on the way in and on the way out, so callers
+    are free to modify what they get back.
+
+    Attributes:
+        max_size (int): The maximum number of nodes, and separately of
+                        query pages, held at once.
+        ttl (float): The number of seconds an entry stays valid, or None if
+                     entries never expire.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that were not.
+    """
+    def __init__(self, max_size=10000, ttl=None):
+        """
+        Constructor for the NodeCache class.
+
+        Args:
+            max_size (int): The maximum number of nodes to hold.
+            ttl (float): The number of seconds after which an entry expires.
+                         Defaults to never.
+        """
+        if type(max_size) is not int or max_size < 1:
+            raise ValueError("Invalid cache size. Must be a positive integer.")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        self._nodes = OrderedDict()
+        self._queries = OrderedDict()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._nodes)
+
+    def _lookup(self, entries, key):
+        with self._lock:
+            entry = entries.pop(key, None)
+
+            if entry is not None:
+                (expires, value) = entry
+
+                if expires is None or expires > time.time():
+                    # Re-insert to mark as most recently used
+                    entries[key] = entry
+                    self.hits += 1
+                    return copy.deepcopy(value)
+
+            self.misses += 1
+            return None
+
+    def _store(self, entries, key, value):
+        expires = None
+
+        if self.ttl is not None:
+            expires = time.time() + self.ttl
+
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            entries.pop(key, None)
+            entries[key] = (expires, value)
+
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def get_node(self, node_id, version=None):
+        """
+        Retrieves a cached node document.
+
+        Args:
+            node_id (str): The OSDF ID of the node.
+            version (int): A specific version of the node. Defaults to the
+                           latest version known to the cache.
+
+        Returns:
+            The node document, or None if it is not cached.
+        """
+        if version is None:
+            return self._lookup(self._nodes, node_id)
+
+        with self._lock:
+            if (node_id, version) in self._nodes:
+                return self._lookup(self._nodes, (node_id, version))
+
+            latest = self._nodes.get(node_id)
+
+            if latest is not None and latest[1].get('ver') == version:
+                return self._lookup(self._nodes, node_id)
+
+            self.misses += 1
+            return None
+
+    def put_node(self, document, latest=True):
+        """
+        Adds a node document to the cache.
+
+        Args:
+            document (dict): The node document, which must have an 'id'.
+            latest (bool): Whether the document is the latest version of the
+                           node. Documents for older versions are only
+                           returned by get_node() calls for that version.
+
+        Returns:
+            None
+        """
+        if latest:
+            self._store(self._nodes, document['id'], document)
+        else:
+            self._store(self._nodes, (document['id'], document['ver']), document)
+
+    def get_query(self, namespace, query, page):
+        """
+        Retrieves a cached page of OQL query results.
+
+        Args:
+            namespace (str): The namespace that was queried.
+            query (str): The OQL query.
+            page (int): The page number.
+
+        Returns:
+            The page of results, or None if it is not cached.
+        """
+        return self._lookup(self._queries, (namespace, query, page))
+
+    def put_query(self, namespace, query, page, results):
+        """
+        Adds a page of OQL query results to the cache. Each of the documents
+        in the page is also cached as a node.
+
+        Args:
+            namespace (str): The namespace that was queried.
+            query (str): The OQL query.
+            page (int): The page number.
+            results (dict): The page of results returned by OSDF.
+
+        Returns:
+            None
+        """
+        self._store(self._queries, (namespace, query, page), results)
+
+        for document in results.get('results', []):
+            if 'id' in document:
+                self.put_node(document)
+
+    def invalidate(self, node_id):
+        """
+        Discards what the cache knows about a node that has been changed or
+        deleted. Since the change may affect the results of any query, all
+        cached query pages are discarded as well.
+
+        Args:
+            node_id (str): The OSDF ID of the changed node, or None if only
+                           the query pages should be discarded.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if node_id is not None:
+                self._nodes.pop(node_id, None)
+
+            self._queries.clear()
+
+    def clear(self):
+        """
+        Empties the cache.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._nodes.clear()
+            self._queries.clear()
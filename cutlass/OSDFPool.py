@@ -0,0 +1,388 @@
+"""
+The OSDFPool module provides a thread-safe pool of OSDF clients, each of
+which holds a persistent (keep-alive) HTTP connection to the OSDF server.
+An iHMPSession created with a pool size uses an OSDFPool in place of a
+single OSDF client, allowing node methods to be called concurrently from
+multiple threads. The OSDF clients used by sessions, pooled or not, also
+report the size of every request and response they exchange.
+"""
+
+import httplib
+import logging
+import socket
+import Queue
+from contextlib import contextmanager
+from osdf import OSDF
+from request import HttpRequest
+from cutlass.RetryPolicy import RETRYABLE_STATUSES, ServerStatusError
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+class MeteredRequest(HttpRequest):
+    """
+    An HttpRequest that reports the number of bytes sent and received with
+    each request to a callback. With status_errors set, responses with a
+    status showing that the server could not handle the request at the time
+    raise a ServerStatusError, so that retries are decided on the status
+    rather than on the wording of the OSDF client's errors. Otherwise they
+    are returned to the OSDF client, which reports them as it always has.
+    """
+    def __init__(self, server, username, password, port=8123, ssl=False,
+                 byte_counter=None, status_errors=False):
+        super(MeteredRequest, self).__init__(server, username, password,
+                                             port, ssl)
+        self._byte_counter = byte_counter
+        self._status_errors = status_errors
+
+    def _count(self, data, results):
+        if self._byte_counter is not None:
+            sent = 0
+
+            if data is not None:
+                sent = len(data)
+
+            self._byte_counter(sent, len(results['content'] or ""))
+
+        if self._status_errors and results.get('code') in RETRYABLE_STATUSES:
+            headers = results.get('headers', {})
+            raise ServerStatusError(results['code'], headers.get('x-osdf-error'))
+
+        return results
+
+    def delete(self, resource):
+        return self._count(None, super(MeteredRequest, self).delete(resource))
+
+    def get(self, resource):
+        return self._count(None, super(MeteredRequest, self).get(resource))
+
+    def put(self, resource, data):
+        return self._count(data, super(MeteredRequest, self).put(resource, data))
+
+    def post(self, resource, data):
+        return self._count(data, super(MeteredRequest, self).post(resource, data))
+
+class MeteredOSDF(OSDF):
+    """
+    An OSDF client that reports the size of its requests and responses, and
+    optionally raises a ServerStatusError when the server is unavailable.
+    """
+    def __init__(self, server, username, password, port=8123, ssl=False,
+                 byte_counter=None, status_errors=False):
+        self._byte_counter = byte_counter
+        self._status_errors = status_errors
+        super(MeteredOSDF, self).__init__(server, username, password,
+                                          port=port, ssl=ssl)
+
+    def _set_request(self):
+        self._request = MeteredRequest(self._server, self._username,
+                                       self._password, self._port,
+                                       self._ssl, self._byte_counter,
+                                       self._status_errors)
+
+class KeepAliveRequest(MeteredRequest):
+    """
+    An HttpRequest that reuses a single HTTP connection across requests
+    instead of opening a new connection for every request. If a reused
+    connection turns out to have been closed by the server, a new connection
+    is opened and the request is sent once more, unless it inserts a node:
+    an insert may have reached the server before the connection failed, and
+    repeating it could create a duplicate node. For inserts the error is
+    raised, and the session's retry policy, if any, decides what to do.
+    """
+
+    def __init__(self, server, username, password, port=8123, ssl=False,
+                 byte_counter=None, status_errors=False):
+        super(KeepAliveRequest, self).__init__(server, username, password,
+                                               port, ssl, byte_counter,
+                                               status_errors)
+        self._conn = None
+
+    def _get_connection(self):
+        if self._conn is None:
+            self._conn = super(KeepAliveRequest, self)._get_connection()
+
+        return self._conn
+
+    def close(self):
+        """
+        Closes the underlying HTTP connection, if one is open.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _is_insert(method, resource):
+        # Every other call, including OQL queries and validations sent with
+        # POST, can be repeated without changing the outcome.
+        return method == "POST" and resource.rstrip("/") == "/nodes"
+
+    def _send(self, method, resource, data=None):
+        reused = self._conn is not None
+        conn = self._get_connection()
+
+        try:
+            conn.putrequest(method, resource)
+            self._set_auth_header(conn)
+
+            if data is not None:
+                conn.putheader("Content-Length", "%d" % len(data))
+
+            conn.endheaders()
+
+            if data is not None:
+                conn.send(data)
+
+            resp = conn.getresponse()
+            content = resp.read()
+        except (httplib.HTTPException, socket.error) as conn_exception:
+            self.close()
+
+            if not reused or KeepAliveRequest._is_insert(method, resource):
+                raise
+
+            # The server dropped the idle connection, so try again with a
+            # fresh one.
+            module_logger.debug("Reconnecting after stale connection: %s",
+                                conn_exception)
+            return self._send(method, resource, data)
+
+        if resp.will_close:
+            self.close()
+
+        headers = {}
+        for (header_name, header_value) in resp.getheaders():
+            headers[header_name] = header_value
+
+        results = {"headers": headers,
+                   "content": content,
+                   "code": resp.status
+                  }
+
+        return self._count(data, results)
+
+    def delete(self, resource):
+        return self._send("DELETE", resource)
+
+    def get(self, resource):
+        return self._send("GET", resource)
+
+    def put(self, resource, data):
+        return self._send("PUT", resource, data)
+
+    def post(self, resource, data):
+        return self._send("POST", resource, data)
+
+class KeepAliveOSDF(MeteredOSDF):
+    """
+    An OSDF client that keeps its HTTP connection open between requests.
+    """
+    def _set_request(self):
+        old_request = getattr(self, '_request', None)
+
+        if old_request is not None:
+            old_request.close()
+
+        self._request = KeepAliveRequest(self._server, self._username,
+                                         self._password, self._port,
+                                         self._ssl, self._byte_counter,
+                                         self._status_errors)
+
+class OSDFPool(object):
+    """
+    A thread-safe pool of keep-alive OSDF clients. The pool exposes the same
+    methods as an OSDF client (get_node, insert_node, oql_query, etc...). Each
+    method call borrows a client from the pool for the duration of the call
+    and returns it afterwards, so a single pool can be shared by many
+    threads.
+
+    Attributes:
+        size (int): The number of OSDF clients in the pool.
+    """
+    def __init__(self, server, username, password, port=8123, ssl=False,
+                 size=4, timeout=None, byte_counter=None, status_errors=False):
+        """
+        Constructor for the OSDFPool class.
+
+        Args:
+            server (str): The server domain name containing the OSDF instance.
+            username (str): The username for OSDF access.
+            password (str): The password for OSDF access.
+            port (int): The port allowing access to the OSDF instance.
+            ssl (bool): Whether the OSDF server is behind SSL/TLS or not.
+            size (int): The number of connections to hold in the pool.
+            timeout (float): How many seconds to wait for a free connection
+                             before giving up. Defaults to waiting forever.
+            byte_counter (callable): If provided, called with the number of
+                                     bytes sent and received for every
+                                     request.
+            status_errors (bool): Whether responses showing that the server
+                                  is unavailable raise a ServerStatusError.
+                                  Defaults to false.
+        """
+        self.logger = logging.getLogger(self.__module__ + '.' + \
+                                        self.__class__.__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        if type(size) is not int or size < 1:
+            raise ValueError("Invalid pool size. Must be a positive integer.")
+
+        self.size = size
+        self._timeout = timeout
+        self._server = server
+        self._port = port
+        self._username = username
+        self._password = password
+        self._ssl = ssl
+
+        self._clients = []
+        self._idle = Queue.Queue()
+
+        for _ in range(size):
+            client = KeepAliveOSDF(server, username, password, port=port,
+                                   ssl=ssl, byte_counter=byte_counter,
+                                   status_errors=status_errors)
+            self._clients.append(client)
+            self._idle.put(client)
+
+    def acquire(self):
+        """
+        Borrows an OSDF client from the pool, blocking until one is free.
+        The client must be handed back with release() when done.
+
+        Args:
+            None
+
+        Returns:
+            An OSDF client.
+
+        Exceptions:
+            Exception: If no client became free within the pool timeout.
+        """
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except Queue.Empty:
+            raise Exception("Timed out waiting for a free OSDF connection.")
+
+    def release(self, client):
+        """
+        Returns a previously acquired OSDF client to the pool.
+
+        Args:
+            client (OSDF): The client obtained from acquire().
+
+        Returns:
+            None
+        """
+        self._idle.put(client)
+
+    @contextmanager
+    def connection(self):
+        """
+        A context manager that borrows an OSDF client from the pool for the
+        duration of a with block.
+        """
+        client = self.acquire()
+
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def close(self):
+        """
+        Closes the connections held by all the clients in the pool.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        for client in self._clients:
+            client._request.close()
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not callable(getattr(OSDF, name, None)):
+            raise AttributeError("%s not defined in %s" % (name, self.__class__))
+
+        def borrowed(*args, **kwargs):
+            with self.connection() as client:
+                return getattr(client, name)(*args, **kwargs)
+
+        borrowed.__name__ = name
+
+        return borrowed
+
+    def _set_on_clients(self, prop, value):
+        for client in self._clients:
+            setattr(client, prop, value)
+
+    @property
+    def server(self):
+        """
+        str: The server the pooled clients are configured for.
+        """
+        return self._server
+
+    @server.setter
+    def server(self, server):
+        self._server = server
+        self._set_on_clients('server', server)
+
+    @property
+    def port(self):
+        """
+        int: The TCP port for the pooled clients.
+        """
+        return self._port
+
+    @port.setter
+    def port(self, port):
+        self._port = port
+        self._set_on_clients('port', port)
+
+    @property
+    def username(self):
+        """
+        str: The username set for the pooled clients.
+        """
+        return self._username
+
+    @username.setter
+    def username(self, username):
+        self._username = username
+        self._set_on_clients('username', username)
+
+    @property
+    def password(self):
+        """
+        str: The password set for the pooled clients.
+        """
+        return self._password
+
+    @password.setter
+    def password(self, password):
+        self._password = password
+        self._set_on_clients('password', password)
+
+    @property
+    def ssl(self):
+        """
+        bool: Whether the pooled clients use SSL or not.
+        """
+        return self._ssl
+
+    @ssl.setter
+    def ssl(self, ssl):
+        self._ssl = ssl
+        self._set_on_clients('ssl', ssl)
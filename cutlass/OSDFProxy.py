@@ -0,0 +1,201 @@
+"""
+The OSDFProxy module provides the object handed out by
+iHMPSession.get_osdf(). It offers the same methods as an OSDF client and
+passes them on to the session's OSDF client (or pool of clients), applying
+session-wide features such as the node cache, local schema validation,
+retries and statistics along the way.
+"""
+
+import logging
+import time
+from cutlass.RetryPolicy import RetryPolicy
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+class OSDFProxy(object):
+    """
+    Stands in for an OSDF client on behalf of an iHMPSession. Reads are
+    answered from the session's node cache when possible, and writes
+    invalidate the cache. Documents are validated locally when the session
+    has a schema validator. Calls that reach OSDF are retried according to
+    the session's retry policy and circuit breaker, if any, and timed in the
+    session's statistics. Any other OSDF method is passed straight through
+    to the underlying client.
+    """
+    def __init__(self, client, cache=None, validator=None, retry_policy=None,
+                 breaker=None, stats=None):
+        """
+        Constructor for the OSDFProxy class.
+
+        Args:
+            client (OSDF): The OSDF client, or OSDFPool, to pass calls to.
+            cache (NodeCache): The session's node cache, if any.
+            validator (SchemaValidator): The session's local schema
+                                         validator, if any.
+            retry_policy (RetryPolicy): How to retry failed calls, if at
+                                        all.
+            breaker (CircuitBreaker): The session's circuit breaker, if any.
+            stats (SessionStats): The session's statistics, if any.
+        """
+        if retry_policy is None and breaker is not None:
+            # Consult the breaker, but make each call only once
+            retry_policy = RetryPolicy(max_attempts=1)
+
+        self.__dict__['_client'] = client
+        self.__dict__['_cache'] = cache
+        self.__dict__['_validator'] = validator
+        self.__dict__['_retry_policy'] = retry_policy
+        self.__dict__['_breaker'] = breaker
+        self.__dict__['_stats'] = stats
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+
+        if name.startswith("_") or not callable(attr) or \
+           (self._retry_policy is None and self._stats is None):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._call(name, *args, **kwargs)
+
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(self._client, name, value)
+
+    def _call(self, name, *args, **kwargs):
+        method = getattr(self._client, name)
+        started = time.time()
+        error = True
+
+        try:
+            if self._retry_policy is None:
+                result = method(*args, **kwargs)
+            else:
+                # Repeating an insert that reached the server could create a
+                # duplicate node.
+                result = self._retry_policy.call(method, args, kwargs,
+                                                 breaker=self._breaker,
+                                                 idempotent=(name != "insert_node"))
+            error = False
+        finally:
+            if self._stats is not None:
+                self._stats.record_operation(name, time.time() - started, error)
+
+        return result
+
+    def get_node(self, node_id):
+        """
+        Retrieves an OSDF node given the node's ID.
+        """
+        if self._cache is not None:
+            document = self._cache.get_node(node_id)
+
+            if document is not None:
+                module_logger.debug("Cache hit for node %s.", node_id)
+                return document
+
+        document = self._call("get_node", node_id)
+
+        if self._cache is not None:
+            self._cache.put_node(document)
+
+        return document
+
+    def get_node_by_version(self, node_id, version):
+        """
+        Retrieves an OSDF node as it was at the given version.
+        """
+        if self._cache is not None:
+            document = self._cache.get_node(node_id, version)
+
+            if document is not None:
+                module_logger.debug("Cache hit for node %s version %s.",
+                                    node_id, version)
+                return document
+
+        document = self._call("get_node_by_version", node_id, version)
+
+        if self._cache is not None:
+            self._cache.put_node(document, latest=False)
+
+        return document
+
+    def oql_query(self, namespace, query, page=1):
+        """
+        Issues an OSDF Query Language (OQL) query and returns the specified
+        page of results.
+        """
+        if self._cache is not None:
+            results = self._cache.get_query(namespace, query, page)
+
+            if results is not None:
+                module_logger.debug("Cache hit for page %s of query %s.",
+                                    page, query)
+                return results
+
+        results = self._call("oql_query", namespace, query, page)
+
+        if self._cache is not None:
+            self._cache.put_query(namespace, query, page, results)
+
+        return results
+
+    def validate_node(self, json_data):
+        """
+        Reports whether a node document validates against the schema for its
+        node type. Returns a tuple of whether the document is valid and the
+        error message if it is not. Documents are checked locally when
+        possible, and by the server otherwise.
+        """
+        if self._validator is not None:
+            outcome = None
+            started = time.time()
+
+            try:
+                outcome = self._validator.validate(json_data)
+            except Exception as validate_exception:
+                module_logger.warn("Local validation failed, using the " + \
+                                   "server instead: %s", validate_exception)
+
+            if outcome is not None:
+                if self._stats is not None:
+                    self._stats.record_operation("validate_node_local",
+                                                 time.time() - started)
+                return outcome
+
+        return self._call("validate_node", json_data)
+
+    def insert_node(self, json_data):
+        """
+        Inserts a node and returns the new node's ID.
+        """
+        node_id = self._call("insert_node", json_data)
+
+        if self._cache is not None:
+            self._cache.invalidate(None)
+
+        return node_id
+
+    def edit_node(self, json_data):
+        """
+        Updates a node with the provided data.
+        """
+        try:
+            return self._call("edit_node", json_data)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(json_data.get('id'))
+
+    def delete_node(self, node_id):
+        """
+        Deletes the specified node.
+        """
+        try:
+            return self._call("delete_node", node_id)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(node_id)
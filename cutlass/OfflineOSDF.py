@@ -0,0 +1,162 @@
+"""
+The OfflineOSDF module provides a read-only stand-in for an OSDF client
+that answers from a local mirror of the namespace instead of the server.
+It lets an iHMPSession work without network access, and makes loads,
+searches and traversals local lookups.
+"""
+
+import logging
+from cutlass.mirror import Mirror
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+class OfflineOSDF(object):
+    """
+    Offers the reading methods of an OSDF client, answered from a Mirror.
+    Methods that would change OSDF raise an exception.
+
+    Attributes:
+        mirror (Mirror): The mirror answering the calls.
+    """
+    def __init__(self, mirror, server=None, username=None, password=None,
+                 port=None, ssl=None):
+        """
+        Constructor for the OfflineOSDF class. The connection settings are
+        only kept so that the session's properties still work.
+
+        Args:
+            mirror (Mirror): The mirror to read from, or the path of its
+                             SQLite database.
+        """
+        if not isinstance(mirror, Mirror):
+            mirror = Mirror(mirror)
+
+        self.mirror = mirror
+        self.server = server
+        self.username = username
+        self.password = password
+        self.port = port
+        self.ssl = ssl
+
+    @staticmethod
+    def _refuse(action):
+        raise Exception("Unable to %s. Reason: the session is offline." % action)
+
+    def get_info(self):
+        """
+        Describes the mirror in place of the OSDF instance.
+        """
+        return {'title': "Local mirror %s" % self.mirror.path,
+                'namespace': self.mirror.namespace,
+                'last_sync': self.mirror.last_sync}
+
+    def get_node(self, node_id):
+        """
+        Retrieves a node given the node's ID.
+        """
+        document = self.mirror.get(node_id)
+
+        if document is None:
+            raise Exception("Unable to retrieve node document. " + \
+                            "Reason: %s is not in the mirror." % node_id)
+
+        return document
+
+    def get_node_by_version(self, node_id, version):
+        """
+        Retrieves a node at the given version. Only the latest version of
+        each node is mirrored.
+        """
+        document = self.get_node(node_id)
+
+        if document.get('ver') != version:
+            raise Exception("Unable to retrieve node document. Reason: " + \
+                            "version %s of %s is not in the mirror." % \
+                            (version, node_id))
+
+        return document
+
+    def get_nodes_in(self, node_id):
+        """
+        Retrieves the nodes that link to the given node.
+        """
+        results = list(self.mirror.linked_to(node_id))
+
+        return {'result_count': len(results), 'page': 1, 'results': results}
+
+    def get_nodes_out(self, node_id):
+        """
+        Retrieves the nodes that the given node links to.
+        """
+        target_ids = set(target_id for (_, target_id) in
+                         self.mirror.links_from(node_id))
+        results = [doc for doc in
+                   (self.mirror.get(target_id) for target_id in sorted(target_ids))
+                   if doc is not None]
+
+        return {'result_count': len(results), 'page': 1, 'results': results}
+
+    def oql_query(self, namespace, query, page=1):
+        """
+        Answers an OQL query from the mirror. All the results are returned
+        on the first page.
+        """
+        if namespace != self.mirror.namespace:
+            raise Exception("Unable to query namespace %s. Reason: the " \
+                            "mirror holds %s." % (namespace, self.mirror.namespace))
+
+        results = []
+
+        if page == 1:
+            results = self.mirror.query(query)
+
+        return {'result_count': len(results), 'page': page, 'results': results}
+
+    def oql_query_all_pages(self, namespace, query):
+        """
+        Answers an OQL query from the mirror, returning all of the results.
+        """
+        results = self.oql_query(namespace, query)
+        del results['page']
+
+        return results
+
+    def query(self, namespace, query, page=1):
+        """
+        ElasticSearch queries cannot be answered offline.
+        """
+        self._refuse("run ElasticSearch queries")
+
+    def query_all_pages(self, namespace, query):
+        """
+        ElasticSearch queries cannot be answered offline.
+        """
+        self._refuse("run ElasticSearch queries")
+
+    def validate_node(self, json_data):
+        """
+        Nodes cannot be validated offline, so every document is reported as
+        invalid, which stops it from being saved.
+        """
+        return (False, "Documents cannot be validated. The session is offline.")
+
+    def insert_node(self, json_data):
+        """
+        Nodes cannot be saved offline.
+        """
+        self._refuse("save node document")
+
+    def edit_node(self, json_data):
+        """
+        Nodes cannot be saved offline.
+        """
+        self._refuse("save node document")
+
+    def delete_node(self, node_id):
+        """
+        Nodes cannot be deleted offline.
+        """
+        self._refuse("delete node document")
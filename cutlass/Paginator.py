@@ -0,0 +1,184 @@
+"""
+The Paginator module walks the pages of an OSDF Query Language (OQL)
+query, one page at a time, so that large result sets can be processed
+without holding them in memory all at once. Upcoming pages may be
+retrieved in the background while the current one is being processed.
+"""
+
+import logging
+import Queue
+import threading
+from cutlass.iHMPSession import iHMPSession
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+class Paginator(object):
+    """
+    Iterates over the results of an OQL query. While one page of results is
+    being consumed, up to read_ahead further pages are retrieved from OSDF
+    by a background thread, so that iteration is not held up waiting for
+    each page in turn. The total number of results is available, from the
+    first page, before iteration begins.
+
+    Attributes:
+        namespace (str): The namespace being queried.
+        query (str): The OQL query.
+        read_ahead (int): The number of pages retrieved ahead of the one
+                          being consumed.
+    """
+    def __init__(self, namespace, query, loader=None, read_ahead=None):
+        """
+        Constructor for the Paginator class.
+
+        Args:
+            namespace (str): The namespace to query.
+            query (str): The OQL query.
+            loader (callable): If provided, each result document is passed
+                               through this function, such as
+                               Sample.load_sample, and its return value is
+                               yielded instead of the document.
+            read_ahead (int): The number of pages to retrieve ahead of the
+                              one being consumed, or 0 to retrieve each page
+                              only when it is needed. Defaults to the
+                              session's read_ahead setting.
+        """
+        if read_ahead is None:
+            read_ahead = iHMPSession.get_session().read_ahead
+
+        self.namespace = namespace
+        self.query = query
+        self.read_ahead = read_ahead
+        self._loader = loader
+        self._first_page = None
+
+    def _fetch(self, page_no):
+        module_logger.debug("Retrieving page %s of query %s.", page_no, self.query)
+
+        osdf = iHMPSession.get_session().get_osdf()
+
+        return osdf.oql_query(self.namespace, self.query, page=page_no)
+
+    @property
+    def result_count(self):
+        """
+        int: The total number of results of the query.
+        """
+        if self._first_page is None:
+            self._first_page = self._fetch(1)
+
+        return self._first_page['result_count']
+
+    def pages(self):
+        """
+        Iterates over the pages of results.
+
+        Args:
+            None
+
+        Returns:
+            A generator of lists of result documents, one list per page.
+        """
+        page = self._first_page
+
+        if page is None:
+            page = self._fetch(1)
+
+        # The first page is only kept until iteration starts
+        self._first_page = None
+
+        results = page['results']
+        remaining = page['result_count'] - len(results)
+
+        if len(results) == 0 or remaining < 1:
+            yield results
+            return
+
+        later_pages = self._later_pages(remaining)
+        stop = threading.Event()
+
+        if self.read_ahead > 0:
+            # Start retrieving the next pages before handing out this one
+            later_pages = self._prefetch(later_pages, stop)
+
+        try:
+            yield results
+
+            for results in later_pages:
+                yield results
+        finally:
+            stop.set()
+
+    def _later_pages(self, remaining):
+        page_no = 1
+
+        while remaining > 0:
+            page_no += 1
+            results = self._fetch(page_no)['results']
+
+            if len(results) == 0:
+                break
+
+            remaining -= len(results)
+
+            yield results
+
+    def _prefetch(self, pages, stop):
+        """
+        Starts running the pages generator on a background thread, which
+        buffers up to read_ahead pages, and returns a generator of the pages
+        as they become available. Errors from the background thread are
+        raised in the consumer. The thread gives up once the stop event is
+        set.
+        """
+        buffered = Queue.Queue(self.read_ahead)
+
+        def offer(item):
+            # Give up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    buffered.put(item, timeout=0.1)
+                    return True
+                except Queue.Full:
+                    pass
+
+            return False
+
+        def produce():
+            try:
+                for results in pages:
+                    if not offer((results, None)):
+                        return
+            except Exception as fetch_exception:
+                offer((None, fetch_exception))
+            else:
+                offer((None, None))
+
+        producer = threading.Thread(target=produce, name="cutlass-prefetch")
+        producer.daemon = True
+        producer.start()
+
+        return self._drain(buffered)
+
+    @staticmethod
+    def _drain(buffered):
+        while True:
+            (results, error) = buffered.get()
+
+            if error is not None:
+                raise error
+
+            if results is None:
+                break
+
+            yield results
+
+    def __iter__(self):
+        for results in self.pages():
+            for doc in results:
+                if self._loader is None:
+                    yield doc
+                else:
+                    yield self._loader(doc)
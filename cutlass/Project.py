@@ -3,8 +3,8 @@ Models the project object.
 """
 
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.mixs import MIXS, MixsException
 from cutlass.Base import Base
 from cutlass.Study import Study
@@ -209,8 +209,7 @@ class Project(Base):
                 osdf.edit_node(project_data)
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
 
-                updated_data = osdf.get_node(self._id)
-                latest_version = updated_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The new version of this %s is now: %s",
                                   __name__,
@@ -225,6 +224,7 @@ class Project(Base):
 
         return success
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from the OSDF instance. If the object
@@ -286,26 +286,26 @@ class Project(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"project"[node_type]':
-            query = '({}) && "project"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(Project.iter_search(query))
 
-        project_data = session.get_osdf().oql_query(Project.namespace, query)
-
-        all_results = project_data['results']
+    @staticmethod
+    def iter_search(query="\"project\"[node_type]"):
+        """
+        Searches OSDF for Project nodes, just like search(), but rather than
+        retrieving every result up front, streams them from OSDF one page at
+        a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Project node type.
 
-        if len(all_results) > 0:
-            for i in all_results:
-                project_result = Project.load_project(i)
-                result_list.append(project_result)
+        Returns:
+            An iterator of Project objects, with the total number of results
+            available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Project._iter_search("project", query, Project.load_project)
 
     @staticmethod
     def load(project_id):
@@ -415,16 +415,6 @@ class Project(Base):
         Returns an iterator of all studies connected to this project.
         """
         linkage_query = '"{}"[linkage.part_of]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(Project.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield Study.load_study(doc)
-
-            res_count -= len(res['results'])
 
-            if res_count < 1:
-                break
+        for doc in Paginator(Project.namespace, linkage_query):
+            yield Study.load_study(doc)
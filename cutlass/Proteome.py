@@ -2,7 +2,6 @@
 Models the proteome object.
 """
 
-import json
 import logging
 import os
 import string
@@ -10,6 +9,7 @@ from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
 from cutlass.aspera import aspera
 from cutlass.Util import enforce_bool, enforce_dict, enforce_past_date, enforce_list, enforce_string
+from cutlass.Util import recursive_delete
 
 # pylint: disable=C0302, W0703, C1801
 
@@ -1056,6 +1056,7 @@ class Proteome(Base):
                 "protocol_name", "sample_name", "search_engine", "short_label", "software",
                 "source", "study", "subtype", "title")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -1115,26 +1116,26 @@ class Proteome(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"proteome"[node_type]':
-            query = '({}) && "proteome"[node_type]'.format(query)
+        return list(Proteome.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        proteome_data = session.get_osdf().oql_query(Proteome.namespace, query)
-
-        all_results = proteome_data['results']
+    @staticmethod
+    def iter_search(query="\"proteome\"[node_type]"):
+        """
+        Searches OSDF for Proteome nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Proteome node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                proteome_result = Proteome.load_proteome(result)
-                result_list.append(proteome_result)
+        Returns:
+            An iterator of Proteome objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Proteome._iter_search("proteome", query, Proteome.load_proteome)
 
     @staticmethod
     def load_proteome(prot_data):
@@ -1356,9 +1357,9 @@ class Proteome(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 node_id = osdf.insert_node(data)
@@ -1380,8 +1381,7 @@ class Proteome(Base):
                 osdf.edit_node(prot_data)
                 self.logger.info("Update for %s %s successful.", __name__, prot_id)
 
-                prot_data = osdf.get_node(prot_id)
-                latest_version = prot_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version)
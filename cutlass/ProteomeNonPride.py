@@ -2,7 +2,6 @@
 Models the proteome (non-pride) object.
 """
 
-import json
 import logging
 import os
 import string
@@ -914,6 +913,7 @@ class ProteomeNonPride(Base):
         return ("local_other_file", "leak_peak_file", "local_protmod_file",
                 "local_raw_file", "study", "subtype", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -975,27 +975,30 @@ class ProteomeNonPride(Base):
         """
         module_logger.debug("In search.")
 
-        # Searching without any parameters will return all different results
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"proteome_nonpride"[node_type]':
-            query = '({}) && "proteome_nonpride"[node_type]'.format(query)
+        return list(ProteomeNonPride.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        prot_data = session.get_osdf().oql_query(ProteomeNonPride.namespace, query)
+    @staticmethod
+    def iter_search(query="\"proteome_nonpride\"[node_type]"):
+        """
+        Searches OSDF for ProteomeNonPride nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = prot_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         ProteomeNonPride node type.
 
-        result_list = list()
+        Returns:
+            An iterator of ProteomeNonPride objects, with the total number
+            of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                prot_result = ProteomeNonPride.load_proteome_nonpride(result)
-                result_list.append(prot_result)
+        loader = ProteomeNonPride.load_proteome_nonpride
 
-        return result_list
+        return ProteomeNonPride._iter_search(
+            "proteome_nonpride", query, loader
+        )
 
     @staticmethod
     def load_proteome_nonpride(prot_data):
@@ -1231,9 +1234,9 @@ class ProteomeNonPride(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -1262,8 +1265,7 @@ class ProteomeNonPride(Base):
                 osdf.edit_node(prot_data)
                 self.logger.info("Update for %s %s successful.", __name__, prot_id)
 
-                prot_data = osdf.get_node(prot_id)
-                latest_version = prot_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version)
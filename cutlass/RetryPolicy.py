@@ -0,0 +1,328 @@
+"""
+The RetryPolicy module provides the means for an iHMPSession to ride out
+transient OSDF failures. A RetryPolicy repeats a failed call with
+exponential backoff and jitter when the failure looks transient, and a
+CircuitBreaker stops sending requests altogether for a while once the
+server appears to be down, so that callers fail fast instead of waiting
+on every request.
+"""
+
+import errno
+import httplib
+import logging
+import random
+import socket
+import threading
+import time
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+# HTTP statuses indicating the server could not handle a request at the
+# time, rather than that the request itself was at fault.
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of contacting OSDF while the circuit breaker is open.
+    """
+    pass
+
+class ServerStatusError(Exception):
+    """
+    Raised by the OSDF clients of a session when OSDF, or the proxy in
+    front of it, responds with one of the RETRYABLE_STATUSES.
+
+    Attributes:
+        status (int): The HTTP status of the response.
+    """
+    def __init__(self, status, reason=None):
+        message = "Unable to complete the request. OSDF responded with " + \
+                  "HTTP status %s." % status
+
+        if reason:
+            message += " Reason: %s" % reason
+
+        super(ServerStatusError, self).__init__(message)
+        self.status = status
+
+def is_transient(exception):
+    """
+    Determines whether an exception raised by an OSDF call indicates a
+    transient failure that is worth retrying: a network error, or a
+    response with an HTTP status such as 503, whatever its message. Other
+    errors, such as validation failures or missing nodes, are not
+    transient.
+
+    Args:
+        exception (Exception): The exception raised by the call.
+
+    Returns:
+        True if the call may succeed if repeated, False otherwise.
+    """
+    if isinstance(exception, CircuitOpenError):
+        return False
+
+    if isinstance(exception, (socket.error, httplib.HTTPException)):
+        return True
+
+    if isinstance(exception, ServerStatusError):
+        return exception.status in RETRYABLE_STATUSES
+
+    return False
+
+def is_unsent(exception):
+    """
+    Determines whether an exception shows that a request never reached the
+    server, in which case it is safe to repeat even if it is not
+    idempotent.
+
+    Args:
+        exception (Exception): The exception raised by the call.
+
+    Returns:
+        True if the request was certainly not received, False otherwise.
+    """
+    return isinstance(exception, socket.error) and \
+           exception.errno == errno.ECONNREFUSED
+
+class CircuitBreaker(object):
+    """
+    Tracks consecutive transient failures of OSDF calls. After too many,
+    the breaker opens and calls fail immediately with a CircuitOpenError.
+    Once the reset timeout has passed, a single trial call is let through:
+    if it succeeds the breaker closes again, otherwise it stays open for
+    another timeout.
+
+    Attributes:
+        failure_threshold (int): The number of consecutive failures that
+                                 open the breaker.
+        reset_timeout (float): The number of seconds the breaker stays open
+                               before a trial call is allowed.
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Constructor for the CircuitBreaker class.
+
+        Args:
+            failure_threshold (int): The number of consecutive failures after
+                                     which to stop calling OSDF. Defaults
+                                     to 5.
+            reset_timeout (float): How many seconds to wait before trying
+                                   OSDF again. Defaults to 30.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self):
+        """
+        str: 'closed' when calls are allowed, 'open' when they are being
+             refused, or 'half-open' when a trial call may be made.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+
+            if time.time() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+
+            return "open"
+
+    def before_call(self):
+        """
+        Checks whether a call may be made.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Exceptions:
+            CircuitOpenError: If the breaker is open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            waited = time.time() - self._opened_at
+
+            if waited >= self.reset_timeout and not self._trial:
+                self._trial = True
+                return
+
+            raise CircuitOpenError("OSDF appears to be unavailable. Not " \
+                                   "retrying for another %.0f seconds." % \
+                                   max(self.reset_timeout - waited, 0))
+
+    def record_success(self):
+        """
+        Records a successful call, closing the breaker.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        """
+        Records a transient failure, opening the breaker if there have been
+        too many in a row.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._failures += 1
+
+            if self._trial or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial:
+                    module_logger.warn("Too many failures. Pausing requests " + \
+                                       "to OSDF for %s seconds.",
+                                       self.reset_timeout)
+                self._opened_at = time.time()
+                self._trial = False
+
+class RetryPolicy(object):
+    """
+    Describes how often, and how patiently, failed OSDF calls are repeated.
+    The delay before each retry doubles, up to a maximum, and is randomized
+    ("full jitter") so that many clients do not retry in lockstep.
+
+    Attributes:
+        max_attempts (int): The maximum number of times a call is made.
+        base_delay (float): The number of seconds to wait, at most, before
+                            the first retry.
+        max_delay (float): The upper limit, in seconds, of any one wait.
+        max_elapsed (float): The number of seconds after which a call is no
+                             longer retried, or None for no limit.
+        jitter (bool): Whether waits are randomized.
+    """
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=30.0,
+                 max_elapsed=300.0, jitter=True):
+        """
+        Constructor for the RetryPolicy class.
+
+        Args:
+            max_attempts (int): The maximum number of attempts per call,
+                                including the first. Defaults to 5.
+            base_delay (float): The initial backoff in seconds. Defaults to
+                                0.5.
+            max_delay (float): The maximum backoff in seconds. Defaults to
+                               30.
+            max_elapsed (float): The number of seconds after which to stop
+                                 retrying a call. Defaults to 5 minutes.
+            jitter (bool): Whether to randomize the backoff. Defaults to
+                           true.
+        """
+        if type(max_attempts) is not int or max_attempts < 1:
+            raise ValueError("Invalid number of attempts. Must be a " + \
+                             "positive integer.")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+
+    def backoff(self, attempt):
+        """
+        Calculates how long to wait after a failed attempt.
+
+        Args:
+            attempt (int): The number of the attempt that failed, from 1.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def call(self, func, args=(), kwargs=None, breaker=None, idempotent=True):
+        """
+        Calls func(*args, **kwargs), repeating the call while it fails
+        transiently and the policy allows.
+
+        Args:
+            func (callable): The OSDF call to make.
+            args (tuple): The positional arguments for func.
+            kwargs (dict): The keyword arguments for func.
+            breaker (CircuitBreaker): The circuit breaker to consult and
+                                      update, if any.
+            idempotent (bool): Whether repeating the call is harmless. Calls
+                               that are not are only repeated if they never
+                               reached the server.
+
+        Returns:
+            The return value of func.
+
+        Exceptions:
+            The exception from the last attempt, or CircuitOpenError if the
+            breaker is open.
+        """
+        kwargs = kwargs or {}
+        started = time.time()
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            if breaker is not None:
+                breaker.before_call()
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as call_exception:
+                if not is_transient(call_exception):
+                    # The server answered; it just did not like the request
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+
+                if breaker is not None:
+                    breaker.record_failure()
+
+                if not idempotent and not is_unsent(call_exception):
+                    raise
+
+                if attempt >= self.max_attempts:
+                    raise
+
+                delay = self.backoff(attempt)
+
+                if self.max_elapsed is not None and \
+                   time.time() - started + delay > self.max_elapsed:
+                    raise
+
+                module_logger.info("Attempt %s of %s at %s failed (%s). " + \
+                                   "Retrying in %.2f seconds.", attempt,
+                                   self.max_attempts,
+                                   getattr(func, '__name__', func),
+                                   call_exception, delay)
+                time.sleep(delay)
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+
+                return result
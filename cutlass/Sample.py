@@ -3,17 +3,18 @@ Models the sample object.
 """
 
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.mixs import MIXS, MixsException
 from cutlass.Base import Base
+from cutlass.registry import load_document
+from cutlass.Paginator import Paginator
 from cutlass.WgsDnaPrep import WgsDnaPrep
 from cutlass.SixteenSDnaPrep import SixteenSDnaPrep
 from cutlass.HostSeqPrep import HostSeqPrep
 from cutlass.MicrobiomeAssayPrep import MicrobiomeAssayPrep
 from cutlass.HostAssayPrep import HostAssayPrep
 from cutlass.SampleAttribute import SampleAttribute
-from cutlass.Util import enforce_dict, enforce_string
+from cutlass.Util import edges_query, enforce_dict, enforce_string
 
 # pylint: disable=W0703, C1801
 
@@ -22,6 +23,10 @@ module_logger = logging.getLogger(__name__)
 # Add a NullHandler for the case if no logging is configured by the application
 module_logger.addHandler(logging.NullHandler())
 
+# The node types of the preps that may be prepared from a sample
+PREP_TYPES = ["16s_dna_prep", "wgs_dna_prep", "host_seq_prep",
+              "microb_assay_prep", "host_assay_prep"]
+
 class Sample(Base):
     """
     The class encapsulates the data for a sample provided by a subject.
@@ -378,6 +383,7 @@ class Sample(Base):
             try:
                 self.logger.info("Attempting to update %s with ID: %s.", __name__, self.id)
                 session.get_osdf().edit_node(sample_data)
+                self._version = self._get_updated_version()
                 self.logger.info("Update for %s %s successful.", __name__, self.id)
                 success = True
             except Exception as edit_exception:
@@ -435,26 +441,26 @@ class Sample(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"sample"[node_type]':
-            query = '({}) && "sample"[node_type]'.format(query)
+        return list(Sample.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        sample_data = session.get_osdf().oql_query(Sample.namespace, query)
-
-        all_results = sample_data['results']
+    @staticmethod
+    def iter_search(query="\"sample\"[node_type]"):
+        """
+        Searches OSDF for Sample nodes, just like search(), but rather than
+        retrieving every result up front, streams them from OSDF one page at
+        a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Sample node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                sample_result = Sample.load_sample(result)
-                result_list.append(sample_result)
+        Returns:
+            An iterator of Sample objects, with the total number of results
+            available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Sample._iter_search("sample", query, Sample.load_sample)
 
     @staticmethod
     def load_sample(sample_data):
@@ -558,37 +564,13 @@ class Sample(Base):
 
         return sample_doc
 
-    def _dep_docs(self):
+    def _dep_docs(self, types=None):
         self.logger.debug("In _dep_docs().")
 
-        linkage_query = '"{}"[linkage.prepared_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(Sample.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("prepared_from", types)
 
     def _sample_attr_docs(self):
-        linkage_query = '"{}"[linkage.associated_with]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(Sample.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("associated_with", ["sample_attr"])
 
     def sampleAttributes(self):
         """
@@ -597,8 +579,7 @@ class Sample(Base):
         self.logger.debug("In sampleAttributes().")
 
         for doc in self._sample_attr_docs():
-            if doc['node_type'] == "sample_attr":
-                yield SampleAttribute.load_sample_attr(doc)
+            yield SampleAttribute.load_sample_attr(doc)
 
     def sixteenSDnaPreps(self):
         """
@@ -606,9 +587,8 @@ class Sample(Base):
         """
         self.logger.debug("In sixteenSDnaPreps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "16s_dna_prep":
-                yield SixteenSDnaPrep.load_sixteenSDnaPrep(doc)
+        for doc in self._dep_docs(["16s_dna_prep"]):
+            yield SixteenSDnaPrep.load_sixteenSDnaPrep(doc)
 
     def hostSeqPreps(self):
         """
@@ -616,9 +596,8 @@ class Sample(Base):
         """
         self.logger.debug("In hostSeqPreps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "host_seq_prep":
-                yield HostSeqPrep.load_host_seq_prep(doc)
+        for doc in self._dep_docs(["host_seq_prep"]):
+            yield HostSeqPrep.load_host_seq_prep(doc)
 
     def microbAssayPreps(self):
         """
@@ -626,9 +605,8 @@ class Sample(Base):
         """
         self.logger.debug("In microbAssayPreps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "microb_assay_prep":
-                yield MicrobiomeAssayPrep.load_microassayprep(doc)
+        for doc in self._dep_docs(["microb_assay_prep"]):
+            yield MicrobiomeAssayPrep.load_microassayprep(doc)
 
     def hostAssayPreps(self):
         """
@@ -636,9 +614,8 @@ class Sample(Base):
         """
         self.logger.debug("In hostAssayPreps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "host_assay_prep":
-                yield HostAssayPrep.load_host_assay_prep(doc)
+        for doc in self._dep_docs(["host_assay_prep"]):
+            yield HostAssayPrep.load_host_assay_prep(doc)
 
     def wgsDnaPreps(self):
         """
@@ -646,9 +623,8 @@ class Sample(Base):
         """
         self.logger.debug("In wgsDnaPreps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "wgs_dna_prep":
-                yield WgsDnaPrep.load_wgsDnaPrep(doc)
+        for doc in self._dep_docs(["wgs_dna_prep"]):
+            yield WgsDnaPrep.load_wgsDnaPrep(doc)
 
     def dnaPreps(self):
         """
@@ -656,11 +632,8 @@ class Sample(Base):
         """
         self.logger.debug("In dnaPreps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "16s_dna_prep":
-                yield SixteenSDnaPrep.load_sixteenSDnaPrep(doc)
-            elif doc['node_type'] == "wgs_dna_prep":
-                yield WgsDnaPrep.load_wgsDnaPrep(doc)
+        for doc in self._dep_docs(["16s_dna_prep", "wgs_dna_prep"]):
+            yield load_document(doc)
 
     def preps(self):
         """
@@ -668,17 +641,30 @@ class Sample(Base):
         """
         self.logger.debug("In preps().")
 
-        for doc in self._dep_docs():
-            if doc['node_type'] == "16s_dna_prep":
-                yield SixteenSDnaPrep.load_sixteenSDnaPrep(doc)
-            elif doc['node_type'] == "wgs_dna_prep":
-                yield WgsDnaPrep.load_wgsDnaPrep(doc)
-            elif doc['node_type'] == "host_seq_prep":
-                yield HostSeqPrep.load_host_seq_prep(doc)
-            elif doc['node_type'] == "microb_assay_prep":
-                yield MicrobiomeAssayPrep.load_microassayprep(doc)
-            elif doc['node_type'] == "host_assay_prep":
-                yield HostAssayPrep.load_host_assay_prep(doc)
+        for doc in self._dep_docs(PREP_TYPES):
+            yield load_document(doc)
+
+    @staticmethod
+    def preps_for(samples, chunk_size=50, concurrency=8):
+        """
+        Retrieves the preps prepared from each of many samples, using a few
+        batched queries rather than one query per sample.
+
+        Args:
+            samples (list): The samples, or their OSDF IDs.
+            chunk_size (int): The maximum number of samples per query.
+            concurrency (int): The maximum number of simultaneous queries.
+
+        Returns:
+            A dict mapping the OSDF ID of each sample to the list of its
+            preps.
+        """
+        module_logger.debug("In preps_for.")
+
+        session = iHMPSession.get_session()
+
+        return session.children_of(samples, "prepared_from", PREP_TYPES,
+                                   chunk_size, concurrency)
 
     def allChildren(self):
         """
@@ -686,8 +672,13 @@ class Sample(Base):
         """
         self.logger.debug("In all_children().")
 
-        for doc in self.preps():
-            yield doc
+        # A single query covers both the preps and the sample attributes
+        linkage_query = edges_query([self._id],
+                                    [("prepared_from", PREP_TYPES),
+                                     ("associated_with", ["sample_attr"])])
+
+        session = iHMPSession.get_session()
 
-        for attrib in self.sampleAttributes():
-            yield attrib
+        for child in Paginator(Sample.namespace, linkage_query,
+                               session.load_document):
+            yield child
@@ -3,11 +3,10 @@
 Models the sample attribute object.
 """
 
-import json
 import logging
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
-from cutlass.Util import enforce_string
+from cutlass.Util import enforce_string, recursive_delete
 
 # pylint: disable=W0703, C1801
 
@@ -309,6 +308,7 @@ class SampleAttribute(Base):
 
         return ("fecalcal", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -372,27 +372,28 @@ class SampleAttribute(Base):
         """
         module_logger.debug("In search.")
 
-        # Searching without any parameters will return all different results
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"sample_attr"[node_type]':
-            query = '({}) && "sample_attr"[node_type]'.format(query)
+        return list(SampleAttribute.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        attrib_data = session.get_osdf().oql_query(SampleAttribute.namespace, query)
+    @staticmethod
+    def iter_search(query="\"sample_attr\"[node_type]"):
+        """
+        Searches OSDF for SampleAttribute nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = attrib_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         SampleAttribute node type.
 
-        result_list = list()
+        Returns:
+            An iterator of SampleAttribute objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                attrib_result = SampleAttribute.load_sample_attr(result)
-                result_list.append(attrib_result)
+        loader = SampleAttribute.load_sample_attr
 
-        return result_list
+        return SampleAttribute._iter_search("sample_attr", query, loader)
 
     @staticmethod
     def load_sample_attr(attrib_data):
@@ -493,9 +494,9 @@ class SampleAttribute(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 node_id = osdf.insert_node(data)
@@ -517,8 +518,7 @@ class SampleAttribute(Base):
                 self.logger.debug("%s OSDF ID to update: %s.", __name__, attrib_id)
                 osdf.edit_node(attrib_data)
 
-                attrib_data = osdf.get_node(attrib_id)
-                latest_version = attrib_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is " + \
                                   "now: %s", __name__, str(latest_version))
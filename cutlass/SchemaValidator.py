@@ -0,0 +1,234 @@
+"""
+The SchemaValidator module validates node documents on the client, against
+the JSON schemas registered in OSDF, instead of asking the server to do it
+for every document. The schemas of a namespace are fetched from OSDF once
+and kept in an on-disk cache between sessions. Local validation requires
+the optional jsonschema package; without it, or whenever a document cannot
+be checked locally, validation is left to the server.
+"""
+
+import copy
+import errno
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cutlass", "schemas")
+
+class SchemaValidator(object):
+    """
+    Validates OSDF node documents against locally held copies of the
+    namespace schemas.
+
+    Attributes:
+        cache_dir (str): The directory holding the on-disk schema cache, or
+                         None if schemas are only held in memory.
+        max_age (float): The number of seconds schemas cached on disk are
+                         trusted before being fetched again.
+    """
+    def __init__(self, osdf, cache_dir=DEFAULT_CACHE_DIR, max_age=86400):
+        """
+        Constructor for the SchemaValidator class.
+
+        Args:
+            osdf (OSDF): The OSDF client to fetch schemas with.
+            cache_dir (str): The directory in which to cache schemas between
+                             sessions. Defaults to ~/.cutlass/schemas. Use
+                             None to disable the on-disk cache.
+            max_age (float): How many seconds schemas cached on disk remain
+                             valid. Defaults to one day.
+        """
+        self.logger = logging.getLogger(self.__module__ + '.' + \
+                                        self.__class__.__name__)
+        self.logger.addHandler(logging.NullHandler())
+
+        self._osdf = osdf
+        self.cache_dir = None
+        self.max_age = max_age
+
+        if cache_dir is not None:
+            self.cache_dir = os.path.expanduser(cache_dir)
+
+        self._lock = threading.Lock()
+        self._namespaces = {}
+        self._validators = {}
+
+    @staticmethod
+    def available():
+        """
+        Reports whether local validation is possible, which requires the
+        jsonschema package.
+
+        Args:
+            None
+
+        Returns:
+            True if documents can be validated locally, False otherwise.
+        """
+        return jsonschema is not None
+
+    def _cache_file(self, namespace):
+        server = "%s_%s" % (self._osdf.server, self._osdf.port)
+
+        return os.path.join(self.cache_dir, server, namespace + ".json")
+
+    def _read_cache(self, namespace):
+        if self.cache_dir is None:
+            return None
+
+        path = self._cache_file(namespace)
+
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                self.logger.info("Cached schemas for %s are stale.", namespace)
+                return None
+
+            with open(path) as cache_fh:
+                return json.load(cache_fh)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _write_cache(self, namespace, schemas):
+        if self.cache_dir is None:
+            return
+
+        path = self._cache_file(namespace)
+        tmp_path = "%s.%s.tmp" % (path, os.getpid())
+
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError as os_error:
+            if os_error.errno != errno.EEXIST:
+                self.logger.warn("Unable to create schema cache directory: %s",
+                                 os_error)
+                return
+
+        try:
+            with open(tmp_path, "w") as cache_fh:
+                json.dump(schemas, cache_fh)
+
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as io_error:
+            self.logger.warn("Unable to write schema cache: %s", io_error)
+
+    def _get_schemas(self, namespace):
+        with self._lock:
+            if namespace not in self._namespaces:
+                schemas = self._read_cache(namespace)
+
+                if schemas is None:
+                    self.logger.info("Retrieving schemas for namespace %s.",
+                                     namespace)
+                    schemas = {
+                        'schemas': self._osdf.get_schemas(namespace),
+                        'aux_schemas': self._osdf.get_aux_schemas(namespace)
+                    }
+                    self._write_cache(namespace, schemas)
+
+                self._namespaces[namespace] = schemas
+
+            return self._namespaces[namespace]
+
+    def _get_validator(self, namespace, node_type):
+        key = (namespace, node_type)
+
+        if key in self._validators:
+            return self._validators[key]
+
+        schemas = self._get_schemas(namespace)
+        schema = schemas['schemas'].get(node_type)
+        validator = None
+
+        if schema is not None:
+            aux_schemas = schemas['aux_schemas']
+
+            # Auxiliary schemas may be referred to either by name or as
+            # local definitions, so offer them both ways.
+            schema = copy.deepcopy(schema)
+            definitions = schema.setdefault('definitions', {})
+
+            for (aux_name, aux_schema) in aux_schemas.items():
+                definitions.setdefault(aux_name, aux_schema)
+
+            resolver = jsonschema.RefResolver("", schema, store=aux_schemas)
+            validator_class = jsonschema.validators.validator_for(
+                schema, default=jsonschema.Draft4Validator
+            )
+            validator = validator_class(schema, resolver=resolver)
+
+        self._validators[key] = validator
+
+        return validator
+
+    def validate(self, document):
+        """
+        Validates a node document against the schema for its node type.
+
+        Args:
+            document (dict): The node document to validate.
+
+        Returns:
+            A tuple with a boolean of whether the document validated and the
+            error message if it did not, just like OSDF.validate_node(). If
+            the document could not be checked locally, for instance because
+            no schema for its node type is known, None is returned instead.
+        """
+        if jsonschema is None:
+            return None
+
+        namespace = document.get('ns')
+        node_type = document.get('node_type')
+
+        if namespace is None or node_type is None:
+            return None
+
+        try:
+            validator = self._get_validator(namespace, node_type)
+
+            if validator is None:
+                self.logger.debug("No schema cached for %s.", node_type)
+                return None
+
+            problems = [error.message for error in validator.iter_errors(document)]
+        except jsonschema.RefResolutionError as ref_error:
+            self.logger.info("Unable to resolve schema reference: %s", ref_error)
+            return None
+
+        if problems:
+            return (False, "; ".join(problems))
+
+        return (True, None)
+
+    def refresh(self):
+        """
+        Discards all schemas held in memory and on disk so that they are
+        fetched from OSDF again on next use.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self.cache_dir is not None:
+                for namespace in self._namespaces:
+                    try:
+                        os.remove(self._cache_file(namespace))
+                    except OSError:
+                        pass
+
+            self._namespaces.clear()
+            self._validators.clear()
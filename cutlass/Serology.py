@@ -2,7 +2,6 @@
 Models the serology object.
 """
 
-import json
 import logging
 import os
 import string
@@ -396,6 +395,7 @@ class Serology(Base):
 
         return ("checksums", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -457,26 +457,26 @@ class Serology(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"serology"[node_type]':
-            query = '({}) && "serology"[node_type]'.format(query)
+        return list(Serology.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        data = session.get_osdf().oql_query(Serology.namespace, query)
-
-        all_results = data['results']
+    @staticmethod
+    def iter_search(query="\"serology\"[node_type]"):
+        """
+        Searches OSDF for Serology nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Serology node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                node_result = Serology.load_serology(result)
-                result_list.append(node_result)
+        Returns:
+            An iterator of Serology objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Serology._iter_search("serology", query, Serology.load_serology)
 
     @staticmethod
     def load_serology(data):
@@ -632,9 +632,9 @@ class Serology(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -661,8 +661,7 @@ class Serology(Base):
                 osdf.edit_node(node_data)
                 self.logger.info("Update for %s %s successful.", __name__, node_id)
 
-                node_data = osdf.get_node(node_id)
-                latest_version = node_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version)
@@ -0,0 +1,200 @@
+"""
+The SessionStats module keeps track of the work an iHMPSession does: how
+many of each OSDF operation were made, how long they took, how many bytes
+went over the wire and how long Aspera transfers took. The figures can be
+retrieved with iHMPSession.stats() and dumped as JSON at the end of a job
+to see where its time went.
+"""
+
+import json
+import threading
+
+# The upper bounds, in milliseconds, of the latency histogram buckets. Any
+# slower operation falls into a final, unbounded bucket.
+LATENCY_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+                   30000, 60000)
+
+class OperationStats(object):
+    """
+    The counters and latency histogram for one kind of operation.
+    """
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = None
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, seconds, error):
+        """
+        Records one operation that took the given number of seconds.
+        """
+        self.count += 1
+
+        if error:
+            self.errors += 1
+
+        self.total_time += seconds
+
+        if self.min_time is None or seconds < self.min_time:
+            self.min_time = seconds
+
+        if self.max_time is None or seconds > self.max_time:
+            self.max_time = seconds
+
+        millis = seconds * 1000
+        index = 0
+
+        while index < len(LATENCY_BUCKETS) and millis > LATENCY_BUCKETS[index]:
+            index += 1
+
+        self.buckets[index] += 1
+
+    def to_dict(self):
+        """
+        Returns the figures as a dictionary. Times are in seconds, and the
+        histogram maps each bucket's upper bound, in milliseconds, to the
+        number of operations that fell into it.
+        """
+        histogram = {}
+
+        for (index, bound) in enumerate(LATENCY_BUCKETS):
+            histogram["<=%s" % bound] = self.buckets[index]
+
+        histogram[">%s" % LATENCY_BUCKETS[-1]] = self.buckets[-1]
+
+        mean_time = None
+
+        if self.count:
+            mean_time = self.total_time / self.count
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_time': self.total_time,
+            'mean_time': mean_time,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+            'histogram_ms': histogram
+        }
+
+class SessionStats(object):
+    """
+    Thread-safe counters of the OSDF operations, network traffic and file
+    transfers of a session.
+    """
+    def __init__(self):
+        """
+        Constructor for the SessionStats class.
+
+        Args:
+            None
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Sets all counters back to zero.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._operations = {}
+            self._bytes_sent = 0
+            self._bytes_received = 0
+            self._requests = 0
+            self._transfers = OperationStats()
+
+    def record_operation(self, operation, seconds, error=False):
+        """
+        Records an OSDF operation, such as get_node or oql_query.
+
+        Args:
+            operation (str): The name of the operation.
+            seconds (float): How long the operation took.
+            error (bool): Whether the operation failed.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if operation not in self._operations:
+                self._operations[operation] = OperationStats()
+
+            self._operations[operation].record(seconds, error)
+
+    def record_bytes(self, sent, received):
+        """
+        Records the size of an HTTP request made to OSDF and of the response.
+
+        Args:
+            sent (int): The number of bytes in the request body.
+            received (int): The number of bytes in the response body.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._requests += 1
+            self._bytes_sent += sent
+            self._bytes_received += received
+
+    def record_transfer(self, seconds, success):
+        """
+        Records an Aspera file transfer.
+
+        Args:
+            seconds (float): How long the transfer took.
+            success (bool): Whether the transfer succeeded.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._transfers.record(seconds, not success)
+
+    def to_dict(self):
+        """
+        Returns a snapshot of all the figures as a dictionary.
+
+        Args:
+            None
+
+        Returns:
+            A dictionary with the figures for each OSDF operation under
+            'operations', the HTTP traffic under 'network', and the Aspera
+            transfers under 'transfers'.
+        """
+        with self._lock:
+            operations = {}
+
+            for (operation, op_stats) in self._operations.items():
+                operations[operation] = op_stats.to_dict()
+
+            return {
+                'operations': operations,
+                'network': {
+                    'requests': self._requests,
+                    'bytes_sent': self._bytes_sent,
+                    'bytes_received': self._bytes_received
+                },
+                'transfers': self._transfers.to_dict()
+            }
+
+    def to_json(self, indent=4):
+        """
+        Returns a snapshot of all the figures as a JSON string.
+
+        Args:
+            indent (int): The indent used to pretty print the JSON string.
+
+        Returns:
+            The JSON form of to_dict().
+        """
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
@@ -3,8 +3,8 @@ Models the 16S DNA prep object.
 """
 
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.mimarks import MIMARKS, MimarksException
 from cutlass.Base import Base
 from cutlass.SixteenSRawSeqSet import SixteenSRawSeqSet
@@ -517,29 +517,28 @@ class SixteenSDnaPrep(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"16s_dna_prep"[node_type]':
-            query = '({}) && "16s_dna_prep"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(SixteenSDnaPrep.iter_search(query))
 
-        sixteenSDnaPrep_data = session.get_osdf().oql_query(
-            SixteenSDnaPrep.namespace,
-            query
-        )
+    @staticmethod
+    def iter_search(query="\"16s_dna_prep\"[node_type]"):
+        """
+        Searches OSDF for SixteenSDnaPrep nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = sixteenSDnaPrep_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         SixteenSDnaPrep node type.
 
-        result_list = list()
+        Returns:
+            An iterator of SixteenSDnaPrep objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                sixteens_dna_prep_result = SixteenSDnaPrep.load_sixteenSDnaPrep(result)
-                result_list.append(sixteens_dna_prep_result)
+        loader = SixteenSDnaPrep.load_sixteenSDnaPrep
 
-        return result_list
+        return SixteenSDnaPrep._iter_search("16s_dna_prep", query, loader)
 
     @staticmethod
     def load_sixteenSDnaPrep(prep_data):
@@ -586,6 +585,7 @@ class SixteenSDnaPrep(Base):
 
         return prep
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from the OSDF instance. If the object
@@ -729,6 +729,7 @@ class SixteenSDnaPrep(Base):
             try:
                 self.logger.info("Attempting to update %s with ID: %s.", __name__, self._id)
                 session.get_osdf().edit_node(prep_data)
+                self._version = self._get_updated_version()
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
                 success = True
             except Exception as edit_exception:
@@ -743,16 +744,6 @@ class SixteenSDnaPrep(Base):
         Return iterator of all raw_seq_sets sequenced from this prep.
         """
         linkage_query = '"{}"[linkage.sequenced_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(SixteenSDnaPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield SixteenSRawSeqSet.load_16s_raw_seq_set(doc)
-
-            res_count -= len(res['results'])
 
-            if res_count < 1:
-                break
+        for doc in Paginator(SixteenSDnaPrep.namespace, linkage_query):
+            yield SixteenSRawSeqSet.load_16s_raw_seq_set(doc)
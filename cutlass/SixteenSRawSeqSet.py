@@ -2,12 +2,11 @@
 Models the 16S raw sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Base import Base
 from cutlass.aspera import aspera
 from cutlass.Util import *
@@ -543,28 +542,30 @@ class SixteenSRawSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != "\"16s_raw_seq_set\"[node_type]":
-            query = query + " && \"16s_raw_seq_set\"[node_type]"
-
-        sixteenSRawSeqSet_data = session.get_osdf().oql_query(
-            SixteenSRawSeqSet.namespace, query
-        )
+        return list(SixteenSRawSeqSet.iter_search(query))
 
-        all_results = sixteenSRawSeqSet_data['results']
+    @staticmethod
+    def iter_search(query="\"16s_raw_seq_set\"[node_type]"):
+        """
+        Searches OSDF for SixteenSRawSeqSet nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         SixteenSRawSeqSet node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                seq_set_result = SixteenSRawSeqSet.load_16s_raw_seq_set(result)
-                result_list.append(seq_set_result)
+        Returns:
+            An iterator of SixteenSRawSeqSet objects, with the total number
+            of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        loader = SixteenSRawSeqSet.load_16s_raw_seq_set
 
+        return SixteenSRawSeqSet._iter_search("16s_raw_seq_set", query, loader)
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from the OSDF instance. If the object
@@ -756,9 +757,9 @@ class SixteenSRawSeqSet(Base):
         if self.id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.info("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.info("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -785,8 +786,7 @@ class SixteenSRawSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now %s",
                                   __name__,
@@ -812,18 +812,7 @@ class SixteenSRawSeqSet(Base):
         self.logger.debug("In trimmed_seq_sets().")
 
         linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.SixteenSTrimmedSeqSet import SixteenSTrimmedSeqSet
 
-        for page_no in count(1):
-            res = query(SixteenSRawSeqSet.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield SixteenSTrimmedSeqSet.load_sixteenSTrimmedSeqSet(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in Paginator(SixteenSRawSeqSet.namespace, linkage_query):
+            yield SixteenSTrimmedSeqSet.load_sixteenSTrimmedSeqSet(doc)
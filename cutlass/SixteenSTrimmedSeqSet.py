@@ -2,12 +2,11 @@
 Models the 16S trimmed sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Base import Base
 from cutlass.aspera import aspera
 from cutlass.Util import *
@@ -492,30 +491,30 @@ class SixteenSTrimmedSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"16s_trimmed_seq_set"[node_type]':
-            query = '({}) && "16s_trimmed_seq_set"[node_type]'.format(query)
+        return list(SixteenSTrimmedSeqSet.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        sixteenSTrimmedSeqSet_data = session.get_osdf().oql_query(
-            SixteenSTrimmedSeqSet.namespace,
-            query
-        )
+    @staticmethod
+    def iter_search(query="\"16s_trimmed_seq_set\"[node_type]"):
+        """
+        Searches OSDF for SixteenSTrimmedSeqSet nodes, just like search(),
+        but rather than retrieving every result up front, streams them from
+        OSDF one page at a time as they are consumed.
 
-        all_results = sixteenSTrimmedSeqSet_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         SixteenSTrimmedSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of SixteenSTrimmedSeqSet objects, with the total
+            number of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                sixteens_trimmed_seq_set_result = \
-                    SixteenSTrimmedSeqSet.load_sixteenSTrimmedSeqSet(result)
-                result_list.append(sixteens_trimmed_seq_set_result)
+        loader = SixteenSTrimmedSeqSet.load_sixteenSTrimmedSeqSet
 
-        return result_list
+        return SixteenSTrimmedSeqSet._iter_search(
+            "16s_trimmed_seq_set", query, loader
+        )
 
     @staticmethod
     def load_sixteenSTrimmedSeqSet(seq_set_data):
@@ -672,9 +671,9 @@ class SixteenSTrimmedSeqSet(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -704,8 +703,7 @@ class SixteenSTrimmedSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__,
@@ -730,19 +728,7 @@ class SixteenSTrimmedSeqSet(Base):
 
         linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
 
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.AbundanceMatrix import AbundanceMatrix
 
-        for page_no in count(1):
-            res = query(SixteenSTrimmedSeqSet.namespace, linkage_query,
-                        page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield AbundanceMatrix.load_abundance_matrix(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in Paginator(SixteenSTrimmedSeqSet.namespace, linkage_query):
+            yield AbundanceMatrix.load_abundance_matrix(doc)
@@ -0,0 +1,273 @@
+"""
+The Snapshot module holds an in-memory copy of a node and the nodes beneath
+it. A snapshot is retrieved level by level, with the children of all the
+nodes of a level fetched by a handful of batched queries, and can then be
+walked, filtered and serialized without going back to OSDF.
+"""
+
+import json
+import logging
+from collections import OrderedDict
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+def _node_id(node):
+    if isinstance(node, basestring):
+        return node
+
+    return node.id
+
+class Snapshot(object):
+    """
+    A graph of a node and its descendants, indexed by parent, by child and
+    by node type. Nodes reachable along several paths appear only once.
+    Iterating over a snapshot yields its nodes in breadth-first order,
+    starting with the root.
+
+    Attributes:
+        root (Base): The node the snapshot was taken from.
+    """
+    def __init__(self, root):
+        """
+        Constructor for the Snapshot class. Snapshots are normally created
+        with build(), or a node's snapshot() method.
+
+        Args:
+            root (Base): The node at the top of the snapshot.
+        """
+        self.root = root
+
+        self._nodes = OrderedDict()
+        self._node_types = {}
+        self._depths = {}
+        self._children = {}
+        self._parents = {}
+        self._by_type = {}
+
+        self._add(root, 0)
+
+    @classmethod
+    def build(cls, root, max_depth=None, types=None, exclude_types=None,
+              chunk_size=50, concurrency=8):
+        """
+        Retrieves the nodes beneath a node, breadth first. The children of
+        all the nodes of a level are retrieved together, with batched
+        queries run concurrently, rather than node by node.
+
+        Args:
+            root (Base): The node to start from. It must have been saved.
+            max_depth (int): How many levels beneath the root to retrieve.
+                             Defaults to all of them.
+            types (list): The node types to retrieve. Nodes of other types,
+                          and the nodes beneath them, are left out. Defaults
+                          to all node types.
+            exclude_types (list): Node types to leave out, along with the
+                                  nodes beneath them.
+            chunk_size (int): The maximum number of parents per query.
+            concurrency (int): The maximum number of simultaneous queries.
+
+        Returns:
+            A Snapshot.
+        """
+        # Local import to avoid cyclic imports
+        from cutlass.dependency import retrieve_children
+
+        if root.id is None:
+            raise Exception("Node does not have an ID.")
+
+        snapshot = cls(root)
+        frontier = [root]
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+
+            module_logger.debug("Retrieving level %s of %s: %s nodes.", depth,
+                                root, len(frontier))
+
+            found = retrieve_children([(node.id, snapshot.node_type(node))
+                                       for node in frontier],
+                                      types, exclude_types, chunk_size,
+                                      concurrency)
+
+            next_frontier = []
+
+            for node in frontier:
+                for child in found[node.id]:
+                    if snapshot._add(child, depth):
+                        next_frontier.append(child)
+
+                    snapshot._link(node.id, child.id)
+
+            frontier = next_frontier
+
+        module_logger.info("Snapshot of %s holds %s nodes.", root, len(snapshot))
+
+        return snapshot
+
+    def _add(self, node, depth):
+        if node.id in self._nodes:
+            return False
+
+        node_type = node._get_raw_doc()['node_type']
+
+        self._nodes[node.id] = node
+        self._node_types[node.id] = node_type
+        self._depths[node.id] = depth
+        self._children[node.id] = []
+        self._parents[node.id] = []
+        self._by_type.setdefault(node_type, []).append(node.id)
+
+        return True
+
+    def _link(self, parent_id, child_id):
+        if child_id not in self._children[parent_id]:
+            self._children[parent_id].append(child_id)
+            self._parents[child_id].append(parent_id)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __iter__(self):
+        return iter(list(self._nodes.values()))
+
+    def __contains__(self, node):
+        return _node_id(node) in self._nodes
+
+    def get(self, node_id):
+        """
+        Returns the node with the given OSDF ID, or None if it is not in the
+        snapshot.
+        """
+        return self._nodes.get(node_id)
+
+    def node_type(self, node):
+        """
+        Returns the node type of a node in the snapshot, such as "sample".
+        """
+        return self._node_types[_node_id(node)]
+
+    def depth(self, node):
+        """
+        Returns how many levels beneath the root a node is. The root is at
+        depth 0.
+        """
+        return self._depths[_node_id(node)]
+
+    def children(self, node):
+        """
+        Returns the list of children of a node in the snapshot.
+
+        Args:
+            node (Base): The node, or its OSDF ID.
+
+        Returns:
+            A list of nodes.
+        """
+        return [self._nodes[child_id] for child_id in self._children[_node_id(node)]]
+
+    def parents(self, node):
+        """
+        Returns the list of the parents of a node that are in the snapshot.
+
+        Args:
+            node (Base): The node, or its OSDF ID.
+
+        Returns:
+            A list of nodes.
+        """
+        return [self._nodes[parent_id] for parent_id in self._parents[_node_id(node)]]
+
+    def descendants(self, node=None):
+        """
+        Returns every node beneath a node, breadth first.
+
+        Args:
+            node (Base): The node, or its OSDF ID. Defaults to the root.
+
+        Returns:
+            A list of nodes, not including the node itself.
+        """
+        if node is None:
+            node = self.root
+
+        start = _node_id(node)
+        seen = set([start])
+        queue = [start]
+        found = []
+
+        while queue:
+            node_id = queue.pop(0)
+
+            for child_id in self._children[node_id]:
+                if child_id not in seen:
+                    seen.add(child_id)
+                    queue.append(child_id)
+                    found.append(self._nodes[child_id])
+
+        return found
+
+    def of_type(self, node_type):
+        """
+        Returns the nodes of the given node type, such as "visit".
+        """
+        return [self._nodes[node_id] for node_id in self._by_type.get(node_type, [])]
+
+    def filter(self, predicate):
+        """
+        Returns the nodes for which predicate(node) is true, in breadth-first
+        order.
+        """
+        return [node for node in self._nodes.values() if predicate(node)]
+
+    def edges(self):
+        """
+        Returns the links in the snapshot as a list of (parent ID, child ID)
+        tuples.
+        """
+        return [(parent_id, child_id)
+                for (parent_id, child_ids) in self._children.items()
+                for child_id in child_ids]
+
+    def to_dict(self):
+        """
+        Converts the snapshot to a dictionary holding the OSDF ID of the
+        root, the document of every node and the links between them.
+
+        Args:
+            None
+
+        Returns:
+            A dictionary with 'root', 'nodes' and 'edges' keys.
+        """
+        docs = []
+
+        for node in self._nodes.values():
+            doc = node._get_raw_doc()
+            doc['id'] = node.id
+
+            if node.version is not None:
+                doc['ver'] = node.version
+
+            docs.append(doc)
+
+        return {
+            'root': self.root.id,
+            'nodes': docs,
+            'edges': [list(edge) for edge in sorted(self.edges())]
+        }
+
+    def to_json(self, indent=4):
+        """
+        Converts the snapshot to a JSON string. See to_dict().
+
+        Args:
+            indent (int): The indent used to pretty print the JSON string.
+
+        Returns:
+            A JSON string.
+        """
+        return json.dumps(self.to_dict(), indent=indent)
@@ -3,8 +3,8 @@ This module models the study object.
 """
 
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Base import Base
 from cutlass.Subject import Subject
 from cutlass.Util import *
@@ -342,26 +342,26 @@ class Study(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"study"[node_type]':
-            query = '({}) && "study"[node_type]'.format(query)
+        return list(Study.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        study_data = session.get_osdf().oql_query(Study.namespace, query)
-
-        all_results = study_data['results']
+    @staticmethod
+    def iter_search(query="\"study\"[node_type]"):
+        """
+        Searches OSDF for Study nodes, just like search(), but rather than
+        retrieving every result up front, streams them from OSDF one page at
+        a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Study node type.
 
-        if len(all_results) > 0:
-            for i in all_results:
-                study_result = Study.load_study(i)
-                result_list.append(study_result)
+        Returns:
+            An iterator of Study objects, with the total number of results
+            available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Study._iter_search("study", query, Study.load_study)
 
     @staticmethod
     def load_study(study_data):
@@ -401,6 +401,7 @@ class Study(Base):
         module_logger.debug("Returning loaded Study.")
         return study
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from the OSDF instance. If the object
@@ -542,6 +543,7 @@ class Study(Base):
             try:
                 self.logger.info("Attempting to update %s with ID: %s.", __name__, self._id)
                 session.get_osdf().edit_node(study_data)
+                self._version = self._get_updated_version()
 
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
                 success = True
@@ -590,18 +592,9 @@ class Study(Base):
         self.logger.debug("In studies.")
 
         linkage_query = '"{}"[linkage.subset_of]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(Study.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield Study.load_study(doc)
 
-            res_count -= len(res['results'])
-            if res_count < 1:
-                break
+        for doc in Paginator(Study.namespace, linkage_query):
+            yield Study.load_study(doc)
 
 
     def subjects(self):
@@ -611,16 +604,28 @@ class Study(Base):
         self.logger.debug("In subjects.")
 
         linkage_query = '"{}"[linkage.participates_in]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
 
-        for page_no in count(1):
-            res = query(Study.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
+        for doc in Paginator(Study.namespace, linkage_query):
+            yield Subject.load_subject(doc)
 
-            for doc in res['results']:
-                yield Subject.load_subject(doc)
+    @staticmethod
+    def subjects_for(studies, chunk_size=50, concurrency=8):
+        """
+        Retrieves the subjects participating in each of many studies, using a
+        few batched queries rather than one query per study.
 
-            res_count -= len(res['results'])
+        Args:
+            studies (list): The studies, or their OSDF IDs.
+            chunk_size (int): The maximum number of studies per query.
+            concurrency (int): The maximum number of simultaneous queries.
+
+        Returns:
+            A dict mapping the OSDF ID of each study to the list of its
+            subjects.
+        """
+        module_logger.debug("In subjects_for.")
+
+        session = iHMPSession.get_session()
 
-            if res_count < 1:
-                break
+        return session.children_of(studies, "participates_in", ["subject"],
+                                   chunk_size, concurrency)
@@ -2,10 +2,9 @@
 Models the subject object.
 """
 
-import json
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Base import Base
 from cutlass.Util import *
 
@@ -266,6 +265,7 @@ class Subject(Base):
         module_logger.debug("In required_fields.")
         return ("rand_subject_id", "gender", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from the OSDF instance. If the object
@@ -327,26 +327,26 @@ class Subject(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"subject"[node_type]':
-            query = '({}) && "subject"[node_type]'.format(query)
+        return list(Subject.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        subject_data = session.get_osdf().oql_query(Subject.namespace, query)
-
-        all_results = subject_data['results']
+    @staticmethod
+    def iter_search(query="\"subject\"[node_type]"):
+        """
+        Searches OSDF for Subject nodes, just like search(), but rather than
+        retrieving every result up front, streams them from OSDF one page at
+        a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Subject node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                subject_result = Subject.load_subject(result)
-                result_list.append(subject_result)
+        Returns:
+            An iterator of Subject objects, with the total number of results
+            available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Subject._iter_search("subject", query, Subject.load_subject)
 
     @staticmethod
     def load_subject(subject_data):
@@ -436,9 +436,9 @@ class Subject(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 node_id = osdf.insert_node(data)
@@ -459,8 +459,7 @@ class Subject(Base):
                 self.logger.debug("%s OSDF ID to update: %s.", __name__, subject_id)
                 osdf.edit_node(subject_data)
 
-                subject_data = osdf.get_node(subject_id)
-                latest_version = subject_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s", __name__,
                                   str(latest_version)
@@ -480,19 +479,31 @@ class Subject(Base):
         from cutlass.Visit import Visit
 
         linkage_query = '"{}"[linkage.by]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
 
-        for page_no in count(1):
-            res = query(Subject.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
+        for doc in Paginator(Subject.namespace, linkage_query):
+            yield Visit.load_visit(doc)
 
-            for doc in res['results']:
-                yield Visit.load_visit(doc)
+    @staticmethod
+    def visits_for(subjects, chunk_size=50, concurrency=8):
+        """
+        Retrieves the visits by each of many subjects, using a few
+        batched queries rather than one query per subject.
 
-            res_count -= len(res['results'])
+        Args:
+            subjects (list): The subjects, or their OSDF IDs.
+            chunk_size (int): The maximum number of subjects per query.
+            concurrency (int): The maximum number of simultaneous queries.
 
-            if res_count < 1:
-                break
+        Returns:
+            A dict mapping the OSDF ID of each subject to the list of its
+            visits.
+        """
+        module_logger.debug("In visits_for.")
+
+        session = iHMPSession.get_session()
+
+        return session.children_of(subjects, "by", ["visit"],
+                                   chunk_size, concurrency)
 
     def attributes(self):
         """
@@ -502,19 +513,9 @@ class Subject(Base):
         from cutlass.SubjectAttribute import SubjectAttribute
 
         linkage_query = '"{}"[linkage.associated_with]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(Subject.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield SubjectAttribute.load_subject_attr(doc)
-
-            res_count -= len(res['results'])
 
-            if res_count < 1:
-                break
+        for doc in Paginator(Subject.namespace, linkage_query):
+            yield SubjectAttribute.load_subject_attr(doc)
 
     def derivations(self):
         """
@@ -2,11 +2,10 @@
 Models the subject attribute object.
 """
 
-import json
 import logging
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
-from cutlass.Util import enforce_bool, enforce_int, enforce_string
+from cutlass.Util import enforce_bool, enforce_int, enforce_string, recursive_delete
 
 # pylint: disable=W0703, C1801, C0302
 
@@ -1205,6 +1204,7 @@ class SubjectAttribute(Base):
         # A tuple of one must have a comma after the single value...
         return ("tags",)
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -1266,28 +1266,28 @@ class SubjectAttribute(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"subject_attr"[node_type]':
-            query = '({}) && "subject_attr"[node_type]'.format(query)
+        return list(SubjectAttribute.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        data = session.get_osdf().oql_query(
-            SubjectAttribute.namespace, query
-        )
+    @staticmethod
+    def iter_search(query="\"subject_attr\"[node_type]"):
+        """
+        Searches OSDF for SubjectAttribute nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         SubjectAttribute node type.
 
-        result_list = list()
+        Returns:
+            An iterator of SubjectAttribute objects, with the total number
+            of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                node_result = SubjectAttribute.load_subject_attr(result)
-                result_list.append(node_result)
+        loader = SubjectAttribute.load_subject_attr
 
-        return result_list
+        return SubjectAttribute._iter_search("subject_attr", query, loader)
 
     @staticmethod
     def load_subject_attr(attrib_data):
@@ -1473,9 +1473,9 @@ class SubjectAttribute(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 node_id = osdf.insert_node(data)
@@ -1498,8 +1498,7 @@ class SubjectAttribute(Base):
                 self.logger.debug("%s OSDF ID to update: %s.", __name__, node_id)
                 osdf.edit_node(node_data)
 
-                node_data = osdf.get_node(node_id)
-                latest_version = node_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, latest_version
@@ -1,8 +1,11 @@
 """
-Provide utility decorators and python version checking.
+Provide utility decorators, python version checking and a helper for
+running OSDF operations concurrently.
 """
 
 from datetime import datetime
+from functools import wraps
+from multiprocessing.pool import ThreadPool
 
 import os
 import sys
@@ -105,6 +108,143 @@ def enforce_past_date(func):
 
     return wrapper
 
+def recursive_delete(func):
+    """
+    Decorator giving a node class's delete() method the recursive and
+    concurrency arguments described in Base.delete(). With recursive, the
+    node is deleted along with every node beneath it by delete_tree().
+    """
+    @wraps(func)
+    def wrapper(self, recursive=False, concurrency=8):
+        if recursive:
+            (_deleted, failed) = self.delete_tree(concurrency)
+            return len(failed) == 0
+
+        return func(self)
+
+    return wrapper
+
+def run_concurrently(func, items, concurrency=1):
+    """
+    Applies func to every item in items, running up to concurrency calls at
+    once on a pool of threads. An exception raised for one item does not
+    prevent the remaining items from being processed.
+
+    Args:
+        func (callable): The function to apply to each item.
+        items (iterable): The items to process.
+        concurrency (int): The maximum number of simultaneous calls.
+
+    Returns:
+        A list of (result, exception) tuples in the same order as the items.
+        For each item, exception is None if func succeeded, otherwise
+        result is None and exception holds what func raised.
+    """
+    def attempt(item):
+        try:
+            return (func(item), None)
+        except Exception as exception:
+            return (None, exception)
+
+    items = list(items)
+
+    if concurrency <= 1 or len(items) <= 1:
+        return [attempt(item) for item in items]
+
+    pool = ThreadPool(min(concurrency, len(items)))
+
+    try:
+        return pool.map(attempt, items)
+    finally:
+        pool.close()
+        pool.join()
+
+def collect_outcomes(keys, outcomes):
+    """
+    Splits the (result, exception) tuples produced by run_concurrently()
+    into the list of results and a dict of the failures.
+
+    Args:
+        keys (list): The item (or an identifier for it) that each outcome
+                     belongs to, in the same order as the outcomes.
+        outcomes (list): The (result, exception) tuples.
+
+    Returns:
+        A tuple with the list of results, holding None for every failed
+        item, and a dict mapping the key of each failed item to its
+        exception.
+    """
+    results = []
+    errors = {}
+
+    for (key, (result, exception)) in zip(keys, outcomes):
+        results.append(result)
+
+        if exception is not None:
+            errors[key] = exception
+
+    return (results, errors)
+
+def linkage_query(node_ids, edge, types=None):
+    """
+    Builds an OQL query for the nodes linked through an edge to any of the
+    given nodes, optionally only those of the given node types.
+
+    Args:
+        node_ids (list): The OSDF IDs of the nodes being linked to.
+        edge (str): The name of the linkage, such as "collected_during".
+        types (list): The node types to include. Defaults to all types.
+
+    Returns:
+        The OQL query string.
+    """
+    def any_of(terms):
+        if len(terms) > 1:
+            return "({})".format(" || ".join(terms))
+
+        return terms[0]
+
+    query = any_of(['"{}"[linkage.{}]'.format(node_id, edge)
+                    for node_id in node_ids])
+
+    if types:
+        type_query = any_of(['"{}"[node_type]'.format(node_type)
+                             for node_type in types])
+        query = "{} && {}".format(query, type_query)
+
+    return query
+
+def id_query(node_ids):
+    """
+    Builds an OQL query for the nodes with any of the given OSDF IDs.
+
+    Args:
+        node_ids (list): The OSDF IDs of the nodes.
+
+    Returns:
+        The OQL query string.
+    """
+    return " || ".join(['"{}"[id]'.format(node_id) for node_id in node_ids])
+
+def edges_query(node_ids, edges):
+    """
+    Builds a single OQL query for the nodes linked to any of the given nodes
+    through any of several edges, each restricted to its own node types.
+
+    Args:
+        node_ids (list): The OSDF IDs of the nodes being linked to.
+        edges (list): (edge, types) tuples, as taken by linkage_query().
+
+    Returns:
+        The OQL query string.
+    """
+    queries = [linkage_query(node_ids, edge, types) for (edge, types) in edges]
+
+    if len(queries) > 1:
+        return " || ".join(["({})".format(query) for query in queries])
+
+    return queries[0]
+
 def check_python_version(min_version=PYTHON_MIN_VERSION,
                          max_version=PYTHON_MAX_VERSION,
                          raise_exception_on_fail=False,
@@ -2,13 +2,12 @@
 Models the viral sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
+from cutlass.registry import load_document
 from cutlass.aspera import aspera
 from cutlass.Util import *
 
@@ -396,6 +395,7 @@ class ViralSeqSet(Base):
 
         return ("checksums", "local_file", "study", "tags")
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from OSDF. If the object has not been
@@ -457,26 +457,28 @@ class ViralSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"viral_seq_set"[node_type]':
-            query = '({}) && "viral_seq_set"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(ViralSeqSet.iter_search(query))
 
-        data = session.get_osdf().oql_query(ViralSeqSet.namespace, query)
+    @staticmethod
+    def iter_search(query="\"viral_seq_set\"[node_type]"):
+        """
+        Searches OSDF for ViralSeqSet nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        all_results = data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         ViralSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of ViralSeqSet objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                node_result = ViralSeqSet.load_viral_seq_set(result)
-                result_list.append(node_result)
+        loader = ViralSeqSet.load_viral_seq_set
 
-        return result_list
+        return ViralSeqSet._iter_search("viral_seq_set", query, loader)
 
     @staticmethod
     def load_viral_seq_set(data):
@@ -632,9 +634,9 @@ class ViralSeqSet(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -661,8 +663,7 @@ class ViralSeqSet(Base):
                 osdf.edit_node(node_data)
                 self.logger.info("Update for %s %s successful.", __name__, node_id)
 
-                node_data = osdf.get_node(node_id)
-                latest_version = node_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__, str(latest_version)
@@ -679,22 +680,10 @@ class ViralSeqSet(Base):
         self.logger.debug("Returning %s", str(success))
         return success
 
-    def _derived_docs(self):
+    def _derived_docs(self, types=None):
         self.logger.debug("In _derived_docs().")
 
-        linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(ViralSeqSet.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield doc
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        return self._linked_docs("computed_from", types)
 
     def derivations(self):
         """
@@ -703,12 +692,6 @@ class ViralSeqSet(Base):
         """
         self.logger.debug("In derivations().")
 
-        from cutlass.AbundanceMatrix import AbundanceMatrix
-        from cutlass.Annotation import Annotation
-
-        for doc in self._derived_docs():
-            if doc['node_type'] == "abundance_matrix":
-                yield AbundanceMatrix.load_abundance_matrix(doc)
-            elif doc['node_type'] == "annotation":
-                yield Annotation.load_annotation(doc)
+        for doc in self._derived_docs(["abundance_matrix", "annotation"]):
+            yield load_document(doc)
    
@@ -4,8 +4,8 @@ Models the visit object.
 
 import json
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
+from cutlass.Paginator import Paginator
 from cutlass.Base import Base
 from cutlass.Sample import Sample
 from cutlass.VisitAttribute import VisitAttribute
@@ -346,26 +346,26 @@ class Visit(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"visit"[node_type]':
-            query = '({}) && "visit"[node_type]'.format(query)
+        return list(Visit.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        visit_data = session.get_osdf().oql_query(Visit.namespace, query)
-
-        all_results = visit_data['results']
+    @staticmethod
+    def iter_search(query="\"visit\"[node_type]"):
+        """
+        Searches OSDF for Visit nodes, just like search(), but rather than
+        retrieving every result up front, streams them from OSDF one page at
+        a time as they are consumed.
 
-        result_list = list()
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         Visit node type.
 
-        if len(all_results) > 0:
-            for result in all_results:
-                visit_result = Visit.load_visit(result)
-                result_list.append(visit_result)
+        Returns:
+            An iterator of Visit objects, with the total number of results
+            available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        return result_list
+        return Visit._iter_search("visit", query, Visit.load_visit)
 
     @staticmethod
     def load_visit(visit_data):
@@ -409,6 +409,7 @@ class Visit(Base):
 
         return visit
 
+    @recursive_delete
     def delete(self):
         """
         Deletes the current object (self) from the OSDF instance. If the object
@@ -549,6 +550,7 @@ class Visit(Base):
             try:
                 self.logger.info("Attempting to update %s with ID: %s.", __name__, self._id)
                 session.get_osdf().edit_node(visit_data)
+                self._version = self._get_updated_version()
                 self.logger.info("Update for %s %s successful.", __name__, self._id)
                 success = True
             except Exception as edit_exception:
@@ -563,19 +565,30 @@ class Visit(Base):
         """
         linkage_query = '"{}"[linkage.collected_during]'.format(self.id)
 
-        query = iHMPSession.get_session().get_osdf().oql_query
+        for doc in Paginator(Visit.namespace, linkage_query):
+            yield Sample.load_sample(doc)
 
-        for page_no in count(1):
-            res = query(Visit.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
+    @staticmethod
+    def samples_for(visits, chunk_size=50, concurrency=8):
+        """
+        Retrieves the samples collected during each of many visits, using a
+        few batched queries rather than one query per visit.
 
-            for doc in res['results']:
-                yield Sample.load_sample(doc)
+        Args:
+            visits (list): The visits, or their OSDF IDs.
+            chunk_size (int): The maximum number of visits per query.
+            concurrency (int): The maximum number of simultaneous queries.
 
-            res_count -= len(res['results'])
+        Returns:
+            A dict mapping the OSDF ID of each visit to the list of its
+            samples.
+        """
+        module_logger.debug("In samples_for.")
 
-            if res_count < 1:
-                break
+        session = iHMPSession.get_session()
+
+        return session.children_of(visits, "collected_during", ["sample"],
+                                   chunk_size, concurrency)
 
     def visit_attributes(self):
         """
@@ -592,16 +605,6 @@ class Visit(Base):
         from VisitAttribute import VisitAttribute
 
         linkage_query = '"{}"[linkage.associated_with]'.format(self.id)
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(Visit.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield VisitAttribute.load_visit_attr(doc)
-
-            res_count -= len(res['results'])
 
-            if res_count < 1:
-                break
+        for doc in Paginator(Visit.namespace, linkage_query):
+            yield VisitAttribute.load_visit_attr(doc)
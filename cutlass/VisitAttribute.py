@@ -644,26 +644,28 @@ class VisitAttribute(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"visit_attr"[node_type]':
-            query = '({}) && "visit_attr"[node_type]'.format(query)
+        return list(VisitAttribute.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        attrib_data = session.get_osdf().oql_query(VisitAttribute.namespace, query)
+    @staticmethod
+    def iter_search(query="\"visit_attr\"[node_type]"):
+        """
+        Searches OSDF for VisitAttribute nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = attrib_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         VisitAttribute node type.
 
-        result_list = list()
+        Returns:
+            An iterator of VisitAttribute objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                attrib_result = VisitAttribute.load_visit_attr(result)
-                result_list.append(attrib_result)
+        loader = VisitAttribute.load_visit_attr
 
-        return result_list
+        return VisitAttribute._iter_search("visit_attr", query, loader)
 
     def save(self):
         """
@@ -714,6 +716,7 @@ class VisitAttribute(Base):
             try:
                 self.logger.info("Attempting to update ID: %s.", self.id)
                 session.get_osdf().edit_node(data)
+                self._version = self._get_updated_version()
                 self.logger.info("Update for %s successful.", self.id)
                 success = True
             except Exception as edit_exception:
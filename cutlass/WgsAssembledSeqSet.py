@@ -2,11 +2,9 @@
 Models the WGS assembled sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
 from cutlass.aspera import aspera
@@ -567,28 +565,30 @@ class WgsAssembledSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"wgs_assembled_seq_set"[node_type]':
-            query = '({}) && "wgs_assembled_seq_set"[node_type]'.format(query)
+        return list(WgsAssembledSeqSet.iter_search(query))
 
-        module_logger.debug("Submitting OQL query: %s", query)
-
-        wgsAssembledSeqSet_data = session.get_osdf().oql_query(
-            WgsAssembledSeqSet.namespace, query
-        )
+    @staticmethod
+    def iter_search(query="\"wgs_assembled_seq_set\"[node_type]"):
+        """
+        Searches OSDF for WgsAssembledSeqSet nodes, just like search(), but
+        rather than retrieving every result up front, streams them from OSDF
+        one page at a time as they are consumed.
 
-        all_results = wgsAssembledSeqSet_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         WgsAssembledSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of WgsAssembledSeqSet objects, with the total number
+            of results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                wgs_result = WgsAssembledSeqSet.load_wgsAssembledSeqSet(result)
-                result_list.append(wgs_result)
+        loader = WgsAssembledSeqSet.load_wgsAssembledSeqSet
 
-        return result_list
+        return WgsAssembledSeqSet._iter_search(
+            "wgs_assembled_seq_set", query, loader
+        )
 
     @staticmethod
     def load_wgsAssembledSeqSet(seq_set_data):
@@ -826,9 +826,9 @@ class WgsAssembledSeqSet(Base):
             # The document has not yet been saved
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
             self.logger.info("Got the raw JSON document.")
 
             try:
@@ -855,8 +855,7 @@ class WgsAssembledSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now: %s",
                                   __name__,
@@ -880,25 +879,10 @@ class WgsAssembledSeqSet(Base):
         """
         self.logger.debug("In abundance_matrices().")
 
-        linkage_query = '"abundance_matrix"[node_type] && ' + \
-                        '"{}"[linkage.computed_from]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.AbundanceMatrix import AbundanceMatrix
 
-        for page_no in count(1):
-            res = query(WgsAssembledSeqSet.namespace, linkage_query,
-                        page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield AbundanceMatrix.load_abundance_matrix(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in self._linked_docs("computed_from", ["abundance_matrix"]):
+            yield AbundanceMatrix.load_abundance_matrix(doc)
 
     def annotations(self):
         """
@@ -907,24 +891,10 @@ class WgsAssembledSeqSet(Base):
         """
         self.logger.debug("In annotations().")
 
-        linkage_query = '"annotation"[node_type] && "{}"[linkage.computed_from]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.Annotation import Annotation
 
-        for page_no in count(1):
-            res = query(WgsAssembledSeqSet.namespace, linkage_query,
-                        page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield Annotation.load_annotation(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in self._linked_docs("computed_from", ["annotation"]):
+            yield Annotation.load_annotation(doc)
 
     def derivations(self):
         """
@@ -3,10 +3,10 @@ Models the WGS DNA prep object.
 """
 
 import logging
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.mims import MIMS, MimsException
 from cutlass.Base import Base
+from cutlass.registry import load_document
 from cutlass.Util import *
 
 # pylint: disable=W0703, C1801
@@ -516,26 +516,28 @@ class WgsDnaPrep(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"wgs_dna_prep"[node_type]':
-            query = '({}) && "wgs_dna_prep"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(WgsDnaPrep.iter_search(query))
 
-        wgsDnaPrep_data = session.get_osdf().oql_query(WgsDnaPrep.namespace, query)
+    @staticmethod
+    def iter_search(query="\"wgs_dna_prep\"[node_type]"):
+        """
+        Searches OSDF for WgsDnaPrep nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        all_results = wgsDnaPrep_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         WgsDnaPrep node type.
 
-        result_list = list()
+        Returns:
+            An iterator of WgsDnaPrep objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for result in all_results:
-                prep_result = WgsDnaPrep.load_wgsDnaPrep(result)
-                result_list.append(prep_result)
+        loader = WgsDnaPrep.load_wgsDnaPrep
 
-        return result_list
+        return WgsDnaPrep._iter_search("wgs_dna_prep", query, loader)
 
     @staticmethod
     def load_wgsDnaPrep(prep_data):
@@ -659,6 +661,7 @@ class WgsDnaPrep(Base):
                                  __name__, self._id
                                 )
                 session.get_osdf().edit_node(prep_data)
+                self._version = self._get_updated_version()
                 self.logger.info("Update for %s %s successful.",
                                  __name__, self._id
                                 )
@@ -677,27 +680,8 @@ class WgsDnaPrep(Base):
         """
         self.logger.debug("In child_seq_sets.")
 
-        linkage_query = '"{}"[linkage.sequenced_from]'.format(self.id)
-
-        from cutlass.WgsRawSeqSet import WgsRawSeqSet
-        from cutlass.MicrobTranscriptomicsRawSeqSet import MicrobTranscriptomicsRawSeqSet
-        from cutlass.ViralSeqSet import ViralSeqSet
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
-        for page_no in count(1):
-            res = query(WgsDnaPrep.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                if doc['node_type'] == "wgs_raw_seq_set":
-                    yield WgsRawSeqSet.load_wgsRawSeqSet(doc)
-                elif doc['node_type'] == "viral_seq_set":
-                    yield ViralSeqSet.load_viral_seq_set(doc)
-                elif doc['node_type'] == "microb_transcriptomics_raw_seq_set":
-                    yield MicrobTranscriptomicsRawSeqSet.load_microb_transcriptomics_raw_seq_set(doc)
-
-            res_count -= len(res['results'])
+        seq_set_types = ["wgs_raw_seq_set", "viral_seq_set",
+                         "microb_transcriptomics_raw_seq_set"]
 
-            if res_count < 1:
-                break
+        for doc in self._linked_docs("sequenced_from", seq_set_types):
+            yield load_document(doc)
@@ -2,11 +2,9 @@
 Models the WGS raw sequence set object.
 """
 
-import json
 import logging
 import os
 import string
-from itertools import count
 from cutlass.iHMPSession import iHMPSession
 from cutlass.Base import Base
 from cutlass.aspera import aspera
@@ -544,26 +542,28 @@ class WgsRawSeqSet(Base):
         """
         module_logger.debug("In search.")
 
-        session = iHMPSession.get_session()
-        module_logger.info("Got iHMP session.")
-
-        if query != '"wgs_raw_seq_set"[node_type]':
-            query = '({}) && "wgs_raw_seq_set"[node_type]'.format(query)
-
-        module_logger.debug("Submitting OQL query: %s", query)
+        return list(WgsRawSeqSet.iter_search(query))
 
-        wgsRawSeqSet_data = session.get_osdf().oql_query("ihmp", query)
+    @staticmethod
+    def iter_search(query="\"wgs_raw_seq_set\"[node_type]"):
+        """
+        Searches OSDF for WgsRawSeqSet nodes, just like search(), but rather
+        than retrieving every result up front, streams them from OSDF one
+        page at a time as they are consumed.
 
-        all_results = wgsRawSeqSet_data['results']
+        Args:
+            query (str): The query for the OSDF framework. Defaults to the
+                         WgsRawSeqSet node type.
 
-        result_list = list()
+        Returns:
+            An iterator of WgsRawSeqSet objects, with the total number of
+            results available as its result_count attribute.
+        """
+        module_logger.debug("In iter_search.")
 
-        if len(all_results) > 0:
-            for i in all_results:
-                wgsRawSeqSet_result = WgsRawSeqSet.load_wgsRawSeqSet(i)
-                result_list.append(wgsRawSeqSet_result)
+        loader = WgsRawSeqSet.load_wgsRawSeqSet
 
-        return result_list
+        return WgsRawSeqSet._iter_search("wgs_raw_seq_set", query, loader)
 
     @staticmethod
     def load_wgsRawSeqSet(seq_set_data):
@@ -720,9 +720,9 @@ class WgsRawSeqSet(Base):
         if self._id is None:
             self.logger.info("About to insert a new %s OSDF node.", __name__)
 
-            # Get the JSON form of the data and load it
-            self.logger.debug("Converting %s to parsed JSON form.", __name__)
-            data = json.loads(self.to_json())
+            # Get the raw document form of the data
+            self.logger.debug("Getting the raw document for %s.", __name__)
+            data = self._get_raw_doc()
 
             try:
                 self.logger.info("Attempting to save a new node.")
@@ -749,8 +749,7 @@ class WgsRawSeqSet(Base):
                 osdf.edit_node(seq_set_data)
                 self.logger.info("Update for %s %s successful.", __name__, seq_set_id)
 
-                seq_set_data = osdf.get_node(seq_set_id)
-                latest_version = seq_set_data['ver']
+                latest_version = self._get_updated_version()
 
                 self.logger.debug("The version of this %s is now %s", __name__, str(latest_version))
                 self._version = latest_version
@@ -771,20 +770,7 @@ class WgsRawSeqSet(Base):
         """
         self.logger.debug("In viral_seq_sets().")
 
-        linkage_query = '"{}"[linkage.computed_from]'.format(self.id)
-
-        query = iHMPSession.get_session().get_osdf().oql_query
-
         from cutlass.ViralSeqSet import ViralSeqSet
 
-        for page_no in count(1):
-            res = query(WgsRawSeqSet.namespace, linkage_query, page=page_no)
-            res_count = res['result_count']
-
-            for doc in res['results']:
-                yield ViralSeqSet.load_viral_seq_set(doc)
-
-            res_count -= len(res['results'])
-
-            if res_count < 1:
-                break
+        for doc in self._linked_docs("computed_from", ["viral_seq_set"]):
+            yield ViralSeqSet.load_viral_seq_set(doc)
@@ -1,4 +1,7 @@
 from .iHMPSession import iHMPSession
+from .AsyncIHMPSession import AsyncIHMPSession
+from .RetryPolicy import RetryPolicy, CircuitBreaker, CircuitOpenError
+from .RetryPolicy import ServerStatusError
 from .AbundanceMatrix import AbundanceMatrix
 from .Annotation import Annotation
 from .ClusteredSeqSet import ClusteredSeqSet
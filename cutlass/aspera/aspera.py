@@ -6,6 +6,7 @@ import os
 import re
 import subprocess
 import logging
+import time
 
 # download example command(s):
 #
@@ -27,6 +28,24 @@ logger.addHandler(logging.NullHandler())
 ASCP_COMMAND = "ascp"
 ASCP_MIN_VERSION = '3.5'
 
+# Callables notified of the duration and outcome of every ascp transfer
+TRANSFER_LISTENERS = []
+
+def add_transfer_listener(listener):
+    """
+    Registers a callable to be called, after every transfer, with the number
+    of seconds the transfer took and whether it succeeded.
+    """
+    if listener not in TRANSFER_LISTENERS:
+        TRANSFER_LISTENERS.append(listener)
+
+def remove_transfer_listener(listener):
+    """
+    Unregisters a callable registered with add_transfer_listener().
+    """
+    if listener in TRANSFER_LISTENERS:
+        TRANSFER_LISTENERS.remove(listener)
+
 # compare version numbers
 def version_cmp(v1, v2):
     """
@@ -107,6 +126,9 @@ def run_ascp(ascp_cmd, password, keyfile=None):
                 "Can't use private key. No such file or directory: " + keyfile)
         ascp_cmd = [ascp_cmd[0], "-i", keyfile] + ascp_cmd[1:]
 
+    success = False
+    started = time.time()
+
     try:
         logger.debug("Command: %s", " ".join(ascp_cmd))
         process = subprocess.Popen(
@@ -123,8 +145,6 @@ def run_ascp(ascp_cmd, password, keyfile=None):
         rc = process.returncode
         logger.info("Invocation of ascp complete. Return code: %s.", str(rc))
 
-        success = False
-
         if rc == 0:
             logger.info("Aspera ascp utility returned successful exit value.")
             success = True
@@ -138,6 +158,11 @@ def run_ascp(ascp_cmd, password, keyfile=None):
                     logger.error("Unexpected STDOUT from ascp: %s", s_out)
     except subprocess.CalledProcessError as cpe:
         logger.error("Encountered an error when running ascp: %s", cpe)
+    finally:
+        elapsed = time.time() - started
+
+        for listener in TRANSFER_LISTENERS:
+            listener(elapsed, success)
 
     return success
 
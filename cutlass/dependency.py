@@ -3,6 +3,9 @@ Utility module for retrieving a node's children.
 """
 
 import inspect
+import Queue
+from collections import deque
+from multiprocessing.pool import ThreadPool
 
 # pylint: disable=C0302, W0703, C1801
 
@@ -11,7 +14,7 @@ from .Project import Project
 from .Study import Study
 from .Subject import Subject
 from .Visit import Visit
-from .Sample import Sample
+from .Sample import PREP_TYPES, Sample
 from .WgsAssembledSeqSet import WgsAssembledSeqSet
 from .WgsDnaPrep import WgsDnaPrep
 from .WgsRawSeqSet import WgsRawSeqSet
@@ -24,10 +27,60 @@ from .HostSeqPrep import HostSeqPrep
 from .MicrobTranscriptomicsRawSeqSet import MicrobTranscriptomicsRawSeqSet
 from .HostTranscriptomicsRawSeqSet import HostTranscriptomicsRawSeqSet
 from .ViralSeqSet import ViralSeqSet
+from .Base import Base
+from .Paginator import Paginator
+from .Util import edges_query, run_concurrently
+from .iHMPSession import iHMPSession
 
-# currently used in Base.children()
-# __name__ attribute used to ensure that if the class or method name
-# changes, the maintainer is forced to update it here, too.
+# The linkages through which the children of each node type are found, as
+# used by every traversal: Base.children(), in all its modes, snapshots,
+# exports and recursive deletions. Each entry lists the name of a linkage
+# pointing from the children to the parent and the node types of those
+# children. Every node type other than project must be listed as the child
+# of some node type, or the traversals would leave it behind.
+child_edges = {
+    "project"                            : [("part_of", ["study"])],
+    "study"                              : [("participates_in", ["subject"])],
+    "subject"                            : [("by", ["visit"]),
+                                            ("associated_with", ["subject_attr"])],
+    "visit"                              : [("collected_during", ["sample"]),
+                                            ("associated_with", ["visit_attr"])],
+    "sample"                             : [("prepared_from", PREP_TYPES),
+                                            ("associated_with", ["sample_attr"])],
+    "16s_dna_prep"                       : [("sequenced_from", ["16s_raw_seq_set"])],
+    "16s_raw_seq_set"                    : [("computed_from", ["16s_trimmed_seq_set"])],
+    "16s_trimmed_seq_set"                : [("computed_from", ["abundance_matrix"])],
+    "wgs_dna_prep"                       : [("sequenced_from",
+                                             ["wgs_raw_seq_set", "viral_seq_set",
+                                              "microb_transcriptomics_raw_seq_set"]),
+                                            ("computed_from", ["wgs_assembled_seq_set"])],
+    "wgs_raw_seq_set"                    : [("computed_from",
+                                             ["viral_seq_set", "wgs_assembled_seq_set"])],
+    "wgs_assembled_seq_set"              : [("computed_from",
+                                             ["annotation", "abundance_matrix"])],
+    "viral_seq_set"                      : [("computed_from",
+                                             ["abundance_matrix", "annotation"])],
+    "annotation"                         : [("computed_from", ["clustered_seq_set"])],
+    "host_seq_prep"                      : [("sequenced_from",
+                                             ["host_transcriptomics_raw_seq_set",
+                                              "host_wgs_raw_seq_set",
+                                              "host_epigenetics_raw_seq_set"])],
+    "host_assay_prep"                    : [("derived_from",
+                                             ["lipidome", "metabolome", "cytokine",
+                                              "proteome", "proteome_nonpride",
+                                              "serology"])],
+    "microb_assay_prep"                  : [("derived_from",
+                                             ["cytokine", "lipidome", "metabolome",
+                                              "proteome", "proteome_nonpride"])],
+    "microb_transcriptomics_raw_seq_set" : [("computed_from", ["abundance_matrix"])],
+    "host_transcriptomics_raw_seq_set"   : [("computed_from", ["abundance_matrix"])],
+    "host_wgs_raw_seq_set"               : [("computed_from", ["host_variant_call"])]
+}
+child_edges["microbiome_assay_prep"] = child_edges["microb_assay_prep"]
+
+# The accessor method listing the children of each class, which
+# Base.children() called before child_edges replaced it. Kept for code that
+# looks accessors up here; the traversals no longer use it.
 # pylint: disable=C0330
 dependency_methods = {
                            Project.__name__ : Project.studies.__name__,
@@ -59,3 +112,227 @@ def generator_flatten(gen):
                 yield value
         else:
             yield item
+
+def types_leading_to(node_types, exclude_types=None):
+    """
+    Returns the node types from which a node of one of the given types can
+    be reached by following child_edges, including the given types
+    themselves, without passing through any of the excluded types.
+    """
+    excluded = set(exclude_types or [])
+    leading = set(node_types) - excluded
+    changed = True
+
+    while changed:
+        changed = False
+
+        for (node_type, edges) in child_edges.items():
+            if node_type in leading or node_type in excluded:
+                continue
+
+            for (_edge, child_types) in edges:
+                if leading.intersection(child_types):
+                    leading.add(node_type)
+                    changed = True
+                    break
+
+    return leading
+
+def retrieve_children(parents, types=None, exclude_types=None, chunk_size=50,
+                      concurrency=8):
+    """
+    Retrieves the direct children of many nodes, found through the linkages
+    listed for their node types in child_edges. Parents following the same
+    linkages are split into chunks, and each chunk is covered by a single
+    OQL query over all of those linkages, with the chunks queried
+    concurrently. Snapshots, exports and recursive deletions expand each
+    level of a tree with it, and dependencies() a single node.
+
+    Args:
+        parents (list): (OSDF ID, node type) tuples for the parent nodes.
+        types (list): The node types of the children to retrieve. Defaults
+                      to all node types.
+        exclude_types (list): Node types of children to leave out.
+        chunk_size (int): The maximum number of parents per query.
+        concurrency (int): The maximum number of simultaneous queries.
+
+    Returns:
+        A dict mapping the OSDF ID of each parent to the list of its
+        children, in the order of the linkages in child_edges.
+    """
+    session = iHMPSession.get_session()
+    excluded = set(exclude_types or [])
+    children = {}
+    groups = {}
+
+    for (node_id, node_type) in parents:
+        if node_id in children:
+            continue
+
+        children[node_id] = []
+        edges = []
+
+        for (edge, child_types) in child_edges.get(node_type, []):
+            child_types = tuple(child_type for child_type in child_types
+                                if child_type not in excluded and
+                                (types is None or child_type in types))
+
+            if child_types:
+                edges.append((edge, child_types))
+
+        if edges:
+            edges = tuple(edges)
+            groups.setdefault(edges, []).append(node_id)
+
+    batches = [(edges, parent_ids[start:start + chunk_size])
+               for (edges, parent_ids) in sorted(groups.items())
+               for start in range(0, len(parent_ids), chunk_size)]
+
+    def query(batch):
+        (edges, chunk) = batch
+        oql = edges_query(chunk, [(edge, list(child_types))
+                                  for (edge, child_types) in edges])
+
+        return list(Paginator(Base.namespace, oql))
+
+    outcomes = run_concurrently(query, batches, concurrency)
+
+    for ((edges, chunk), (docs, exception)) in zip(batches, outcomes):
+        if exception is not None:
+            raise exception
+
+        parent_ids = set(chunk)
+        found = {}
+
+        for doc in docs:
+            child = session.load_document(doc)
+
+            # Dispatch the child to the parents and linkages it matches
+            for (edge, child_types) in edges:
+                if doc['node_type'] not in child_types:
+                    continue
+
+                for parent_id in doc['linkage'].get(edge, []):
+                    if parent_id in parent_ids:
+                        found.setdefault((parent_id, edge), []).append(child)
+
+        for parent_id in chunk:
+            for (edge, _child_types) in edges:
+                children[parent_id].extend(found.get((parent_id, edge), []))
+
+    return children
+
+def dependencies(node):
+    """
+    Returns the list of the direct children of a node, found through the
+    linkages listed for its node type in child_edges with a single query.
+    """
+    node_type = node._get_raw_doc()['node_type']
+
+    return retrieve_children([(node.id, node_type)])[node.id]
+
+def parallel_walk(root, workers, ordered=False, max_depth=None, expand=None):
+    """
+    Iterates over the nodes beneath root, expanding up to workers nodes at
+    once on a pool of threads. No more than twice that many expansions are
+    in flight at a time, and no new ones are started while the consumer is
+    not asking for nodes.
+
+    Args:
+        root (Base): The node to start from.
+        workers (int): The number of threads.
+        ordered (bool): Whether to yield the nodes depth first, in the same
+                        order as Base.children() does, rather than as they
+                        arrive.
+        max_depth (int): How many levels beneath root to descend.
+        expand (function): Returns the list of the children of a node.
+                           Defaults to dependencies(), which follows
+                           child_edges like Base.snapshot() does.
+
+    Returns:
+        A generator of nodes.
+    """
+    expand = expand or dependencies
+    pool = ThreadPool(workers)
+
+    try:
+        if ordered:
+            walk = _ordered_walk(root, pool, workers * 2, max_depth, expand)
+        else:
+            walk = _unordered_walk(root, pool, workers * 2, max_depth, expand)
+
+        for node in walk:
+            yield node
+    finally:
+        pool.terminate()
+
+def _unordered_walk(root, pool, window, max_depth, expand):
+    arrived = Queue.Queue()
+    backlog = deque([(root, 0)])
+    in_flight = [0]
+
+    def expand_node(node, depth):
+        try:
+            arrived.put((depth, expand(node), None))
+        except Exception as expand_exception:
+            arrived.put((depth, None, expand_exception))
+
+    def top_up():
+        while backlog and in_flight[0] < window:
+            (node, depth) = backlog.popleft()
+            in_flight[0] += 1
+            pool.apply_async(expand_node, (node, depth))
+
+    top_up()
+
+    while in_flight[0]:
+        (depth, children, error) = arrived.get()
+        in_flight[0] -= 1
+
+        if error is not None:
+            raise error
+
+        if max_depth is None or depth + 1 < max_depth:
+            backlog.extend([(child, depth + 1) for child in children])
+
+        top_up()
+
+        for child in children:
+            yield child
+
+def _ordered_walk(root, pool, window, max_depth, expand):
+    pending = {}
+    expanded = set()
+    backlog = deque()
+
+    def wanted(depth):
+        return max_depth is None or depth < max_depth
+
+    def top_up():
+        while backlog and len(pending) < window:
+            (node, depth) = backlog.popleft()
+
+            if wanted(depth) and id(node) not in pending and \
+               id(node) not in expanded:
+                pending[id(node)] = pool.apply_async(expand, (node,))
+
+    def walk(node, depth):
+        if id(node) in pending:
+            children = pending.pop(id(node)).get()
+        else:
+            children = expand(node)
+
+        expanded.add(id(node))
+
+        # The first child is the next one needed
+        backlog.extendleft([(child, depth + 1) for child in reversed(children)])
+        top_up()
+
+        for child in children:
+            yield child
+
+            if wanted(depth + 1):
+                for descendant in walk(child, depth + 1):
+                    yield descendant
+
+    return walk(root, 0)
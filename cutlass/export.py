@@ -0,0 +1,95 @@
+"""
+The export module writes a node and the nodes beneath it as newline
+delimited JSON (NDJSON), one OSDF document per line. The tree is streamed
+out as it is retrieved, a batch of nodes at a time, so that exporting a
+whole study does not require holding it in memory.
+"""
+
+import json
+import logging
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+def node_document(node):
+    """
+    Returns the OSDF document of a node, including its ID and version.
+
+    Args:
+        node (Base): The node.
+
+    Returns:
+        The document, as a dictionary.
+    """
+    doc = node._get_raw_doc()
+    doc['id'] = node.id
+
+    if node.version is not None:
+        doc['ver'] = node.version
+
+    return doc
+
+def export_tree(root, stream, max_depth=None, exclude_types=None,
+                chunk_size=50, concurrency=8):
+    """
+    Writes a node and its descendants to a stream, one JSON document per
+    line, with the keys of each document sorted so that exports can be
+    compared line by line. Nodes are written depth first, in batches of up
+    to chunk_size siblings whose children are retrieved together. Only the
+    IDs and node types of the nodes waiting for their children to be
+    retrieved are held in memory, along with the IDs of the nodes already
+    written, so nodes reachable along several paths are written once.
+
+    Args:
+        root (Base): The node to start from. It must have been saved.
+        stream (file): The stream to write to.
+        max_depth (int): How many levels beneath the root to export.
+                         Defaults to all of them.
+        exclude_types (list): Node types to leave out, along with the nodes
+                              beneath them.
+        chunk_size (int): The maximum number of parents per query.
+        concurrency (int): The maximum number of simultaneous queries.
+
+    Returns:
+        The number of nodes written.
+    """
+    # Local import to avoid cyclic imports
+    from cutlass.dependency import retrieve_children
+
+    if root.id is None:
+        raise Exception("Node does not have an ID.")
+
+    def write(node):
+        doc = node_document(node)
+        stream.write(json.dumps(doc, sort_keys=True) + "\n")
+
+        return (node.id, doc['node_type'])
+
+    seen = set([root.id])
+    pending = [(1, [write(root)])]
+
+    while pending:
+        (depth, batch) = pending.pop()
+
+        if max_depth is not None and depth > max_depth:
+            continue
+
+        found = retrieve_children(batch, exclude_types=exclude_types,
+                                  chunk_size=chunk_size, concurrency=concurrency)
+        written = []
+
+        for (node_id, _node_type) in batch:
+            for child in sorted(found[node_id], key=lambda node: node.id):
+                if child.id not in seen:
+                    seen.add(child.id)
+                    written.append(write(child))
+
+        # Continue with the first batch of children
+        for start in reversed(range(0, len(written), chunk_size)):
+            pending.append((depth + 1, written[start:start + chunk_size]))
+
+    module_logger.info("Exported %s nodes beneath %s.", len(seen), root)
+
+    return len(seen)
@@ -4,9 +4,16 @@ to an Open Science Data Framwork (OSDF) instance operated for the
 Integrative Human Microbiome Project (iHMP).
 """
 
-import importlib
 import logging
-from osdf import OSDF
+from contextlib import contextmanager
+from cutlass.aspera import aspera
+from cutlass.NodeCache import NodeCache
+from cutlass.OfflineOSDF import OfflineOSDF
+from cutlass.OSDFPool import MeteredOSDF, OSDFPool
+from cutlass.OSDFProxy import OSDFProxy
+from cutlass.registry import NODE_TYPES, node_class, load_document
+from cutlass.SchemaValidator import SchemaValidator, DEFAULT_CACHE_DIR
+from cutlass.SessionStats import SessionStats
 from cutlass.Util import *
 
 class iHMPSession(object):
@@ -14,7 +21,8 @@ class iHMPSession(object):
     The iHMP Session class. This class allows you to connect with an OSDF
     instance and begin analysis of iHMP data. It produces skeletons of all
     objects in the iHMP OSDF database. Each object contains its own save, load,
-    delete feature.
+    delete feature. Sessions created with a pool_size hold several keep-alive
+    OSDF connections and may be shared by multiple threads.
 
     Attributes:
         _single (iHMPSession): The iHMP Session that is currently live. None
@@ -26,7 +34,9 @@ class iHMPSession(object):
     _single = None
 
     def __init__(self, username, password, server="osdf.ihmpdcc.org", port=8123,
-                 ssl=True):
+                 ssl=True, pool_size=None, cache_size=None, cache_ttl=None,
+                 local_validation=False, schema_cache_dir=DEFAULT_CACHE_DIR,
+                 retry_policy=None, circuit_breaker=None, mirror=None):
         """
         The initialization of the iHMPSession for the user.
 
@@ -38,18 +48,105 @@ class iHMPSession(object):
             port (int): The port allowing access to the OSDF instance.
             ssl (bool): Whether the OSDF server is behind SSL/TLS or not.
                         Defaults to true.
+            pool_size (int): If provided, the session holds a pool of this
+                             many keep-alive OSDF connections and may be
+                             shared by multiple threads. Defaults to a single
+                             OSDF client.
+            cache_size (int): If provided, nodes and query results fetched
+                              from OSDF are kept in a least-recently-used
+                              cache holding up to this many nodes, so that
+                              repeated loads and traversals do not return
+                              to the server. Defaults to no caching.
+            cache_ttl (float): The number of seconds cached entries remain
+                               valid. Defaults to no expiry.
+            local_validation (bool): Whether to validate documents on the
+                                     client, against schemas fetched once
+                                     from OSDF, rather than sending each one
+                                     to the server. Requires the jsonschema
+                                     package. Defaults to false.
+            schema_cache_dir (str): The directory in which fetched schemas
+                                    are cached between sessions, or None to
+                                    keep them in memory only. Defaults to
+                                    ~/.cutlass/schemas.
+            retry_policy (RetryPolicy): If provided, OSDF calls failing with
+                                        transient errors, such as network
+                                        errors or an unavailable server, are
+                                        retried with exponential backoff
+                                        according to this policy. Defaults to
+                                        no retries. With a retry policy or a
+                                        circuit breaker, responses showing
+                                        the server is unavailable raise a
+                                        ServerStatusError.
+            circuit_breaker (CircuitBreaker): If provided, OSDF calls fail
+                                              immediately, without contacting
+                                              the server, for a while after
+                                              repeated transient failures.
+            mirror (Mirror): If provided, the session is offline and
+                             read-only: loads, searches and traversals are
+                             answered from this local mirror, or the mirror
+                             database at this path, and the server is never
+                             contacted. Saving or deleting nodes raises an
+                             exception, and the retry policy and circuit
+                             breaker are not used. Defaults to an online
+                             session.
         """
         self._username = username
         self._password = password
         self._server = server
         self._port = port
         self._ssl = ssl
-        self._osdf = OSDF(self._server, self._username, self._password,
-                          port=self._port, ssl=self._ssl)
+        self._pool_size = pool_size
+        self._verify_versions = False
+        self._read_ahead = 1
+        self._stats = SessionStats()
+
+        # Unavailable servers are only reported with a ServerStatusError,
+        # rather than as the OSDF client reports other failures, when
+        # something is there to act on it.
+        status_errors = retry_policy is not None or circuit_breaker is not None
+
+        if mirror is not None:
+            self._pool_size = None
+            self._osdf = OfflineOSDF(mirror, self._server, self._username,
+                                     self._password, self._port, self._ssl)
+        elif pool_size is None:
+            self._osdf = MeteredOSDF(self._server, self._username,
+                                     self._password, port=self._port,
+                                     ssl=self._ssl,
+                                     byte_counter=self._stats.record_bytes,
+                                     status_errors=status_errors)
+        else:
+            self._osdf = OSDFPool(self._server, self._username, self._password,
+                                  port=self._port, ssl=self._ssl,
+                                  size=pool_size,
+                                  byte_counter=self._stats.record_bytes,
+                                  status_errors=status_errors)
+
+        self._cache = None
+
+        if cache_size is not None:
+            self._cache = NodeCache(cache_size, cache_ttl)
 
         self.logger = logging.getLogger(self.__module__ + '.' + \
                                         self.__class__.__name__)
 
+        validator = None
+
+        if mirror is not None:
+            # Nothing offline fails in a way worth retrying
+            retry_policy = None
+            circuit_breaker = None
+
+        if local_validation and mirror is None:
+            if SchemaValidator.available():
+                validator = SchemaValidator(self._osdf, cache_dir=schema_cache_dir)
+            else:
+                self.logger.warn("The jsonschema package is not installed. " + \
+                                 "Documents will be validated by the server.")
+
+        self._proxy = OSDFProxy(self._osdf, self._cache, validator,
+                                retry_policy, circuit_breaker, self._stats)
+
         if iHMPSession._single is None:
             iHMPSession._single = self
 
@@ -58,63 +155,495 @@ class iHMPSession(object):
     def _get_cutlass_instance(self, name):
         self.logger.debug("In _get_cutlass_instance.")
 
-        classes = {
-            "16s_dna_prep"                       : "SixteenSDnaPrep",
-            "16s_raw_seq_set"                    : "SixteenSRawSeqSet",
-            "16s_trimmed_seq_set"                : "SixteenSTrimmedSeqSet",
-            "abundance_matrix"                   : "AbundanceMatrix",
-            "annotation"                         : "Annotation",
-            "clustered_seq_set"                  : "ClusteredSeqSet",
-            "cytokine"                           : "Cytokine",
-            "host_assay_prep"                    : "HostAssayPrep",
-            "host_epigenetics_raw_seq_set"       : "HostEpigeneticsRawSeqSet",
-            "host_seq_prep"                      : "HostSeqPrep",
-            "host_transcriptomics_raw_seq_set"   : "HostTranscriptomicsRawSeqSet",
-            "host_variant_call"                  : "HostVariantCall",
-            "host_wgs_raw_seq_set"               : "HostWgsRawSeqSet",
-            "lipidome"                           : "Lipidome",
-            "metabolome"                         : "Metabolome",
-            "microbiome_assay_prep"              : "MicrobiomeAssayPrep",
-            "microb_transcriptomics_raw_seq_set" : "MicrobTranscriptomicsRawSeqSet",
-            "project"                            : "Project",
-            "proteome"                           : "Proteome",
-            "proteome_nonpride"                  : "ProteomeNonPride",
-            "sample"                             : "Sample",
-            "sample_attr"                        : "SampleAttribute",
-            "serology"                           : "Serology",
-            "study"                              : "Study",
-            "subject"                            : "Subject",
-            "subject_attr"                       : "SubjectAttribute",
-            "viral_seq_set"                      : "ViralSeqSet",
-            "visit"                              : "Visit",
-            "visit_attr"                         : "VisitAttribute",
-            "wgs_assembled_seq_set"              : "WgsAssembledSeqSet",
-            "wgs_raw_seq_set"                    : "WgsRawSeqSet",
-            "wgs_dna_prep"                       : "WgsDnaPrep"
-        }
-
-        class_name = None
-        valid = False
-
-        if name in classes:
-            valid = True
-            class_name = classes[name]
+        if name not in NODE_TYPES:
+            raise TypeError("%s not defined in %s" % (name, self.__class__))
 
-        instance = None
+        return node_class(name)()
 
-        if valid:
-            module = importlib.import_module("cutlass", package="cutlass")
+    def load_document(self, document):
+        """
+        Converts an OSDF document of any supported node type into an instance
+        of the cutlass class for that node type.
 
-            class_var = getattr(module, class_name)
-            instance = class_var()
-        else:
-            raise TypeError("%s not defined in %s" % (name, self.__class__))
+        Args:
+            document (dict): The parsed OSDF document.
 
-        return instance
+        Returns:
+            An object of the class matching the document's node_type.
+
+        Exceptions:
+            ValueError: If the document's node_type is not supported.
+        """
+        return load_document(document)
+
+    def iter_search_any(self, query):
+        """
+        Iterates over the nodes matching an OQL query, whatever their node
+        types, such as all the nodes linked to a sample. Each result is
+        converted into an object of the class for its node type as it is
+        reached, so a single query can replace one query per node type.
+
+        Args:
+            query (str): The OQL query.
+
+        Returns:
+            A Paginator yielding objects of the appropriate classes, whose
+            result_count attribute holds the total number of results.
+        """
+        self.logger.debug("In iter_search_any.")
+
+        from cutlass.Base import Base
+        from cutlass.Paginator import Paginator
+
+        return Paginator(Base.namespace, query, self.load_document)
+
+    def search_any(self, query):
+        """
+        Retrieves all the nodes matching an OQL query, whatever their node
+        types. See iter_search_any().
+
+        Args:
+            query (str): The OQL query.
+
+        Returns:
+            A list of objects of the appropriate classes.
+        """
+        self.logger.debug("In search_any.")
+
+        return list(self.iter_search_any(query))
+
+    def load_many(self, node_ids, concurrency=8):
+        """
+        Loads many nodes, of any mix of node types, concurrently. Each node
+        is returned as an instance of the class for its node type.
+
+        Args:
+            node_ids (list): The OSDF IDs of the documents to load.
+            concurrency (int): The maximum number of simultaneous requests
+                               to OSDF. Defaults to 8.
+
+        Returns:
+            A tuple with the list of loaded objects, in the same order as
+            node_ids, and a dict mapping the IDs that could not be loaded to
+            the exception explaining why. The entries for those IDs in the
+            list are None.
+        """
+        self.logger.debug("In load_many. Loading %s nodes.", len(node_ids))
+
+        osdf = self.get_osdf()
+
+        def load(node_id):
+            return self.load_document(osdf.get_node(node_id))
+
+        return collect_outcomes(node_ids,
+                                run_concurrently(load, node_ids, concurrency))
+
+    def children_of(self, nodes, edge, types=None, chunk_size=50, concurrency=8):
+        """
+        Retrieves the nodes linked through an edge to each of many parent
+        nodes. Rather than one query per parent, the parents are split into
+        chunks and each chunk is covered by a single OQL query, with the
+        chunks queried concurrently. The results are grouped by parent.
+
+        Args:
+            nodes (list): The parent nodes, or their OSDF IDs.
+            edge (str): The name of the linkage from the children to the
+                        parents, such as "collected_during".
+            types (list): The node types of the children to retrieve.
+                          Defaults to all node types.
+            chunk_size (int): The maximum number of parents per query.
+                              Defaults to 50.
+            concurrency (int): The maximum number of simultaneous queries.
+                               Defaults to 8.
+
+        Returns:
+            A dict mapping the OSDF ID of each parent to the list of its
+            children, as objects of the appropriate classes.
+
+        Exceptions:
+            ValueError: If a parent node does not have an ID.
+        """
+        self.logger.debug("In children_of. Edge: %s", edge)
+
+        from cutlass.Base import Base
+        from cutlass.Paginator import Paginator
+
+        node_ids = []
+        seen = set()
+
+        for node in nodes:
+            node_id = node if isinstance(node, basestring) else node.id
+
+            if node_id is None:
+                raise ValueError("%s does not have an ID." % node)
+
+            if node_id not in seen:
+                seen.add(node_id)
+                node_ids.append(node_id)
+
+        chunks = [node_ids[start:start + chunk_size]
+                  for start in range(0, len(node_ids), chunk_size)]
+
+        self.logger.info("Retrieving the children of %s nodes with %s queries.",
+                         len(node_ids), len(chunks))
+
+        def query(chunk):
+            return list(Paginator(Base.namespace, linkage_query(chunk, edge, types)))
+
+        outcomes = run_concurrently(query, chunks, concurrency)
+
+        children = dict((node_id, []) for node_id in node_ids)
+
+        for (chunk, (docs, exception)) in zip(chunks, outcomes):
+            if exception is not None:
+                raise exception
+
+            parents = set(chunk)
+
+            for doc in docs:
+                child = self.load_document(doc)
+
+                # A child may be linked to several parents in the chunk
+                for parent_id in doc['linkage'].get(edge, []):
+                    if parent_id in parents:
+                        children[parent_id].append(child)
+
+        return children
+
+    def _find_nodes(self, node_ids, chunk_size=50, concurrency=8):
+        """
+        Retrieves many nodes by OSDF ID, taking those the session's cache
+        holds from it and the others with OQL queries covering up to
+        chunk_size IDs each, run concurrently. Returns a dict mapping the
+        IDs that were found to objects of the appropriate classes.
+        """
+        from cutlass.Base import Base
+        from cutlass.Paginator import Paginator
+
+        found = {}
+        missing = []
+
+        for node_id in node_ids:
+            doc = None
+
+            if self._cache is not None:
+                doc = self._cache.get_node(node_id)
+
+            if doc is None:
+                missing.append(node_id)
+            else:
+                found[node_id] = self.load_document(doc)
+
+        chunks = [missing[start:start + chunk_size]
+                  for start in range(0, len(missing), chunk_size)]
+
+        def query(chunk):
+            return list(Paginator(Base.namespace, id_query(chunk)))
+
+        for (docs, exception) in run_concurrently(query, chunks, concurrency):
+            if exception is not None:
+                raise exception
+
+            for doc in docs:
+                if self._cache is not None:
+                    self._cache.put_node(doc)
+
+                found[doc['id']] = self.load_document(doc)
+
+        return found
+
+    def ancestors_of(self, nodes, until=None, max_depth=None, chunk_size=50,
+                     concurrency=8):
+        """
+        Retrieves the nodes that each of many nodes links to, directly or
+        indirectly, such as the prep, sample, visit and subject above a
+        sequence set. The links are followed one level at a time for all the
+        nodes at once, so a parent shared by many nodes is only retrieved
+        once. The nodes of each level are taken from the session's cache
+        when it holds them, and otherwise retrieved with OQL queries for up
+        to chunk_size IDs each, run concurrently, rather than a request per
+        node.
+
+        Args:
+            nodes (list): The nodes to start from.
+            until (str): A node type, or list of node types, above which not
+                         to go, such as "subject". Defaults to following the
+                         links all the way up.
+            max_depth (int): The maximum number of links to follow from each
+                             node. Defaults to no limit.
+            chunk_size (int): The maximum number of nodes per query.
+                              Defaults to 50.
+            concurrency (int): The maximum number of simultaneous queries.
+                               Defaults to 8.
+
+        Returns:
+            A dict mapping the OSDF ID of each node to the list of its
+            ancestors, nearest first.
+
+        Exceptions:
+            ValueError: If a node does not have an ID.
+        """
+        self.logger.debug("In ancestors_of.")
+
+        if isinstance(until, basestring):
+            until = [until]
+
+        stop_types = set(until or [])
+
+        nodes = list(nodes)
+
+        for node in nodes:
+            if node.id is None:
+                raise ValueError("%s does not have an ID." % node)
+
+        start_ids = set(node.id for node in nodes)
+        resolved = {}
+        parent_ids = {}
+        frontier = nodes
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            wanted = []
+            wanted_ids = set()
+
+            for node in frontier:
+                if node.id in parent_ids:
+                    continue
+
+                if node.id not in start_ids and stop_types and \
+                   node._get_raw_doc()['node_type'] in stop_types:
+                    parent_ids[node.id] = []
+                    continue
+
+                parent_ids[node.id] = []
+
+                for linkage in sorted(node.links):
+                    for target in node.links[linkage]:
+                        target_id = target if isinstance(target, basestring) \
+                                    else target.id
+
+                        if target_id is not None and \
+                           target_id not in parent_ids[node.id]:
+                            parent_ids[node.id].append(target_id)
+
+                            if target_id not in resolved and \
+                               target_id not in wanted_ids:
+                                wanted.append(target_id)
+                                wanted_ids.add(target_id)
+
+            self.logger.info("Retrieving %s ancestors at level %s.", len(wanted), depth)
+
+            found = self._find_nodes(wanted, chunk_size, concurrency)
+
+            for node_id in wanted:
+                if node_id not in found:
+                    raise Exception("Unable to retrieve node document. " + \
+                                    "Reason: %s was not found." % node_id)
+
+            loaded = [found[node_id] for node_id in wanted]
+
+            resolved.update(zip(wanted, loaded))
+            frontier = loaded
+
+        ancestors = {}
+
+        for node in nodes:
+            found = []
+            seen = set([node.id])
+            queue = [node.id]
+
+            while queue:
+                for ancestor_id in parent_ids.get(queue.pop(0), []):
+                    if ancestor_id not in seen and ancestor_id in resolved:
+                        seen.add(ancestor_id)
+                        queue.append(ancestor_id)
+                        found.append(resolved[ancestor_id])
+
+            ancestors[node.id] = found
+
+        return ancestors
+
+    @staticmethod
+    def _link_levels(nodes):
+        """
+        Groups nodes by the links between them. Each node comes after every
+        node in the list that it links to, whether by object or by OSDF ID,
+        and the nodes of a level do not link to one another.
+        """
+        positions = dict((id(node), index) for (index, node) in enumerate(nodes))
+        id_positions = dict((node.id, index) for (index, node) in enumerate(nodes)
+                            if node.id is not None)
+        depends_on = []
+
+        for node in nodes:
+            parents = set()
+
+            for targets in node.links.values():
+                for target in targets:
+                    if isinstance(target, basestring):
+                        if target in id_positions:
+                            parents.add(id_positions[target])
+                    elif id(target) in positions:
+                        parents.add(positions[id(target)])
+                    elif target.id is None:
+                        raise ValueError("%s links to %s, which is neither " \
+                                         "saved nor being saved." % (node, target))
+
+            parents.discard(positions[id(node)])
+            depends_on.append(parents)
+
+        levels = []
+        placed = set()
+
+        while len(placed) < len(nodes):
+            level = [index for index in range(len(nodes))
+                     if index not in placed and depends_on[index] <= placed]
+
+            if not level:
+                raise ValueError("The links between the nodes form a cycle.")
+
+            levels.append(level)
+            placed.update(level)
+
+        return (levels, depends_on)
+
+    def save_all(self, nodes, concurrency=8):
+        """
+        Saves many nodes, of any mix of node types, in an order that respects
+        the links between them. A node's links may refer to other unsaved
+        node objects instead of OSDF IDs. Nodes are saved level by level,
+        with the nodes of a level saved concurrently, and once a node has
+        been saved, its new ID replaces the object in the links of the nodes
+        that depend on it.
+
+        Args:
+            nodes (list): The node objects to save.
+            concurrency (int): The maximum number of simultaneous saves.
+                               Defaults to 8.
+
+        Returns:
+            A tuple with the list of nodes that were saved and a list of
+            (node, reason) tuples for those that were not. Nodes linking to a
+            node that could not be saved are not attempted.
+
+        Exceptions:
+            ValueError: If the links between the nodes form a cycle, or a
+            node links to an unsaved node that is not among those provided.
+        """
+        self.logger.debug("In save_all. Saving %s nodes.", len(nodes))
+
+        nodes = list(nodes)
+        (levels, depends_on) = self._link_levels(nodes)
+
+        saved = []
+        failed = []
+        failed_indexes = set()
+
+        def save(node):
+            node.links = dict(
+                (linkage, [target if isinstance(target, basestring) else target.id
+                           for target in targets])
+                for (linkage, targets) in node.links.items()
+            )
+
+            if not node.save():
+                raise Exception("Unable to save %s." % node)
+
+        for (level_no, level) in enumerate(levels, 1):
+            ready = []
+
+            for index in level:
+                if depends_on[index] & failed_indexes:
+                    failed_indexes.add(index)
+                    failed.append((nodes[index],
+                                   Exception("A linked node could not be saved.")))
+                else:
+                    ready.append(index)
+
+            self.logger.info("Saving %s nodes at level %s.", len(ready), level_no)
+
+            outcomes = run_concurrently(save, [nodes[index] for index in ready],
+                                        concurrency)
+
+            for (index, (_result, exception)) in zip(ready, outcomes):
+                if exception is None:
+                    saved.append(nodes[index])
+                else:
+                    failed_indexes.add(index)
+                    failed.append((nodes[index], exception))
+
+        return (saved, failed)
+
+    def delete_all(self, nodes, concurrency=8):
+        """
+        Deletes many nodes, of any mix of node types, in an order that
+        respects the links between them: a node is only deleted once every
+        node among those provided that links to it has been deleted. Nodes
+        that can be deleted at the same time are deleted concurrently.
+
+        Args:
+            nodes (list): The node objects to delete.
+            concurrency (int): The maximum number of simultaneous deletions.
+                               Defaults to 8.
+
+        Returns:
+            A tuple with the list of nodes that were deleted and a list of
+            (node, reason) tuples for those that were not. Nodes that are
+            linked to by a node that could not be deleted are not attempted.
+
+        Exceptions:
+            ValueError: If the links between the nodes form a cycle.
+        """
+        self.logger.debug("In delete_all. Deleting %s nodes.", len(nodes))
+
+        nodes = list(nodes)
+        (levels, depends_on) = self._link_levels(nodes)
+
+        dependents = [set() for _node in nodes]
+
+        for (index, parents) in enumerate(depends_on):
+            for parent in parents:
+                dependents[parent].add(index)
+
+        deleted = []
+        failed = []
+        failed_indexes = set()
+
+        def delete(node):
+            if not node.delete():
+                raise Exception("Unable to delete %s." % node)
+
+        for level in reversed(levels):
+            ready = []
+
+            for index in level:
+                if dependents[index] & failed_indexes:
+                    failed_indexes.add(index)
+                    failed.append((nodes[index],
+                                   Exception("A linked node could not be deleted.")))
+                else:
+                    ready.append(index)
+
+            self.logger.info("Deleting %s nodes.", len(ready))
+
+            outcomes = run_concurrently(delete, [nodes[index] for index in ready],
+                                        concurrency)
+
+            for (index, (_result, exception)) in zip(ready, outcomes):
+                if exception is None:
+                    deleted.append(nodes[index])
+                else:
+                    failed_indexes.add(index)
+                    failed.append((nodes[index], exception))
+
+        return (deleted, failed)
 
     def __getattr__(self, name):
-        if name.startswith("create_"):
-            class_lower = name[7:]
+        if not name.startswith("create_"):
+            raise AttributeError("%s not defined in %s" % (name, self.__class__))
+
+        class_lower = name[7:]
 
         try:
             instance = self._get_cutlass_instance(class_lower)
@@ -150,7 +679,80 @@ class iHMPSession(object):
             An OSDF object.
         """
         self.logger.debug("In get_osdf.")
-        return self._osdf
+        return self._proxy
+
+    @contextmanager
+    def connection(self):
+        """
+        A context manager providing an OSDF client for exclusive use within a
+        with block. For pooled sessions the client is borrowed from the pool
+        and returned at the end of the block, otherwise the session's single
+        OSDF client is provided. Calls made directly on the client bypass the
+        session's node cache.
+        """
+        self.logger.debug("In connection.")
+
+        if self._pool_size is None:
+            yield self._osdf
+        else:
+            with self._osdf.connection() as client:
+                yield client
+
+    @property
+    def cache(self):
+        """
+        NodeCache: The session's cache of nodes and query results, or None
+                   if the session was created without one.
+        """
+        self.logger.debug("In 'cache' getter.")
+        return self._cache
+
+    @property
+    def offline(self):
+        """
+        bool: Whether the session reads from a local mirror rather than
+              from OSDF.
+        """
+        self.logger.debug("In 'offline' getter.")
+        return isinstance(self._osdf, OfflineOSDF)
+
+    @property
+    def mirror(self):
+        """
+        Mirror: The local mirror answering an offline session, or None for
+                sessions connected to OSDF.
+        """
+        self.logger.debug("In 'mirror' getter.")
+
+        if self.offline:
+            return self._osdf.mirror
+
+        return None
+
+    def stats(self):
+        """
+        Retrieves the session's statistics: the number, timing and outcome
+        of each kind of OSDF operation, the bytes exchanged with OSDF and
+        the duration of Aspera file transfers. Call to_dict() or to_json()
+        on the result for a snapshot, or reset() to start counting anew.
+
+        Args:
+            None
+
+        Returns:
+            The SessionStats for the session.
+        """
+        self.logger.debug("In stats.")
+        return self._stats
+
+    @property
+    def pool_size(self):
+        """
+        int: The number of pooled OSDF connections held by the session, or
+             None if the session uses a single OSDF client.
+        """
+        self.logger.debug("In 'pool_size' getter.")
+        return self._pool_size
 
     def create_object(self, node_type):
         """
@@ -282,6 +884,62 @@ class iHMPSession(object):
         self.logger.debug("Setting the SSL flag in the OSDF client.")
         self._osdf.ssl = ssl
 
+    @property
+    def verify_versions(self):
+        """
+        bool: Whether a node's new version is retrieved from OSDF after each
+              update. By default the version is derived locally, saving a
+              request per update.
+        """
+        self.logger.debug("In 'verify_versions' getter.")
+        return self._verify_versions
+
+    @verify_versions.setter
+    @enforce_bool
+    def verify_versions(self, verify_versions):
+        """
+        The verify_versions setter.
+
+        Args:
+            verify_versions (bool): Whether to confirm node versions with
+                                    OSDF after updates.
+
+        Returns:
+            None
+        """
+        self.logger.debug("In 'verify_versions' setter.")
+        self._verify_versions = verify_versions
+
+    @property
+    def read_ahead(self):
+        """
+        int: The number of pages of query results retrieved in the background,
+             ahead of the page being processed, when iterating over linked
+             nodes or search results. Zero retrieves each page only once the
+             previous one has been consumed. Defaults to 1.
+        """
+        self.logger.debug("In 'read_ahead' getter.")
+        return self._read_ahead
+
+    @read_ahead.setter
+    @enforce_int
+    def read_ahead(self, read_ahead):
+        """
+        The read_ahead setter.
+
+        Args:
+            read_ahead (int): The number of pages to prefetch.
+
+        Returns:
+            None
+        """
+        self.logger.debug("In 'read_ahead' setter.")
+
+        if read_ahead < 0:
+            raise ValueError("Invalid read ahead. Must be zero or more pages.")
+
+        self._read_ahead = read_ahead
+
     @property
     def username(self):
         """
@@ -308,3 +966,15 @@ class iHMPSession(object):
         # Ensure the OSDF object gets the new connection parameter
         self.logger.debug("Setting the username in the OSDF client.")
         self._osdf.username = username
+
+def _record_transfer(seconds, success):
+    """
+    Records an Aspera file transfer in the statistics of the current
+    session, on whose behalf file transfers are made.
+    """
+    session = iHMPSession._single
+
+    if session is not None:
+        session._stats.record_transfer(seconds, success)
+
+aspera.add_transfer_listener(_record_transfer)
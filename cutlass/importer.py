@@ -0,0 +1,244 @@
+"""
+The importer module loads newline delimited JSON (NDJSON) node documents,
+such as those written by cutlass-export, into OSDF as new nodes. Nodes
+are inserted parents first, the links between them are rewritten to the
+new IDs, and each insertion is recorded in an append-only journal so that
+an interrupted import can be resumed without inserting duplicates.
+"""
+
+import json
+import logging
+import os
+import threading
+from cutlass.iHMPSession import iHMPSession
+from cutlass.Util import run_concurrently
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+class Journal(object):
+    """
+    An append-only record of the nodes already imported, mapping the ID
+    each node had in the import file to the ID OSDF gave it. Every entry is
+    written, flushed and synced to disk as soon as its node is inserted.
+
+    Attributes:
+        path (str): The path of the journal file.
+        ids (dict): The new OSDF ID of each imported node, by its old ID.
+    """
+    def __init__(self, path):
+        """
+        Constructor for the Journal class. The entries of an existing
+        journal are read back, ignoring a last line left incomplete by an
+        interruption.
+
+        Args:
+            path (str): The path of the journal file. Created if missing.
+        """
+        self.path = path
+        self.ids = {}
+
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path) as journal_fh:
+                for line in journal_fh:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        module_logger.warn("Ignoring incomplete journal entry.")
+                        continue
+
+                    self.ids[str(entry['old'])] = str(entry['new'])
+
+            module_logger.info("Journal %s lists %s imported nodes.", path,
+                               len(self.ids))
+
+        self._fh = open(path, "a+")
+
+        # Start on a fresh line if an interruption left a partial one
+        self._fh.seek(0, os.SEEK_END)
+
+        if self._fh.tell() > 0:
+            self._fh.seek(-1, os.SEEK_END)
+
+            if self._fh.read(1) != "\n":
+                self._fh.seek(0, os.SEEK_END)
+                self._fh.write("\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the journal file.
+        """
+        with self._lock:
+            self._fh.close()
+
+    def record(self, old_id, new_id):
+        """
+        Records that the node with the given old ID was imported as new_id.
+        """
+        with self._lock:
+            self._fh.write(json.dumps({'old': old_id, 'new': new_id}) + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+            self.ids[old_id] = new_id
+
+def _scan(path):
+    """
+    Reads through an NDJSON file, returning the offset of each document by
+    its ID, and the IDs of the documents each one links to.
+    """
+    offsets = {}
+    links = {}
+
+    with open(path) as ndjson_fh:
+        while True:
+            offset = ndjson_fh.tell()
+            line = ndjson_fh.readline()
+
+            if not line:
+                break
+
+            if not line.strip():
+                continue
+
+            doc = json.loads(line)
+            node_id = str(doc['id'])
+
+            if node_id in offsets:
+                raise ValueError("Node %s appears more than once." % node_id)
+
+            offsets[node_id] = offset
+            links[node_id] = set(str(target_id)
+                                 for target_ids in doc.get('linkage', {}).values()
+                                 for target_id in target_ids)
+
+    return (offsets, links)
+
+def _levels(links, done):
+    """
+    Splits the documents into levels, where each document only links to
+    documents of earlier levels, to documents already imported, or to nodes
+    outside the file, which are assumed to exist in OSDF already.
+    """
+    levels = []
+    placed = set(done)
+    remaining = set(links) - placed
+
+    while remaining:
+        level = sorted(node_id for node_id in remaining
+                       if all(target_id in placed or target_id not in links
+                              for target_id in links[node_id]))
+
+        if not level:
+            raise ValueError("The links between the documents form a cycle.")
+
+        levels.append(level)
+        placed.update(level)
+        remaining.difference_update(level)
+
+    return levels
+
+def import_file(path, journal_path, concurrency=8):
+    """
+    Inserts the node documents of an NDJSON file into OSDF as new nodes,
+    using the current session. Nodes are inserted level by level, linked
+    nodes first, with the nodes of a level inserted concurrently. The links
+    of each document are rewritten to the new IDs of the nodes it links to;
+    links to nodes that are not in the file are kept as they are. The 'id'
+    and 'ver' of each document are dropped, and OSDF assigns new ones.
+
+    Progress is recorded in the journal. Running the import again with the
+    same journal skips the nodes already inserted, so an interrupted import
+    resumes where it stopped. A node inserted just as the import is
+    interrupted, before its journal entry is written, may be inserted again.
+
+    Only the byte offset and links of each document are held in memory,
+    and documents are read back from the file as they are inserted.
+
+    Args:
+        path (str): The path of the NDJSON file.
+        journal_path (str): The path of the journal file.
+        concurrency (int): The maximum number of simultaneous insertions.
+
+    Returns:
+        A dictionary with the number of nodes 'imported' and 'skipped' as
+        already imported, the 'failed' nodes, mapping each old ID to the
+        reason, and the 'blocked' nodes, which were not attempted because
+        they link to a node that failed.
+
+    Exceptions:
+        ValueError: If a document appears twice or the links between the
+                    documents form a cycle.
+    """
+    (offsets, links) = _scan(path)
+
+    module_logger.info("Found %s documents in %s.", len(offsets), path)
+
+    osdf = iHMPSession.get_session().get_osdf()
+    report = {'imported': 0, 'skipped': 0, 'failed': {}, 'blocked': []}
+
+    with Journal(journal_path) as journal, open(path) as ndjson_fh:
+        file_lock = threading.Lock()
+
+        def read(node_id):
+            with file_lock:
+                ndjson_fh.seek(offsets[node_id])
+                return json.loads(ndjson_fh.readline())
+
+        def insert(node_id):
+            doc = read(node_id)
+
+            doc.pop('id', None)
+            doc.pop('ver', None)
+
+            doc['linkage'] = dict(
+                (edge, [journal.ids.get(str(target_id), target_id)
+                        for target_id in target_ids])
+                for (edge, target_ids) in doc.get('linkage', {}).items()
+            )
+
+            new_id = osdf.insert_node(doc)
+            journal.record(node_id, new_id)
+
+            return new_id
+
+        done = set(node_id for node_id in offsets if node_id in journal.ids)
+        report['skipped'] = len(done)
+
+        unusable = set()
+
+        for (level_no, level) in enumerate(_levels(links, done), 1):
+            ready = []
+
+            for node_id in level:
+                if links[node_id] & unusable:
+                    unusable.add(node_id)
+                    report['blocked'].append(node_id)
+                else:
+                    ready.append(node_id)
+
+            module_logger.info("Inserting %s nodes at level %s.", len(ready),
+                               level_no)
+
+            outcomes = run_concurrently(insert, ready, concurrency)
+
+            for (node_id, (_result, exception)) in zip(ready, outcomes):
+                if exception is None:
+                    report['imported'] += 1
+                else:
+                    module_logger.error("Unable to import %s: %s", node_id,
+                                        exception)
+                    unusable.add(node_id)
+                    report['failed'][node_id] = exception
+
+    return report
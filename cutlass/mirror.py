@@ -0,0 +1,552 @@
+"""
+The mirror module keeps a local copy of the documents of an OSDF namespace
+in an SQLite database, indexed by node ID, node type, tag and linkage, so
+that the metadata graph can be queried over and over without going back to
+the server. The copy is brought up to date with sync(), which only rewrites
+the nodes whose version has changed since the previous run.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS nodes (
+           id TEXT PRIMARY KEY,
+           ver INTEGER,
+           node_type TEXT NOT NULL,
+           doc TEXT NOT NULL
+       )""",
+    """CREATE TABLE IF NOT EXISTS tags (
+           node_id TEXT NOT NULL,
+           tag TEXT NOT NULL
+       )""",
+    """CREATE TABLE IF NOT EXISTS links (
+           node_id TEXT NOT NULL,
+           edge TEXT NOT NULL,
+           target_id TEXT NOT NULL
+       )""",
+    """CREATE TABLE IF NOT EXISTS state (
+           key TEXT PRIMARY KEY,
+           value TEXT
+       )""",
+    "CREATE INDEX IF NOT EXISTS nodes_by_type ON nodes (node_type)",
+    "CREATE INDEX IF NOT EXISTS tags_by_tag ON tags (tag)",
+    "CREATE INDEX IF NOT EXISTS tags_by_node ON tags (node_id)",
+    "CREATE INDEX IF NOT EXISTS links_by_target ON links (edge, target_id)",
+    "CREATE INDEX IF NOT EXISTS links_by_node ON links (node_id)"
+]
+
+# The largest number of values bound to one statement
+MAX_PARAMS = 500
+
+def _byteify(value):
+    # Documents are handed out with str rather than unicode strings, as they
+    # are by the OSDF client.
+    if isinstance(value, dict):
+        return dict((_byteify(key), _byteify(item))
+                    for (key, item) in value.iteritems())
+    elif isinstance(value, list):
+        return [_byteify(item) for item in value]
+    elif isinstance(value, unicode):
+        return value.encode('utf-8')
+
+    return value
+
+def _decode(doc):
+    return _byteify(json.loads(doc))
+
+class Mirror(object):
+    """
+    A local copy of the nodes of an OSDF namespace. Documents are stored as
+    retrieved from OSDF, and can be looked up by ID, by node type, by tag,
+    or by the nodes they are linked to. A mirror may be shared by several
+    threads.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+        namespace (str): The OSDF namespace being mirrored.
+    """
+    def __init__(self, path, namespace=None):
+        """
+        Constructor for the Mirror class. The database is created if it does
+        not exist yet.
+
+        Args:
+            path (str): The path of the SQLite database file, or ":memory:"
+                        for a mirror that is not kept on disk.
+            namespace (str): The OSDF namespace to mirror. Defaults to the
+                             namespace of the cutlass node classes.
+        """
+        if namespace is None:
+            from cutlass.Base import Base
+            namespace = Base.namespace
+
+        self.path = path
+        self.namespace = namespace
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._conn:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+
+            stored = self._get_state('namespace')
+
+            if stored is None:
+                self._set_state('namespace', namespace)
+            elif stored != namespace:
+                raise ValueError("Mirror %s holds namespace %s, not %s." % \
+                                 (path, stored, namespace))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def _get_state(self, key):
+        row = self._conn.execute("SELECT value FROM state WHERE key = ?",
+                                 (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        return row[0]
+
+    def _set_state(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO state (key, value) " + \
+                           "VALUES (?, ?)", (key, value))
+
+    def _select(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @property
+    def last_sync(self):
+        """
+        float: The time, in seconds since the epoch, at which the last
+        successful sync() started, or None if the mirror was never synced.
+        """
+        with self._lock:
+            value = self._get_state('last_sync')
+
+        if value is None:
+            return None
+
+        return float(value)
+
+    def _delete(self, node_id):
+        self._conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+        self._conn.execute("DELETE FROM tags WHERE node_id = ?", (node_id,))
+        self._conn.execute("DELETE FROM links WHERE node_id = ?", (node_id,))
+
+    def _store(self, doc):
+        node_id = doc['id']
+
+        row = self._conn.execute("SELECT ver FROM nodes WHERE id = ?",
+                                 (node_id,)).fetchone()
+
+        if row is not None and row[0] == doc.get('ver'):
+            return 'unchanged'
+
+        self._delete(node_id)
+
+        self._conn.execute("INSERT INTO nodes (id, ver, node_type, doc) " + \
+                           "VALUES (?, ?, ?, ?)",
+                           (node_id, doc.get('ver'), doc['node_type'],
+                            json.dumps(doc, sort_keys=True)))
+
+        tags = doc.get('meta', {}).get('tags') or []
+
+        self._conn.executemany("INSERT INTO tags (node_id, tag) VALUES (?, ?)",
+                               [(node_id, tag) for tag in set(tags)])
+
+        links = []
+
+        for (edge, target_ids) in (doc.get('linkage') or {}).items():
+            for target_id in set(target_ids):
+                links.append((node_id, edge, target_id))
+
+        self._conn.executemany("INSERT INTO links (node_id, edge, target_id) " + \
+                               "VALUES (?, ?, ?)", links)
+
+        if row is None:
+            return 'added'
+
+        return 'updated'
+
+    def store(self, doc):
+        """
+        Stores an OSDF document in the mirror, replacing any previous
+        version of the node. Documents whose version is already stored are
+        left alone.
+
+        Args:
+            doc (dict): The OSDF document, with its 'id' and 'ver'.
+
+        Returns:
+            One of 'added', 'updated' or 'unchanged'.
+        """
+        with self._lock, self._conn:
+            return self._store(doc)
+
+    def remove(self, node_id):
+        """
+        Removes a node from the mirror.
+
+        Args:
+            node_id (str): The OSDF ID of the node.
+
+        Returns:
+            True if the node was in the mirror, False otherwise.
+        """
+        with self._lock, self._conn:
+            found = node_id in self
+            self._delete(node_id)
+
+        return found
+
+    def sync(self, node_types=None, prune=True):
+        """
+        Brings the mirror up to date with OSDF, using the current session.
+        The nodes of each node type are listed a page at a time, and only
+        the ones that are new, or whose version differs from the stored
+        copy, are written to the database. Pages are retrieved without
+        holding the mirror's lock, so other threads can read from the mirror
+        during a sync, and the changes of each page are committed together.
+        Stored nodes are only pruned once their node type has been listed in
+        full, so an interrupted sync leaves the mirror consistent and can
+        simply be run again.
+
+        Args:
+            node_types (list): The node types to sync. Defaults to all of
+                               them.
+            prune (bool): Whether to remove stored nodes of the synced types
+                          that are no longer in OSDF. Defaults to true.
+
+        Returns:
+            A dictionary with the number of nodes 'added', 'updated',
+            'unchanged' and 'removed'.
+        """
+        # Local imports to avoid cyclic imports
+        from cutlass.Paginator import Paginator
+        from cutlass.registry import NODE_TYPES
+
+        if node_types is None:
+            node_types = sorted(NODE_TYPES)
+
+        started = time.time()
+        report = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+
+        for node_type in node_types:
+            if node_type not in NODE_TYPES:
+                raise ValueError("Invalid node type specified: %s" % node_type)
+
+            module_logger.info("Syncing %s nodes.", node_type)
+
+            query = '"%s"[node_type]' % node_type
+            seen = set()
+
+            for page in Paginator(self.namespace, query).pages():
+                with self._lock, self._conn:
+                    for doc in page:
+                        # The node type match is a text search, so check it
+                        if doc.get('node_type') != node_type:
+                            continue
+
+                        seen.add(doc['id'])
+                        report[self._store(doc)] += 1
+
+            if prune:
+                with self._lock, self._conn:
+                    stored = self._conn.execute(
+                        "SELECT id FROM nodes WHERE node_type = ?",
+                        (node_type,)).fetchall()
+
+                    for (node_id,) in stored:
+                        if node_id not in seen:
+                            self._delete(node_id)
+                            report['removed'] += 1
+
+        if set(node_types) == set(NODE_TYPES):
+            with self._lock, self._conn:
+                self._set_state('last_sync', repr(started))
+
+        module_logger.info("Sync done. Added %(added)s, updated %(updated)s, " + \
+                           "removed %(removed)s and kept %(unchanged)s " + \
+                           "nodes.", report)
+
+        return report
+
+    def __len__(self):
+        return self._select("SELECT COUNT(*) FROM nodes")[0][0]
+
+    def __contains__(self, node_id):
+        return len(self._select("SELECT 1 FROM nodes WHERE id = ?",
+                                (node_id,))) > 0
+
+    def get(self, node_id):
+        """
+        Returns the stored OSDF document of a node.
+
+        Args:
+            node_id (str): The OSDF ID of the node.
+
+        Returns:
+            The document, as a dictionary, or None if the node is not in the
+            mirror.
+        """
+        rows = self._select("SELECT doc FROM nodes WHERE id = ?", (node_id,))
+
+        if not rows:
+            return None
+
+        return _decode(rows[0][0])
+
+    def version(self, node_id):
+        """
+        Returns the stored version of a node, or None if the node is not in
+        the mirror.
+        """
+        rows = self._select("SELECT ver FROM nodes WHERE id = ?", (node_id,))
+
+        if not rows:
+            return None
+
+        return rows[0][0]
+
+    def count(self, node_type=None):
+        """
+        Returns the number of nodes in the mirror, or of the nodes of the
+        given node type.
+        """
+        if node_type is None:
+            return len(self)
+
+        return self._select("SELECT COUNT(*) FROM nodes WHERE node_type = ?",
+                            (node_type,))[0][0]
+
+    def _docs(self, sql, params=()):
+        for (doc,) in self._select(sql, params):
+            yield _decode(doc)
+
+    def of_type(self, node_type):
+        """
+        Returns the documents of a node type, such as "visit", ordered by ID.
+
+        Args:
+            node_type (str): The node type.
+
+        Returns:
+            A generator of documents.
+        """
+        return self._docs("SELECT doc FROM nodes WHERE node_type = ? " + \
+                          "ORDER BY id", (node_type,))
+
+    def tagged(self, tag, node_type=None):
+        """
+        Returns the documents carrying a tag, ordered by ID.
+
+        Args:
+            tag (str): The tag.
+            node_type (str): If provided, only documents of this node type
+                             are returned.
+
+        Returns:
+            A generator of documents.
+        """
+        sql = "SELECT doc FROM nodes WHERE id IN " + \
+              "(SELECT node_id FROM tags WHERE tag = ?)"
+        params = [tag]
+
+        if node_type is not None:
+            sql += " AND node_type = ?"
+            params.append(node_type)
+
+        return self._docs(sql + " ORDER BY id", params)
+
+    def linked_to(self, node_ids, edge=None, types=None):
+        """
+        Returns the documents of the nodes linking to any of the given nodes,
+        such as the visits linking to a subject with the "by" edge, ordered
+        by ID.
+
+        Args:
+            node_ids (list): The OSDF IDs of the nodes linked to, or a single
+                             OSDF ID.
+            edge (str): If provided, only links with this name are followed.
+            types (list): If provided, only documents of these node types are
+                          returned.
+
+        Returns:
+            A generator of documents.
+        """
+        if isinstance(node_ids, basestring):
+            node_ids = [node_ids]
+
+        node_ids = list(node_ids)
+        linking = set()
+
+        # SQLite limits the number of parameters of a statement
+        for start in range(0, len(node_ids), MAX_PARAMS):
+            chunk = node_ids[start:start + MAX_PARAMS]
+
+            sql = "SELECT node_id FROM links WHERE target_id IN (%s)" % \
+                  ",".join("?" * len(chunk))
+            params = list(chunk)
+
+            if edge is not None:
+                sql += " AND edge = ?"
+                params.append(edge)
+
+            linking.update(row[0] for row in self._select(sql, params))
+
+        return self._docs_by_id(sorted(linking), types)
+
+    def _docs_by_id(self, node_ids, types=None):
+        for start in range(0, len(node_ids), MAX_PARAMS):
+            chunk = node_ids[start:start + MAX_PARAMS]
+
+            sql = "SELECT doc FROM nodes WHERE id IN (%s)" % \
+                  ",".join("?" * len(chunk))
+            params = list(chunk)
+
+            if types is not None:
+                sql += " AND node_type IN (%s)" % ",".join("?" * len(types))
+                params.extend(types)
+
+            for doc in self._docs(sql + " ORDER BY id", params):
+                yield doc
+
+    def _where(self, expr):
+        """
+        Converts a parsed OQL query into an SQL condition on the nodes
+        table answered from the indexes, or returns None if the indexes
+        cannot narrow the query down. The condition may select more nodes
+        than the query matches, never fewer.
+        """
+        from cutlass.oql import Match, Or
+
+        if isinstance(expr, Match):
+            return self._match_where(expr)
+
+        parts = [self._where(term) for term in expr.terms]
+
+        if isinstance(expr, Or):
+            if None in parts:
+                return None
+
+            joiner = " OR "
+        else:
+            # Terms without an index are checked once the documents are read
+            parts = [part for part in parts if part is not None]
+
+            if not parts:
+                return None
+
+            joiner = " AND "
+
+        sql = "(%s)" % joiner.join(part[0] for part in parts)
+        params = [param for part in parts for param in part[1]]
+
+        return (sql, params)
+
+    @staticmethod
+    def _match_where(match):
+        field = match.field
+
+        if field in ("node_type", "id"):
+            return ("%s = ?" % field, [match.value])
+
+        if field.startswith("linkage."):
+            return ("id IN (SELECT node_id FROM links WHERE edge = ? " + \
+                    "AND target_id = ?)", [field[len("linkage."):], match.value])
+
+        if field in ("tags", "meta.tags"):
+            return ("id IN (SELECT node_id FROM tags WHERE tag = ?)",
+                    [match.value])
+
+        return None
+
+    def query(self, query):
+        """
+        Answers an OQL query from the mirror, such as the ones cutlass sends
+        to OSDF. The terms on node_type, id, tags and linkage fields are
+        answered from the indexes, and the documents they select are then
+        checked against the whole query. Queries with no indexed terms
+        check every document.
+
+        Args:
+            query (str): The OQL query.
+
+        Returns:
+            A list of the matching documents, ordered by ID.
+
+        Exceptions:
+            ValueError: If the query is not valid.
+        """
+        from cutlass.oql import parse
+
+        expr = parse(query)
+        where = self._where(expr)
+
+        if where is None:
+            module_logger.debug("No index for %s. Checking every node.", query)
+            where = ("1", [])
+
+        docs = self._docs("SELECT doc FROM nodes WHERE %s ORDER BY id" % \
+                          where[0], where[1])
+
+        return [doc for doc in docs if expr.matches(doc)]
+
+    def links_from(self, node_id):
+        """
+        Returns the links of a node to other nodes.
+
+        Args:
+            node_id (str): The OSDF ID of the node.
+
+        Returns:
+            A list of (edge, target ID) tuples.
+        """
+        return [tuple(row) for row in
+                self._select("SELECT edge, target_id FROM links " + \
+                             "WHERE node_id = ? ORDER BY edge, target_id",
+                             (node_id,))]
+
+    def load(self, node_id):
+        """
+        Returns a node of the mirror as an object of the class for its node
+        type.
+
+        Args:
+            node_id (str): The OSDF ID of the node.
+
+        Returns:
+            An object such as a Sample, or None if the node is not in the
+            mirror.
+        """
+        from cutlass.registry import load_document
+
+        doc = self.get(node_id)
+
+        if doc is None:
+            return None
+
+        return load_document(doc)
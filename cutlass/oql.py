@@ -0,0 +1,400 @@
+"""
+The oql module parses and evaluates the subset of the OSDF Query Language
+(OQL) used by cutlass, so that the same query strings can be answered
+from local documents, such as a mirror or test fixtures, instead of OSDF.
+A query is made of field matches such as '"visit"[node_type]' or
+'"abc"[linkage.by]', combined with '&&' and '||', or the words 'and' and
+'or', and grouped with parentheses. As in OSDF, '&&' binds more tightly than '||'.
+
+Fields are dotted paths into the document. The top level fields, such as
+node_type, id and ver, and the linkage and meta sections are addressed by
+name, while any other field is looked up in the meta section, so that
+"tags" and "meta.tags" are the same field. A match succeeds when the field,
+or any element of it if it is a list, equals the value.
+"""
+
+import logging
+import re
+
+# Create a module logger named after the module
+module_logger = logging.getLogger(__name__)
+# Add a NullHandler for the case if no logging is configured by the application
+module_logger.addHandler(logging.NullHandler())
+
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<value>"(?:[^"\\]|\\.)*")\s*\[\s*(?P<field>[^\]\s]+)\s*\] |
+        (?P<op>&&|\|\||\b(?:and|or)\b) |
+        (?P<paren>[()])
+    )''', re.VERBOSE | re.IGNORECASE)
+
+# The words accepted in place of the operators, as some queries use them
+_OPERATOR_WORDS = {"and": "&&", "or": "||"}
+
+_ESCAPE = re.compile(r'\\(.)')
+
+# The fields found at the top level of an OSDF document
+TOP_LEVEL_FIELDS = ("id", "ver", "node_type", "ns", "acl", "linkage", "meta")
+
+def _walk(value, path):
+    if isinstance(value, list):
+        return [found for item in value for found in _walk(item, path)]
+
+    if not path:
+        return [value]
+
+    if not isinstance(value, dict) or path[0] not in value:
+        return []
+
+    return _walk(value[path[0]], path[1:])
+
+def field_values(doc, field):
+    """
+    Returns the values of a field of a document, such as "linkage.by" or
+    "meta.tags". Lists are flattened, so the values of a list field are its
+    elements.
+
+    Args:
+        doc (dict): The OSDF document.
+        field (str): The dotted path of the field.
+
+    Returns:
+        A list of values, empty if the document does not have the field.
+    """
+    path = field.split(".")
+
+    if path[0] in TOP_LEVEL_FIELDS:
+        return _walk(doc, path)
+
+    return _walk(doc.get('meta', {}), path)
+
+def _equals(found, value):
+    if isinstance(found, bool):
+        return str(found).lower() == value.lower()
+
+    if isinstance(found, basestring):
+        return found == value
+
+    return str(found) == value
+
+class Match(object):
+    """
+    A query term matching the nodes whose field holds a value.
+
+    Attributes:
+        field (str): The field, such as "node_type" or "linkage.by".
+        value (str): The value to match.
+    """
+    def __init__(self, field, value):
+        self.field = field
+        self.value = value
+
+    def matches(self, doc):
+        """
+        Returns whether a document matches the term.
+        """
+        return any(_equals(found, self.value)
+                   for found in field_values(doc, self.field))
+
+    def __eq__(self, other):
+        return isinstance(other, Match) and \
+               (self.field, self.value) == (other.field, other.value)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "Match(%r, %r)" % (self.field, self.value)
+
+class And(object):
+    """
+    A query matching the nodes matched by all of its terms.
+
+    Attributes:
+        terms (list): The sub-queries.
+    """
+    def __init__(self, terms):
+        self.terms = terms
+
+    def matches(self, doc):
+        """
+        Returns whether a document matches all the terms.
+        """
+        return all(term.matches(doc) for term in self.terms)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.terms == other.terms
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.terms)
+
+class Or(And):
+    """
+    A query matching the nodes matched by any of its terms.
+
+    Attributes:
+        terms (list): The sub-queries.
+    """
+    def matches(self, doc):
+        """
+        Returns whether a document matches any of the terms.
+        """
+        return any(term.matches(doc) for term in self.terms)
+
+def _tokenize(query):
+    tokens = []
+    position = 0
+    query = query.rstrip()
+
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+
+        if match is None:
+            raise ValueError("Invalid OQL query at position %s: %s" % \
+                             (position, query))
+
+        if match.group('value') is not None:
+            value = _ESCAPE.sub(r'\1', match.group('value')[1:-1])
+            tokens.append(('match', Match(match.group('field'), value)))
+        elif match.group('op') is not None:
+            operator = match.group('op')
+            tokens.append(('op', _OPERATOR_WORDS.get(operator.lower(), operator)))
+        else:
+            tokens.append(('paren', match.group('paren')))
+
+        position = match.end()
+
+    return tokens
+
+class _Parser(object):
+    def __init__(self, query):
+        self.query = query
+        self.tokens = _tokenize(query)
+        self.position = 0
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+
+        return (None, None)
+
+    def _error(self):
+        return ValueError("Invalid OQL query: %s" % self.query)
+
+    def parse(self):
+        expr = self._disjunction()
+
+        if self.position != len(self.tokens):
+            raise self._error()
+
+        return expr
+
+    def _combine(self, cls, operator, parse_term):
+        terms = [parse_term()]
+
+        while self._peek() == ('op', operator):
+            self.position += 1
+            terms.append(parse_term())
+
+        if len(terms) == 1:
+            return terms[0]
+
+        return cls(terms)
+
+    def _disjunction(self):
+        return self._combine(Or, "||", self._conjunction)
+
+    def _conjunction(self):
+        return self._combine(And, "&&", self._term)
+
+    def _term(self):
+        (kind, token) = self._peek()
+        self.position += 1
+
+        if kind == 'match':
+            return token
+
+        if (kind, token) == ('paren', "("):
+            expr = self._disjunction()
+
+            if self._peek() != ('paren', ")"):
+                raise self._error()
+
+            self.position += 1
+            return expr
+
+        raise self._error()
+
+def parse(query):
+    """
+    Parses an OQL query.
+
+    Args:
+        query (str): The OQL query, such as
+                     '("a"[linkage.by] || "b"[linkage.by]) && "visit"[node_type]'.
+
+    Returns:
+        The parsed query, made of Match, And and Or objects.
+
+    Exceptions:
+        ValueError: If the query is not valid, or uses parts of OQL that are
+                    not supported.
+    """
+    return _Parser(query).parse()
+
+def evaluate(query, docs):
+    """
+    Filters documents with an OQL query, checking each document in turn.
+    See Collection for repeated queries over the same documents.
+
+    Args:
+        query (str): The OQL query.
+        docs (iterable): The OSDF documents.
+
+    Returns:
+        A generator of the matching documents, in their original order.
+    """
+    expr = parse(query)
+
+    return (doc for doc in docs if expr.matches(doc))
+
+class Collection(object):
+    """
+    A set of OSDF documents that can be queried with OQL. Documents are
+    indexed by ID, node type, tag and linkage, and each query is planned
+    against those indexes: the candidates are narrowed down with the
+    indexed terms, and only the candidates are checked against the whole
+    query, rather than every document.
+    """
+    def __init__(self, docs=()):
+        """
+        Constructor for the Collection class.
+
+        Args:
+            docs (iterable): The documents to start with, each with an 'id'.
+        """
+        self._docs = {}
+        self._by_type = {}
+        self._by_tag = {}
+        self._by_link = {}
+
+        for doc in docs:
+            self.add(doc)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, node_id):
+        return node_id in self._docs
+
+    def __iter__(self):
+        return (self._docs[node_id] for node_id in sorted(self._docs))
+
+    def _keys(self, doc):
+        keys = [(self._by_type, doc.get('node_type'))]
+
+        for tag in set(field_values(doc, "tags")):
+            keys.append((self._by_tag, tag))
+
+        for (edge, target_ids) in (doc.get('linkage') or {}).items():
+            for target_id in set(target_ids):
+                keys.append((self._by_link, (edge, target_id)))
+
+        return keys
+
+    def add(self, doc):
+        """
+        Adds a document, replacing any document with the same ID.
+        """
+        self.remove(doc['id'])
+
+        self._docs[doc['id']] = doc
+
+        for (index, key) in self._keys(doc):
+            index.setdefault(key, set()).add(doc['id'])
+
+    def remove(self, node_id):
+        """
+        Removes the document with the given ID, if there is one.
+        """
+        doc = self._docs.pop(node_id, None)
+
+        if doc is None:
+            return
+
+        for (index, key) in self._keys(doc):
+            index[key].discard(node_id)
+
+            if not index[key]:
+                del index[key]
+
+    def get(self, node_id):
+        """
+        Returns the document with the given ID, or None.
+        """
+        return self._docs.get(node_id)
+
+    def _lookup(self, match):
+        field = match.field
+
+        if field == "id":
+            return set([match.value]) if match.value in self._docs else set()
+
+        if field == "node_type":
+            return self._by_type.get(match.value, set())
+
+        if field in ("tags", "meta.tags"):
+            return self._by_tag.get(match.value, set())
+
+        if field.startswith("linkage."):
+            return self._by_link.get((field[len("linkage."):], match.value),
+                                     set())
+
+        return None
+
+    def _candidates(self, expr):
+        """
+        Returns the IDs of the documents that may match a query, according
+        to the indexes, or None if the indexes do not narrow it down.
+        """
+        if isinstance(expr, Match):
+            return self._lookup(expr)
+
+        found = [self._candidates(term) for term in expr.terms]
+
+        if isinstance(expr, Or):
+            if None in found:
+                return None
+
+            return set().union(*found)
+
+        found = sorted([ids for ids in found if ids is not None], key=len)
+
+        if not found:
+            return None
+
+        return found[0].intersection(*found[1:])
+
+    def query(self, query):
+        """
+        Returns the documents matching an OQL query.
+
+        Args:
+            query (str): The OQL query.
+
+        Returns:
+            A list of the matching documents, ordered by ID.
+        """
+        expr = parse(query)
+        candidates = self._candidates(expr)
+
+        if candidates is None:
+            module_logger.debug("No index for %s. Checking all %s documents.",
+                                query, len(self._docs))
+            candidates = self._docs
+
+        return [self._docs[node_id] for node_id in sorted(candidates)
+                if expr.matches(self._docs[node_id])]
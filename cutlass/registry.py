@@ -0,0 +1,122 @@
+"""
+The registry module maps each OSDF node type to the cutlass class that
+models it, so that documents of any node type can be turned into objects
+of the right class without chains of node type comparisons.
+"""
+
+import importlib
+import threading
+
+# Maps each node type to the name of the cutlass class modeling it and the
+# name of that class's static method for converting an OSDF document into
+# an instance.
+NODE_TYPES = {
+    "16s_dna_prep"                       : ("SixteenSDnaPrep", "load_sixteenSDnaPrep"),
+    "16s_raw_seq_set"                    : ("SixteenSRawSeqSet", "load_16s_raw_seq_set"),
+    "16s_trimmed_seq_set"                : ("SixteenSTrimmedSeqSet", "load_sixteenSTrimmedSeqSet"),
+    "abundance_matrix"                   : ("AbundanceMatrix", "load_abundance_matrix"),
+    "annotation"                         : ("Annotation", "load_annotation"),
+    "clustered_seq_set"                  : ("ClusteredSeqSet", "load_clustered_seq_set"),
+    "cytokine"                           : ("Cytokine", "load_cytokine"),
+    "host_assay_prep"                    : ("HostAssayPrep", "load_host_assay_prep"),
+    "host_epigenetics_raw_seq_set"       : ("HostEpigeneticsRawSeqSet",
+                                            "load_host_epigenetics_raw_seq_set"),
+    "host_seq_prep"                      : ("HostSeqPrep", "load_host_seq_prep"),
+    "host_transcriptomics_raw_seq_set"   : ("HostTranscriptomicsRawSeqSet",
+                                            "load_host_transcriptomics_raw_seq_set"),
+    "host_variant_call"                  : ("HostVariantCall", "load_host_variant_call"),
+    "host_wgs_raw_seq_set"               : ("HostWgsRawSeqSet", "load_hostWgsRawSeqSet"),
+    "lipidome"                           : ("Lipidome", "load_lipidome"),
+    "metabolome"                         : ("Metabolome", "load_metabolome"),
+    "microb_assay_prep"                  : ("MicrobiomeAssayPrep", "load_microassayprep"),
+    "microbiome_assay_prep"              : ("MicrobiomeAssayPrep", "load_microassayprep"),
+    "microb_transcriptomics_raw_seq_set" : ("MicrobTranscriptomicsRawSeqSet",
+                                            "load_microb_transcriptomics_raw_seq_set"),
+    "project"                            : ("Project", "load_project"),
+    "proteome"                           : ("Proteome", "load_proteome"),
+    "proteome_nonpride"                  : ("ProteomeNonPride", "load_proteome_nonpride"),
+    "sample"                             : ("Sample", "load_sample"),
+    "sample_attr"                        : ("SampleAttribute", "load_sample_attr"),
+    "serology"                           : ("Serology", "load_serology"),
+    "study"                              : ("Study", "load_study"),
+    "subject"                            : ("Subject", "load_subject"),
+    "subject_attr"                       : ("SubjectAttribute", "load_subject_attr"),
+    "viral_seq_set"                      : ("ViralSeqSet", "load_viral_seq_set"),
+    "visit"                              : ("Visit", "load_visit"),
+    "visit_attr"                         : ("VisitAttribute", "load_visit_attr"),
+    "wgs_assembled_seq_set"              : ("WgsAssembledSeqSet", "load_wgsAssembledSeqSet"),
+    "wgs_raw_seq_set"                    : ("WgsRawSeqSet", "load_wgsRawSeqSet"),
+    "wgs_dna_prep"                       : ("WgsDnaPrep", "load_wgsDnaPrep")
+}
+
+_CLASSES = {}
+_LOADERS = {}
+_LOCK = threading.Lock()
+
+def _resolve(node_type):
+    # Imported on first use, as the node classes themselves import modules
+    # that depend on this one.
+    if node_type not in NODE_TYPES:
+        raise ValueError("Invalid node type specified: %s" % node_type)
+
+    module = importlib.import_module("cutlass")
+
+    (class_name, loader_name) = NODE_TYPES[node_type]
+    class_var = getattr(module, class_name)
+
+    with _LOCK:
+        _CLASSES[node_type] = class_var
+        _LOADERS[node_type] = getattr(class_var, loader_name)
+
+def node_class(node_type):
+    """
+    Returns the cutlass class for a node type.
+
+    Args:
+        node_type (str): The node type, such as "wgs_dna_prep".
+
+    Returns:
+        The class modeling nodes of that type.
+
+    Exceptions:
+        ValueError: If the node type is not supported.
+    """
+    if node_type not in _CLASSES:
+        _resolve(node_type)
+
+    return _CLASSES[node_type]
+
+def node_loader(node_type):
+    """
+    Returns the function converting an OSDF document of a node type into an
+    instance of its class, such as WgsDnaPrep.load_wgsDnaPrep.
+
+    Args:
+        node_type (str): The node type.
+
+    Returns:
+        The loader function.
+
+    Exceptions:
+        ValueError: If the node type is not supported.
+    """
+    if node_type not in _LOADERS:
+        _resolve(node_type)
+
+    return _LOADERS[node_type]
+
+def load_document(document):
+    """
+    Converts an OSDF document of any supported node type into an instance of
+    the class for its node type.
+
+    Args:
+        document (dict): The parsed OSDF document.
+
+    Returns:
+        An object of the class matching the document's node_type.
+
+    Exceptions:
+        ValueError: If the document's node_type is not supported.
+    """
+    return node_loader(document.get('node_type'))(document)
@@ -8,12 +8,6 @@ from cutlass import iHMPSession
 
 ## globals
 NAMESPACE = 'ihmp'
-NODE_TYPE_ORDER = [
-    'annotation', 'abundance_matrix',
-    'wgs_assembled_seq_set', '16s_trimmed_seq_set',
-    'wgs_raw_seq_set', '16s_raw_seq_set', 'wgs_dna_prep', '16s_dna_prep',
-    'sample', 'visit', 'subject', 'study', 'project'
-    ]
 
 # input
 parser = argparse.ArgumentParser()
@@ -21,6 +15,8 @@ parser.add_argument('--username', help='OSDF username')
 parser.add_argument('--password', help='OSDF password')
 parser.add_argument('--server', help='OSDF server address')
 parser.add_argument('--tag', help='Unique tag for uploaded test nodes.')
+parser.add_argument('--concurrency', type=int, default=8,
+                    help='Number of nodes to delete at once.')
 args = parser.parse_args()
 
 # main program
@@ -34,27 +30,19 @@ res = osdf.oql_query_all_pages(NAMESPACE, qstring)
 print("OQL query=" + qstring + " result_count=" + str(res['result_count']))
 results = res['results']
 
-# sort nodes to satisfy dependency order when deleting - delete will fail
+# double-check that args.tag is present - should be superfluous
+nodes = []
+for result in results:
+    print("id=" + result['id'] + " node type=" + result["node_type"])
+
+    if args.tag in result['meta']['tags']:
+        nodes.append(session.load_document(result))
+
+# delete_all() deletes nodes before the nodes they link to - delete will fail
 # otherwise
-node_type_order = {}
-nto = 1
-for nt in NODE_TYPE_ORDER:
-    node_type_order[nt] = nto
-    nto = nto + 1
-sorted_results = sorted(results, key=lambda k: node_type_order[k["node_type"]])
-
-
-n_deleted = 0
-for result in sorted_results:
-    result_id = result['id']
-    print("id=" + result_id + " node type=" + result["node_type"])
-    tags = result['meta']['tags']
-
-    for tag in tags:
-        # double-check that args.tag is present - should be superfluous
-        if (tag == args.tag):
-            print("deleting " + result_id)
-            osdf.delete_node(result_id)
-            n_deleted = n_deleted + 1
-
-print("Deleted count: " + str(n_deleted))
+(deleted, failed) = session.delete_all(nodes, concurrency=args.concurrency)
+
+for (node, reason) in failed:
+    print("failed to delete " + str(node) + ": " + str(reason))
+
+print("Deleted count: " + str(len(deleted)))
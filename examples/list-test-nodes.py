@@ -5,6 +5,7 @@
 import argparse
 import logging
 from cutlass import iHMPSession
+from cutlass.Paginator import Paginator
 
 # globals
 NAMESPACE = 'ihmp'
@@ -20,13 +21,11 @@ args = parser.parse_args()
 # main program
 logging.basicConfig(level=logging.INFO)
 s = iHMPSession(args.username, args.password, args.server)
-o = s.get_osdf()
 
-# query for all nodes with tag args.tag
+# query for all nodes with tag args.tag, one page at a time
 qstring = "\"" + args.tag + "\"[tags]"
-res = o.oql_query_all_pages(NAMESPACE, qstring)
-print("OQL query=" + qstring + " result_count=" + str(res['result_count']))
-results = res['results']
+results = Paginator(NAMESPACE, qstring)
+print("OQL query=" + qstring + " result_count=" + str(results.result_count))
 
 n_listed = 0
 for result in results:
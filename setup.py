@@ -24,6 +24,8 @@ setup(
     url='https://hmpdacc.org',
     license='MIT',
     packages=['cutlass', 'cutlass.aspera'],
+    scripts=['bin/cutlass-export', 'bin/cutlass-import',
+             'bin/cutlass-sync'],
     requires=['osdf'],
     classifiers=[
         "Development Status :: 5 - Production/Stable",
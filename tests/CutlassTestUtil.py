@@ -1,3 +1,82 @@
+from cutlass import iHMPSession
+from cutlass.oql import Collection
+
+class FakeNode(object):
+    """ A stand-in for a node loaded from OSDF, built from its document. """
+    def __init__(self, doc):
+        self.id = doc['id']
+        self.version = doc.get('ver', 1)
+        self.links = doc.get('linkage', {})
+        self.doc = doc
+
+    def _get_raw_doc(self):
+        return {'node_type': self.doc['node_type'],
+                'linkage': self.doc.get('linkage', {}),
+                'meta': self.doc.get('meta', {})}
+
+    def delete(self):
+        iHMPSession.get_session().get_osdf().delete_node(self.id)
+        return True
+
+class FakeSession(object):
+    """
+    An iHMPSession that never contacts OSDF, installed as the current
+    session. When docs or an oql_query function are given, OQL queries are
+    answered from them and recorded in the queries attribute. Use it in a
+    with statement, or call start() and stop() from setUp() and tearDown().
+    Other session classes, such as AsyncIHMPSession, can be given as
+    session_class.
+    """
+    def __init__(self, docs=None, oql_query=None, load_document=None,
+                 session_class=iHMPSession, **kwargs):
+        self.docs = docs
+        self.queries = []
+        self.session = session_class("test", "test", **kwargs)
+        self._previous = None
+
+        if oql_query is not None or docs is not None:
+            self.answer_with(oql_query or self._query_docs)
+
+        if load_document is not None:
+            self.session.load_document = load_document
+
+    def _query_docs(self, namespace, query, page=1):
+        results = Collection(self.docs).query(query)
+
+        return {'result_count': len(results), 'page': page, 'results': results}
+
+    def answer_with(self, oql_query):
+        """ Answers the session's OQL queries with the given function. """
+        def recorded_query(namespace, query, page=1):
+            self.queries.append(query)
+            return oql_query(namespace, query, page)
+
+        self.client().oql_query = recorded_query
+
+    def client(self):
+        """
+        Returns the session's OSDF client, or its pool of clients, to replace
+        more of its calls.
+        """
+        return self.session._osdf
+
+    def start(self):
+        """ Makes the session the current one, and returns it. """
+        self._previous = iHMPSession._single
+        iHMPSession._single = self.session
+
+        return self.session
+
+    def stop(self):
+        """ Restores the previously current session. """
+        iHMPSession._single = self._previous
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
 class CutlassTestUtil(object):
     def boolPropertyTest(self, test, obj, prop):
         value1 = True
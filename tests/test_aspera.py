@@ -86,5 +86,30 @@ class AsperaTest(unittest.TestCase):
         """
         self.assertRaises(Exception, aspera.check_ascp_version, "ls")
 
+    # ------------------------------------------------
+    # transfer listeners
+    # ------------------------------------------------
+
+    def test_transfer_listener(self):
+        """ Test that transfer listeners hear about every ascp run. """
+        from cutlass.aspera import aspera as ascp
+
+        transfers = []
+
+        def listener(seconds, success):
+            transfers.append((seconds, success))
+
+        ascp.add_transfer_listener(listener)
+
+        try:
+            self.assertRaises(OSError, ascp.run_ascp,
+                              ["not_the_ascp_command"], "password")
+        finally:
+            ascp.remove_transfer_listener(listener)
+
+        self.assertEqual(len(transfers), 1)
+        self.assertFalse(transfers[0][1])
+        self.assertFalse(listener in ascp.TRANSFER_LISTENERS)
+
 if __name__ == '__main__':
     unittest.main()
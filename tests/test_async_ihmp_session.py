@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+
+""" A unittest script for the AsyncIHMPSession module. """
+
+import threading
+import unittest
+from cutlass import AsyncIHMPSession, iHMPSession, Project
+
+from CutlassTestUtil import FakeSession
+
+# pylint: disable=W0703, C1801
+
+MIXS = {
+    "biome": "biome",
+    "body_product": "body_product",
+    "collection_date": "2000-01-01",
+    "env_package": "env_package",
+    "feature": "feature",
+    "geo_loc_name": "geo_loc_name",
+    "lat_lon": "lat_lon",
+    "material": "material",
+    "project_name": "project_name",
+    "rel_to_oxygen": "rel_to_oxygen",
+    "samp_collect_device": "samp_collect_device",
+    "samp_mat_process": "samp_mat_process",
+    "samp_size": "samp_size",
+    "source_mat_id": ["a", "b", "c"]
+}
+
+DOCS = [
+    {'id': "project1", 'ver': 1, 'node_type': "project", 'linkage': {},
+     'meta': {'name': "Project 1", 'description': "A project", 'tags': [],
+              'mixs': MIXS}},
+    {'id': "project2", 'ver': 1, 'node_type': "project", 'linkage': {},
+     'meta': {'name': "Project 2", 'description': "Another project",
+              'tags': ["second"], 'mixs': MIXS}},
+    {'id': "study1", 'ver': 1, 'node_type': "study",
+     'linkage': {'part_of': ["project1"]},
+     'meta': {'name': "Study 1", 'description': "A study",
+              'center': "Broad Institute", 'contact': "Someone", 'tags': [],
+              'subtype': "ibd"}}
+]
+
+class NotFound(Exception):
+    """ Raised by the fake OSDF client for unknown nodes. """
+    pass
+
+class AsyncIHMPSessionTest(unittest.TestCase):
+    """ A unit test class for the AsyncIHMPSession module. """
+
+    username = "test"
+    password = "test"
+
+    def testCreateSession(self):
+        """ Test the constructor for creating asynchronous sessions. """
+        session = AsyncIHMPSession(AsyncIHMPSessionTest.username,
+                                   AsyncIHMPSessionTest.password,
+                                   concurrency=3)
+
+        self.failUnless(isinstance(session, iHMPSession))
+        self.assertEqual(session.concurrency, 3)
+        self.assertEqual(session.pool_size, 3)
+
+        session.close()
+
+    def testSubmit(self):
+        """ Test that submitted work runs on the worker threads. """
+        session = AsyncIHMPSession(AsyncIHMPSessionTest.username,
+                                   AsyncIHMPSessionTest.password,
+                                   concurrency=2)
+
+        main_thread = threading.current_thread()
+
+        result = session.submit(threading.current_thread)
+
+        self.failIf(result.get(5) is main_thread)
+
+        result = session.submit(lambda x, y=0: x + y, 1, y=2)
+        self.assertEqual(result.get(5), 3)
+
+        session.close()
+
+    def testGather(self):
+        """ Test waiting on several results, preserving their order. """
+        session = AsyncIHMPSession(AsyncIHMPSessionTest.username,
+                                   AsyncIHMPSessionTest.password,
+                                   concurrency=4)
+
+        results = [session.submit(pow, n, 2) for n in range(10)]
+
+        self.assertEqual(AsyncIHMPSession.gather(results, 5),
+                         [n ** 2 for n in range(10)])
+
+        self.assertEqual(session.map(abs, [-1, -2, 3]).get(5), [1, 2, 3])
+
+        session.close()
+
+    def testExceptionPropagates(self):
+        """ Test that exceptions raised by submitted work are re-raised. """
+        session = AsyncIHMPSession(AsyncIHMPSessionTest.username,
+                                   AsyncIHMPSessionTest.password,
+                                   concurrency=1)
+
+        result = session.submit(int, "not a number")
+
+        with self.assertRaises(ValueError):
+            result.get(5)
+
+        session.close()
+
+class AsyncNodeOperationsTest(unittest.TestCase):
+    """
+    A unit test class for the asynchronous node operations, run against a
+    session that never contacts OSDF.
+    """
+
+    def setUp(self):
+        self.fake_session = FakeSession(DOCS, session_class=AsyncIHMPSession,
+                                        concurrency=2)
+        self.session = self.fake_session.start()
+
+        self.edited = []
+        self.deleted = []
+        by_id = dict((doc['id'], doc) for doc in DOCS)
+
+        def get_node(node_id):
+            if node_id not in by_id:
+                raise NotFound(node_id)
+
+            return by_id[node_id]
+
+        client = self.fake_session.client()
+        client.get_node = get_node
+        client.validate_node = lambda doc: (True, None)
+        client.edit_node = self.edited.append
+        client.delete_node = self.deleted.append
+
+    def tearDown(self):
+        self.fake_session.stop()
+        self.session.close()
+
+    def failing(self, *args, **kwargs):
+        """ Stands in for an OSDF call that fails. """
+        raise NotFound("Unable to reach OSDF.")
+
+    def testLoadAsync(self):
+        """ Test that load_async() resolves to what load() returns. """
+        loaded = Project.load("project1")
+        result = Project.load_async("project1")
+
+        self.assertEqual(result.get(5)._get_raw_doc(), loaded._get_raw_doc())
+
+        with self.assertRaises(NotFound):
+            Project.load("missing")
+
+        with self.assertRaises(NotFound):
+            Project.load_async("missing").get(5)
+
+    def testSearchAsync(self):
+        """ Test that search_async() resolves to what search() returns. """
+        for query in (None, '"second"[meta.tags]'):
+            args = () if query is None else (query,)
+
+            found = [node._get_raw_doc() for node in Project.search(*args)]
+            result = Project.search_async(*args)
+
+            self.assertEqual([node._get_raw_doc() for node in result.get(5)],
+                             found)
+
+        self.assertEqual(len(Project.search_async().get(5)), 2)
+
+        self.fake_session.answer_with(self.failing)
+
+        with self.assertRaises(NotFound):
+            Project.search()
+
+        with self.assertRaises(NotFound):
+            Project.search_async().get(5)
+
+    def testSaveAsync(self):
+        """ Test that save_async() resolves to what save() returns. """
+        project = Project.load("project1")
+
+        self.assertTrue(project.save() is True)
+        self.assertEqual(project.version, 2)
+
+        self.assertTrue(project.save_async().get(5) is True)
+        self.assertEqual(project.version, 3)
+        self.assertEqual(len(self.edited), 2)
+
+        self.fake_session.client().validate_node = self.failing
+
+        with self.assertRaises(NotFound):
+            project.save()
+
+        with self.assertRaises(NotFound):
+            project.save_async().get(5)
+
+    def testDeleteAsync(self):
+        """ Test that delete_async() resolves to what delete() returns. """
+        project = Project.load("project1")
+
+        self.assertTrue(project.delete() is True)
+        self.assertTrue(project.delete_async().get(5) is True)
+        self.assertEqual(self.deleted, ["project1", "project1"])
+
+        # Deleting a node that was never saved raises
+        with self.assertRaises(Exception):
+            Project().delete()
+
+        with self.assertRaises(Exception):
+            Project().delete_async().get(5)
+
+    def testCollectAsync(self):
+        """ Test that collect_async() resolves to what the iterator yields. """
+        project = Project.load("project1")
+
+        studies = [study._get_raw_doc() for study in project.studies()]
+        result = project.collect_async("studies")
+
+        self.assertEqual([study._get_raw_doc() for study in result.get(5)],
+                         studies)
+        self.assertEqual(len(studies), 1)
+
+        self.fake_session.answer_with(self.failing)
+
+        with self.assertRaises(NotFound):
+            list(project.studies())
+
+        with self.assertRaises(NotFound):
+            project.collect_async("studies").get(5)
+
+    def testRequiresAsyncSession(self):
+        """ Test that the asynchronous operations need an AsyncIHMPSession. """
+        with FakeSession(DOCS):
+            with self.assertRaises(Exception):
+                Project.load_async("project1")
+
+if __name__ == '__main__':
+    unittest.main()
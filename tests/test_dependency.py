@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+""" A unittest script for the dependency module. """
+
+import threading
+import time
+import unittest
+from cutlass import Sample
+from cutlass.dependency import child_edges, dependency_methods, parallel_walk, \
+    types_leading_to
+from cutlass.registry import NODE_TYPES
+
+from CutlassTestUtil import FakeNode, FakeSession
+
+# pylint: disable=W0703, C1801
+
+class TreeNode(object):
+    """ A node whose children are slow to retrieve. """
+    lock = threading.Lock()
+    active = 0
+    most_active = 0
+
+    def __init__(self, name, children=None):
+        self.name = name
+        self._children = children or []
+
+    def kids(self):
+        """ Returns the children, keeping track of concurrent calls. """
+        with TreeNode.lock:
+            TreeNode.active += 1
+            TreeNode.most_active = max(TreeNode.most_active, TreeNode.active)
+
+        time.sleep(0.01)
+
+        with TreeNode.lock:
+            TreeNode.active -= 1
+
+        if self.name == "broken":
+            raise Exception("Unable to retrieve children.")
+
+        return iter(self._children)
+
+def kids(node):
+    """ Returns the list of the children of a TreeNode. """
+    return list(node.kids())
+
+def tree():
+    """ Builds a tree of three levels. """
+    return TreeNode("root", [
+        TreeNode("a", [TreeNode("a1", [TreeNode("a1x")]), TreeNode("a2")]),
+        TreeNode("b", [TreeNode("b1"), TreeNode("b2"), TreeNode("b3")]),
+        TreeNode("c")
+    ])
+
+class DependencyTest(unittest.TestCase):
+    """ A unit test class for the dependency module. """
+
+    def setUp(self):
+        TreeNode.most_active = 0
+
+    def testOrderedWalk(self):
+        """ Test that the ordered mode yields nodes depth first. """
+        names = [node.name for node in
+                 parallel_walk(tree(), 3, ordered=True, expand=kids)]
+
+        self.assertEqual(names, ["a", "a1", "a1x", "a2", "b", "b1", "b2", "b3",
+                                 "c"])
+        self.assertTrue(TreeNode.most_active <= 3)
+
+    def testUnorderedWalk(self):
+        """ Test that the unordered mode yields every node once. """
+        names = [node.name for node in parallel_walk(tree(), 4, expand=kids)]
+
+        self.assertEqual(sorted(names), ["a", "a1", "a1x", "a2", "b", "b1",
+                                         "b2", "b3", "c"])
+        self.assertTrue(TreeNode.most_active > 1)
+        self.assertTrue(TreeNode.most_active <= 4)
+
+    def testMaxDepth(self):
+        """ Test limiting the depth of a parallel walk. """
+        for ordered in (True, False):
+            names = [node.name for node in
+                     parallel_walk(tree(), 2, ordered=ordered, max_depth=2,
+                                   expand=kids)]
+
+            self.assertEqual(sorted(names), ["a", "a1", "a2", "b", "b1", "b2",
+                                             "b3", "c"])
+
+    def testErrors(self):
+        """ Test that failures to retrieve children are raised. """
+        root = TreeNode("root", [TreeNode("broken")])
+
+        for ordered in (True, False):
+            with self.assertRaises(Exception):
+                list(parallel_walk(root, 2, ordered=ordered, expand=kids))
+
+    def testTypesLeadingTo(self):
+        """ Test working out which branches lead to a node type. """
+        leading = types_leading_to(["16s_raw_seq_set"])
+
+        self.assertTrue("sample" in leading)
+        self.assertTrue("16s_dna_prep" in leading)
+        self.assertFalse("wgs_dna_prep" in leading)
+
+        leading = types_leading_to(["16s_raw_seq_set"], ["visit"])
+
+        self.assertFalse("subject" in leading)
+        self.assertTrue("sample" in leading)
+
+    def testChildEdges(self):
+        """ Test that every node type can be reached from the project. """
+        children = set(child_type
+                       for edges in child_edges.values()
+                       for (_linkage, child_types) in edges
+                       for child_type in child_types)
+
+        # microbiome_assay_prep is an alias of microb_assay_prep
+        self.assertEqual(sorted(set(NODE_TYPES) - children),
+                         ["microbiome_assay_prep", "project"])
+        self.assertTrue(children <= set(NODE_TYPES))
+
+    def testDependencyMethods(self):
+        """ Test that the accessors kept in dependency_methods exist. """
+        import cutlass
+
+        for (class_name, method_name) in dependency_methods.items():
+            self.assertTrue(callable(getattr(getattr(cutlass, class_name),
+                                             method_name)))
+
+    def testSampleChildrenQueries(self):
+        """ Test that a sample's preps and attributes share one query. """
+        docs = [
+            {'id': "prep1", 'node_type': "wgs_dna_prep",
+             'linkage': {'prepared_from': ["sample1"]}},
+            {'id': "attr1", 'node_type': "sample_attr",
+             'linkage': {'associated_with': ["sample1"]}},
+            {'id': "seqset1", 'node_type': "wgs_raw_seq_set",
+             'linkage': {'sequenced_from': ["prep1"]}}
+        ]
+        fake_session = FakeSession(docs, load_document=FakeNode)
+
+        with fake_session:
+            sample = Sample()
+            sample._set_id("sample1")
+
+            children = list(sample.children(flatten=True))
+
+        self.assertEqual([node.id for node in children],
+                         ["prep1", "seqset1", "attr1"])
+
+        # One query for the sample and one for each prep and sequence set
+        self.assertEqual(len(fake_session.queries), 3)
+        self.assertTrue('"sample1"[linkage.prepared_from]' in
+                        fake_session.queries[0])
+        self.assertTrue('"sample1"[linkage.associated_with]' in
+                        fake_session.queries[0])
+
+if __name__ == '__main__':
+    unittest.main()
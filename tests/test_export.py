@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+""" A unittest script for the export module. """
+
+import json
+import unittest
+from StringIO import StringIO
+from cutlass import Project
+from cutlass.export import export_tree
+
+from CutlassTestUtil import FakeNode, FakeSession
+
+# pylint: disable=W0703, C1801
+
+DOCS = [
+    {'id': "study1", 'node_type': "study", 'linkage': {'part_of': ["project1"]}},
+    {'id': "subject2", 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]}},
+    {'id': "subject1", 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]}},
+    {'id': "attr1", 'node_type': "subject_attr",
+     'linkage': {'associated_with': ["subject1"]}},
+    {'id': "visit1", 'ver': 2, 'node_type': "visit",
+     'linkage': {'by': ["subject1"]}},
+    {'id': "visit2", 'node_type': "visit", 'linkage': {'by': ["subject2"]}},
+    {'id': "sample1", 'node_type': "sample",
+     'linkage': {'collected_during': ["visit1", "visit2"]}}
+]
+
+class ExportTest(unittest.TestCase):
+    """ A unit test class for the export module. """
+
+    def setUp(self):
+        self.fake_session = FakeSession(DOCS, load_document=FakeNode)
+        self.fake_session.start()
+        self.queries = self.fake_session.queries
+
+        self.root = FakeNode({'id': "project1", 'node_type': "project",
+                              'linkage': {}})
+
+    def tearDown(self):
+        self.fake_session.stop()
+
+    def testExport(self):
+        """ Test writing a tree as one document per line. """
+        stream = StringIO()
+
+        count = export_tree(self.root, stream)
+
+        lines = stream.getvalue().splitlines()
+        docs = [json.loads(line) for line in lines]
+
+        self.assertEqual(count, 8)
+        self.assertEqual([doc['id'] for doc in docs],
+                         ["project1", "study1", "subject1", "subject2",
+                          "attr1", "visit1", "visit2", "sample1"])
+        self.assertEqual(docs[5], {'id': "visit1", 'ver': 2,
+                                   'node_type': "visit",
+                                   'linkage': {'by': ["subject1"]},
+                                   'meta': {}})
+
+        # Keys are sorted so that exports can be compared line by line
+        self.assertEqual(lines[0], json.dumps(docs[0], sort_keys=True))
+
+        # The siblings of a batch share their queries
+        self.assertEqual(len(self.queries), 5)
+
+    def testLimits(self):
+        """ Test limiting the depth and node types of an export. """
+        stream = StringIO()
+        self.assertEqual(export_tree(self.root, stream, max_depth=2), 4)
+
+        stream = StringIO()
+        count = export_tree(self.root, stream, exclude_types=["visit"])
+        self.assertEqual(count, 5)
+        self.assertFalse("sample1" in stream.getvalue())
+
+    def testNodeExport(self):
+        """ Test exporting from a node object. """
+        project = Project()
+        project._set_id("project1")
+
+        stream = StringIO()
+        self.assertEqual(project.export(stream, max_depth=1), 2)
+
+        with self.assertRaises(Exception):
+            Project().export(stream)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,7 @@
 import unittest
 from cutlass import iHMPSession
 
-from CutlassTestUtil import CutlassTestUtil
+from CutlassTestUtil import CutlassTestUtil, FakeNode, FakeSession
 
 # pylint: disable=W0703, C1801
 
@@ -34,6 +34,306 @@ class IHMPSessionTest(unittest.TestCase):
         self.failUnless(success)
         self.failIf(session is None)
 
+    def testCreatePooledSession(self):
+        """ Test the constructor for creating sessions with a connection pool. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password,
+                              pool_size=4)
+
+        from cutlass.OSDFPool import KeepAliveOSDF
+        self.assertEqual(session.pool_size, 4)
+
+        with session.connection() as client:
+            self.failUnless(isinstance(client, KeepAliveOSDF))
+
+    def testUnpooledConnection(self):
+        """ Test that unpooled sessions hand out their single OSDF client. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+
+        self.failUnless(session.pool_size is None)
+
+        from osdf import OSDF
+        from cutlass.OSDFPool import KeepAliveOSDF
+
+        with session.connection() as client:
+            self.failUnless(isinstance(client, OSDF))
+            self.failIf(isinstance(client, KeepAliveOSDF))
+
+    def testCachedSession(self):
+        """ Test creating sessions with and without a node cache. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+        self.failUnless(session.cache is None)
+
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password,
+                              cache_size=100, cache_ttl=60)
+
+        from cutlass.NodeCache import NodeCache
+        self.failUnless(isinstance(session.cache, NodeCache))
+        self.assertEqual(session.cache.max_size, 100)
+        self.assertEqual(session.cache.ttl, 60)
+
+        doc = {'id': "cachedid", 'ver': 1, 'node_type': "subject"}
+        session.cache.put_node(doc)
+
+        # Cached nodes are served without contacting the server
+        self.assertEqual(session.get_osdf().get_node("cachedid"), doc)
+
+    def testLocalValidation(self):
+        """ Test creating sessions with and without local validation. """
+        from cutlass.SchemaValidator import SchemaValidator
+
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+        self.failUnless(session.get_osdf()._validator is None)
+
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password,
+                              local_validation=True, schema_cache_dir=None)
+
+        if SchemaValidator.available():
+            validator = session.get_osdf()._validator
+            self.failUnless(isinstance(validator, SchemaValidator))
+            self.failUnless(validator.cache_dir is None)
+
+    def testSaveAll(self):
+        """ Test saving linked nodes in dependency order. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+
+        class FakeNode(object):
+            """ Records the order in which nodes are saved. """
+            order = []
+
+            def __init__(self, name, links=None, succeed=True):
+                self.name = name
+                self.links = links or {}
+                self.succeed = succeed
+                self.id = None
+
+            def save(self):
+                if self.succeed:
+                    FakeNode.order.append(self.name)
+                    self.id = "id_" + self.name
+                return self.succeed
+
+        project = FakeNode("project")
+        study = FakeNode("study", {"part_of": [project]})
+        subject = FakeNode("subject", {"participates_in": [study]})
+        visit = FakeNode("visit", {"by": [subject]}, succeed=False)
+        sample = FakeNode("sample", {"collected_during": [visit]})
+        other = FakeNode("other", {"part_of": ["existing_id"]})
+
+        (saved, failed) = session.save_all([sample, visit, subject, study,
+                                            project, other], concurrency=4)
+
+        # "other" has no unsaved dependencies, so it may be saved at any point
+        self.failUnless(FakeNode.order.index("project") <
+                        FakeNode.order.index("study"))
+        self.failUnless(FakeNode.order.index("study") <
+                        FakeNode.order.index("subject"))
+        self.assertEqual(set(FakeNode.order),
+                         set(["project", "study", "subject", "other"]))
+        self.assertEqual(len(saved), 4)
+        self.assertEqual([node for (node, _reason) in failed], [visit, sample])
+
+        # Object references are replaced with the IDs assigned on save
+        self.assertEqual(study.links, {"part_of": ["id_project"]})
+        self.assertEqual(other.links, {"part_of": ["existing_id"]})
+
+    def testSaveAllInvalid(self):
+        """ Test that unsatisfiable links are rejected before saving. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+        study = session.create_study()
+        subject = session.create_subject()
+
+        subject.links = {"participates_in": [study]}
+
+        with self.assertRaises(ValueError):
+            session.save_all([subject])
+
+        study.links = {"subset_of": [subject]}
+
+        with self.assertRaises(ValueError):
+            session.save_all([subject, study])
+
+    def testDeleteAll(self):
+        """ Test deleting linked nodes, dependents first. """
+        order = []
+
+        def delete_node(node_id):
+            if node_id == "subject":
+                raise Exception("Unable to delete node.")
+            order.append(node_id)
+
+        study = FakeNode({'id': "study", 'node_type': "study"})
+        subject = FakeNode({'id': "subject", 'node_type': "subject",
+                            'linkage': {"participates_in": ["study"]}})
+        visit = FakeNode({'id': "visit", 'node_type': "visit",
+                          'linkage': {"by": ["subject"]}})
+        sample = FakeNode({'id': "sample", 'node_type': "sample",
+                           'linkage': {"collected_during": ["visit"]}})
+        other = FakeNode({'id': "other", 'node_type': "study",
+                          'linkage': {"part_of": ["elsewhere"]}})
+
+        fake_session = FakeSession()
+        fake_session.client().delete_node = delete_node
+
+        with fake_session as session:
+            (deleted, failed) = session.delete_all([study, subject, other,
+                                                    visit, sample],
+                                                   concurrency=4)
+
+        self.failUnless(order.index("sample") < order.index("visit"))
+        self.assertEqual(set(order), set(["sample", "visit", "other"]))
+        self.assertEqual(len(deleted), 3)
+        self.assertEqual([node for (node, _reason) in failed], [subject, study])
+
+    def testDeleteTree(self):
+        """ Test that deleting a tree reaches every node type beneath it. """
+        docs = [
+            {'id': "attr1", 'node_type': "visit_attr",
+             'linkage': {'associated_with': ["visit1"]}},
+            {'id': "sample1", 'node_type': "sample",
+             'linkage': {'collected_during': ["visit1"]}}
+        ]
+        order = []
+
+        fake_session = FakeSession(docs, load_document=FakeNode)
+        fake_session.client().delete_node = order.append
+
+        with fake_session as session:
+            visit = session.create_visit()
+            visit._set_id("visit1")
+
+            (deleted, failed) = visit.delete_tree()
+
+            self.assertEqual(len(deleted), 3)
+            self.assertEqual(failed, [])
+            self.assertEqual(set(order), set(["attr1", "sample1", "visit1"]))
+            self.failUnless(order.index("attr1") < order.index("visit1"))
+
+            # Every node class's delete() can delete recursively
+            del order[:]
+            self.assertTrue(visit.delete(recursive=True))
+            self.assertEqual(len(order), 3)
+
+    def testRetries(self):
+        """ Test that sessions with a retry policy retry OSDF calls. """
+        from cutlass.RetryPolicy import RetryPolicy, ServerStatusError
+
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password,
+                              retry_policy=RetryPolicy(max_attempts=3,
+                                                       base_delay=0))
+
+        with session.connection() as client:
+            attempts = []
+
+            def get_info():
+                attempts.append(1)
+                raise ServerStatusError(503)
+
+            client.get_info = get_info
+
+            with self.assertRaises(Exception):
+                session.get_osdf().get_info()
+
+            self.assertEqual(len(attempts), 3)
+
+    def testStatusErrors(self):
+        """ Test that only retrying sessions raise on unavailable servers. """
+        from cutlass import RetryPolicy
+
+        for (kwargs, expected) in (({}, False),
+                                   ({'retry_policy': RetryPolicy()}, True),
+                                   ({'pool_size': 2}, False)):
+            with FakeSession(**kwargs) as session:
+                with session.connection() as client:
+                    self.assertEqual(client._request._status_errors, expected)
+
+    def testStats(self):
+        """ Test that OSDF calls are recorded in the session statistics. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+
+        with session.connection() as client:
+            client.get_info = lambda: {'title': "OSDF"}
+
+            def get_node(node_id):
+                raise Exception("Unable to retrieve node document.")
+
+            client.get_node = get_node
+
+        session.get_osdf().get_info()
+
+        with self.assertRaises(Exception):
+            session.get_osdf().get_node("missing")
+
+        operations = session.stats().to_dict()['operations']
+
+        self.assertEqual(operations['get_info']['count'], 1)
+        self.assertEqual(operations['get_info']['errors'], 0)
+        self.assertEqual(operations['get_node']['errors'], 1)
+
+    def testTransferStats(self):
+        """ Test that file transfers count towards the current session. """
+        from cutlass.aspera import aspera
+
+        with FakeSession() as first:
+            # A session replacing the current one gets the transfers made
+            # while it is current
+            with FakeSession() as second:
+                with self.assertRaises(OSError):
+                    aspera.run_ascp(["not_the_ascp_command"], "password")
+
+            transfers = second.stats().to_dict()['transfers']
+            self.assertEqual(transfers['count'], 1)
+            self.assertEqual(transfers['errors'], 1)
+
+            self.assertEqual(first.stats().to_dict()['transfers']['count'], 0)
+
+    def testLoadDocument(self):
+        """ Test converting OSDF documents into objects of the right class. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+
+        doc = {
+            'id': "subjectid",
+            'ver': 2,
+            'node_type': "subject",
+            'linkage': {"participates_in": ["studyid"]},
+            'meta': {"gender": "female", "rand_subject_id": "rand",
+                     "tags": ["test"]}
+        }
+
+        subject = session.load_document(doc)
+
+        from cutlass import Subject
+        self.failUnless(isinstance(subject, Subject))
+        self.assertEqual(subject.id, "subjectid")
+        self.assertEqual(subject.version, 2)
+        self.assertEqual(subject.links, {"participates_in": ["studyid"]})
+
+        with self.assertRaises(ValueError):
+            session.load_document({'node_type': "not_a_node_type"})
+
+    def testSearchAny(self):
+        """ Test retrieving nodes of several node types with one query. """
+        docs = [
+            {'id': "subjectid", 'ver': 1, 'node_type': "subject",
+             'linkage': {"participates_in": ["studyid"]},
+             'meta': {"gender": "female", "rand_subject_id": "rand",
+                      "tags": []}},
+            {'id': "visitid", 'ver': 1, 'node_type': "visit",
+             'linkage': {"by": ["subjectid"]},
+             'meta': {"visit_id": "visit", "visit_number": 1,
+                      "interval": 0, "date": "2000-01-01", "tags": []}}
+        ]
+        fake_session = FakeSession(docs)
+
+        with fake_session as session:
+            nodes = session.search_any('"studyid"[linkage.participates_in] || ' + \
+                                       '"subjectid"[linkage.by]')
+
+        from cutlass import Subject, Visit
+        self.assertEqual(len(fake_session.queries), 1)
+        self.assertTrue(isinstance(nodes[0], Subject))
+        self.assertTrue(isinstance(nodes[1], Visit))
+        self.assertEqual(nodes[1].id, "visitid")
+
     def testUsername(self):
         """ Test the username property. """
         session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
@@ -66,6 +366,130 @@ class IHMPSessionTest(unittest.TestCase):
 
         self.util.boolPropertyTest(self, session, "ssl")
 
+    def testVerifyVersions(self):
+        """ Test the verify_versions property. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+
+        self.util.boolTypeTest(self, session, "verify_versions")
+
+        self.util.boolPropertyTest(self, session, "verify_versions")
+
+    def testReadAhead(self):
+        """ Test the read_ahead property. """
+        session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
+
+        self.assertEqual(session.read_ahead, 1)
+
+        self.util.intTypeTest(self, session, "read_ahead")
+
+        session.read_ahead = 0
+        self.assertEqual(session.read_ahead, 0)
+
+        with self.assertRaises(ValueError):
+            session.read_ahead = -1
+
+    def testChildrenOf(self):
+        """ Test retrieving the children of many nodes in batches. """
+        docs = [{'id': sample_id, 'node_type': "sample",
+                 'linkage': {'collected_during': [visit_id]}}
+                for (sample_id, visit_id) in [("sample1", "visit1"),
+                                              ("sample2", "visit1"),
+                                              ("sample3", "visit3")]]
+
+        fake_session = FakeSession(docs, load_document=lambda doc: doc['id'])
+
+        with fake_session as session:
+            visit = session.create_visit()
+            visit._set_id("visit3")
+
+            found = session.children_of(["visit1", "visit2", visit],
+                                        "collected_during", ["sample"],
+                                        chunk_size=2, concurrency=2)
+
+        self.assertEqual(found, {"visit1": ["sample1", "sample2"],
+                                 "visit2": [], "visit3": ["sample3"]})
+
+        self.assertEqual(len(fake_session.queries), 2)
+        self.assertTrue('("visit1"[linkage.collected_during] || ' + \
+                        '"visit2"[linkage.collected_during]) && ' + \
+                        '"sample"[node_type]' in fake_session.queries)
+
+        with self.assertRaises(ValueError):
+            session.children_of([session.create_visit()], "collected_during")
+
+    def testAncestorsOf(self):
+        """ Test retrieving the ancestors of many nodes at once. """
+        docs = [
+            {'id': "study1", 'node_type': "study", 'linkage': {}},
+            {'id': "subject1", 'node_type': "subject",
+             'linkage': {'participates_in': ["study1"]}},
+            {'id': "visit1", 'node_type': "visit", 'linkage': {'by': ["subject1"]}},
+            {'id': "sample1", 'node_type': "sample",
+             'linkage': {'collected_during': ["visit1"]}},
+            {'id': "sample2", 'node_type': "sample",
+             'linkage': {'collected_during': ["visit1"]}}
+        ]
+        by_id = dict((doc['id'], doc) for doc in docs)
+        fake_session = FakeSession(docs, load_document=FakeNode)
+
+        with fake_session as session:
+            samples = [FakeNode(by_id["sample1"]), FakeNode(by_id["sample2"])]
+            found = session.ancestors_of(samples, until="subject")
+
+            for sample_id in ("sample1", "sample2"):
+                self.assertEqual([node.id for node in found[sample_id]],
+                                 ["visit1", "subject1"])
+
+            # One query per level, and the shared parents were only
+            # retrieved once
+            self.assertEqual(fake_session.queries,
+                             ['"visit1"[id]', '"subject1"[id]'])
+
+            del fake_session.queries[:]
+            found = session.ancestors_of(samples + [FakeNode(by_id["visit1"])],
+                                         max_depth=1)
+            self.assertEqual([node.id for node in found["visit1"]],
+                             ["subject1"])
+            self.assertEqual(fake_session.queries,
+                             ['"visit1"[id] || "subject1"[id]'])
+
+            with self.assertRaises(Exception):
+                session.ancestors_of([FakeNode({'id': "sample4",
+                                                'node_type': "sample",
+                                                'linkage': {'collected_during':
+                                                            ["missing"]}})])
+
+            found = session.ancestors_of(samples[:1])
+            self.assertEqual([node.id for node in found["sample1"]],
+                             ["visit1", "subject1", "study1"])
+
+            found = session.ancestors_of(samples[:1], max_depth=1)
+            self.assertEqual([node.id for node in found["sample1"]], ["visit1"])
+
+            sample = session.create_sample()
+            sample._set_id("sample3")
+            sample.links = {"collected_during": ["visit1"]}
+
+            self.assertEqual([node.id for node in sample.parents()], ["visit1"])
+            self.assertEqual([node.id for node in sample.ancestors("visit")],
+                             ["visit1"])
+            self.assertEqual(len(sample.ancestors()), 3)
+
+    def testUpdatedVersion(self):
+        """ Test how node versions are determined after an update. """
+        with FakeSession(cache_size=10) as session:
+            subject = session.create_subject()
+            subject._set_id("subjectid")
+            subject.version = 3
+
+            # Derived locally by default
+            self.assertEqual(subject._get_updated_version(), 4)
+
+            # Retrieved (here from the cache) when verification is requested
+            session.cache.put_node({'id': "subjectid", 'ver': 7})
+            session.verify_versions = True
+            self.assertEqual(subject._get_updated_version(), 7)
+
     def testCreate16SDnaPrep(self):
         """ Test the create_16s_dna_prep() method. """
         session = iHMPSession(IHMPSessionTest.username, IHMPSessionTest.password)
@@ -190,6 +190,30 @@ class ImportTest(unittest.TestCase):
         self.failUnless(success)
         self.failIf(HostWgsRawSeqSet is None)
 
+    def testImportAsyncIHMPSession(self):
+        """ Test the import of the AsyncIHMPSession module. """
+        success = False
+        try:
+            from cutlass import AsyncIHMPSession
+            success = True
+        except Exception:
+            pass
+
+        self.failUnless(success)
+        self.failIf(AsyncIHMPSession is None)
+
+    def testImportRetryPolicy(self):
+        """ Test the import of the RetryPolicy module. """
+        success = False
+        try:
+            from cutlass import RetryPolicy
+            success = True
+        except Exception:
+            pass
+
+        self.failUnless(success)
+        self.failIf(RetryPolicy is None)
+
     def testImportIHMPSession(self):
         """ Test the import of the iHMPSession module. """
         success = False
@@ -119,6 +119,15 @@ class ImportAllTest(unittest.TestCase):
         """ Test the import of the Serology module. """
         self.failIf(Serology is None)
 
+    def testImportAsyncSession(self):
+        """ Test the import of the AsyncIHMPSession module. """
+        self.failIf(AsyncIHMPSession is None)
+
+    def testImportRetryPolicy(self):
+        """ Test the import of the RetryPolicy module. """
+        self.failIf(RetryPolicy is None)
+        self.failIf(CircuitBreaker is None)
+
     def testImportSession(self):
         """ Test the import of the iHMPSession module. """
         self.failIf(iHMPSession is None)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+""" A unittest script for the importer module. """
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from itertools import count
+from cutlass.importer import Journal, import_file
+
+from CutlassTestUtil import FakeSession
+
+# pylint: disable=W0703, C1801
+
+DOCS = [
+    {'id': "visit1", 'ver': 3, 'node_type': "visit",
+     'linkage': {'by': ["subject1"]}, 'meta': {}},
+    {'id': "subject1", 'ver': 1, 'node_type': "subject",
+     'linkage': {'participates_in': ["study0"]}, 'meta': {}},
+    {'id': "sample1", 'ver': 1, 'node_type': "sample",
+     'linkage': {'collected_during': ["visit1", "visit2"]}, 'meta': {}},
+    {'id': "visit2", 'ver': 2, 'node_type': "visit",
+     'linkage': {'by': ["subject1"]}, 'meta': {}}
+]
+
+class ImporterTest(unittest.TestCase):
+    """ A unit test class for the importer module. """
+
+    def setUp(self):
+        self.fake_session = FakeSession()
+        self.inserted = []
+        self.broken = set()
+        new_ids = count(1)
+
+        def insert_node(doc):
+            if doc['node_type'] in self.broken:
+                raise Exception("Unable to insert node document.")
+
+            self.inserted.append(doc)
+            return "new%s" % next(new_ids)
+
+        self.fake_session.client().insert_node = insert_node
+        self.fake_session.start()
+
+        self.tempdir = tempfile.mkdtemp()
+        self.input = os.path.join(self.tempdir, "study.ndjson")
+        self.journal = os.path.join(self.tempdir, "study.journal")
+
+        with open(self.input, "w") as input_fh:
+            for doc in DOCS:
+                input_fh.write(json.dumps(doc) + "\n")
+
+    def tearDown(self):
+        self.fake_session.stop()
+        shutil.rmtree(self.tempdir)
+
+    def testImport(self):
+        """ Test inserting documents in dependency order. """
+        report = import_file(self.input, self.journal, concurrency=2)
+
+        self.assertEqual(report, {'imported': 4, 'skipped': 0, 'failed': {},
+                                  'blocked': []})
+
+        self.assertEqual([doc['node_type'] for doc in self.inserted],
+                         ["subject", "visit", "visit", "sample"])
+
+        # Links are rewritten, except to nodes outside the file
+        self.assertEqual(self.inserted[0]['linkage'],
+                         {'participates_in': ["study0"]})
+        self.assertEqual(self.inserted[1]['linkage'], {'by': ["new1"]})
+        self.assertEqual(self.inserted[2]['linkage'], {'by': ["new1"]})
+        self.assertEqual(sorted(self.inserted[3]['linkage']['collected_during']),
+                         ["new2", "new3"])
+        self.assertFalse('id' in self.inserted[3] or 'ver' in self.inserted[3])
+
+        with Journal(self.journal) as journal:
+            self.assertEqual(journal.ids['subject1'], "new1")
+
+    def testResume(self):
+        """ Test that a second run only inserts what is missing. """
+        self.broken.add("sample")
+
+        report = import_file(self.input, self.journal)
+        self.assertEqual(report['imported'], 3)
+        self.assertEqual(list(report['failed']), ["sample1"])
+
+        # Simulate an interruption while a journal entry was being written
+        with open(self.journal, "a") as journal_fh:
+            journal_fh.write('{"old": "samp')
+
+        self.broken.clear()
+        del self.inserted[:]
+
+        report = import_file(self.input, self.journal)
+
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual(report['skipped'], 3)
+        self.assertEqual(len(self.inserted), 1)
+        with Journal(self.journal) as journal:
+            self.assertEqual(len(journal.ids), 4)
+
+    def testBlocked(self):
+        """ Test that nodes linking to failed nodes are not attempted. """
+        self.broken.add("subject")
+
+        report = import_file(self.input, self.journal)
+
+        self.assertEqual(report['imported'], 0)
+        self.assertEqual(list(report['failed']), ["subject1"])
+        self.assertEqual(report['blocked'], ["visit1", "visit2", "sample1"])
+
+    def testCycle(self):
+        """ Test that linkage cycles are rejected. """
+        with open(self.input, "a") as input_fh:
+            input_fh.write(json.dumps({'id': "a", 'linkage': {'x': ["b"]}}) + "\n")
+            input_fh.write(json.dumps({'id': "b", 'linkage': {'x': ["a"]}}) + "\n")
+
+        with self.assertRaises(ValueError):
+            import_file(self.input, self.journal)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ import json
 from cutlass import MicrobiomeAssayPrep
 
 from CutlassTestConfig import CutlassTestConfig
-from CutlassTestUtil import CutlassTestUtil
+from CutlassTestUtil import CutlassTestUtil, FakeSession
 
 # pylint: disable=W0703, C1801
 
@@ -390,5 +390,25 @@ class MicrobiomeAssayPrepTest(unittest.TestCase):
         with self.assertRaises(Exception):
             load_test = load_test.load(prep.id)
 
+class MicrobiomeAssayPrepQueryTest(unittest.TestCase):
+    """ Tests of the MicrobiomeAssayPrep class that need no OSDF server. """
+
+    def testTypedChildQueries(self):
+        """ Test that node type filtering of derived nodes is left to OSDF. """
+        fake_session = FakeSession([])
+
+        with fake_session:
+            prep = MicrobiomeAssayPrep()
+            prep._set_id("prepid")
+
+            for (method, node_type) in (("cytokines", "cytokine"),
+                                        ("lipidomes", "lipidome"),
+                                        ("metabolomes", "metabolome"),
+                                        ("proteomes", "proteome")):
+                self.assertEqual(list(getattr(prep, method)()), [])
+                self.assertEqual(fake_session.queries[-1],
+                                 '"prepid"[linkage.derived_from] && ' + \
+                                 '"{}"[node_type]'.format(node_type))
+
 if __name__ == '__main__':
     unittest.main()
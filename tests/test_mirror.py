@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+""" A unittest script for the mirror module. """
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from cutlass import Subject
+from cutlass.mirror import Mirror
+
+from CutlassTestUtil import FakeSession
+
+# pylint: disable=W0703, C1801
+
+def subject(node_id, ver, tags=None):
+    """ Builds a subject document. """
+    return {'id': node_id, 'ver': ver, 'node_type': "subject",
+            'linkage': {'participates_in': ["study1"]},
+            'meta': {'gender': "female", 'rand_subject_id': node_id,
+                     'tags': tags or []}}
+
+def visit(node_id, ver, subject_id):
+    """ Builds a visit document. """
+    return {'id': node_id, 'ver': ver, 'node_type': "visit",
+            'linkage': {'by': [subject_id]},
+            'meta': {'visit_id': node_id, 'visit_number': 1, 'interval': 0,
+                     'date': "2000-01-01", 'tags': []}}
+
+class MirrorTest(unittest.TestCase):
+    """ A unit test class for the Mirror class. """
+
+    def setUp(self):
+        self.docs = [subject("subject1", 1, ["healthy"]), subject("subject2", 1),
+                     visit("visit1", 1, "subject1"), visit("visit2", 1, "subject2")]
+        self.fake_session = FakeSession(self.docs)
+        self.fake_session.start()
+
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, "mirror.db")
+
+    def tearDown(self):
+        self.fake_session.stop()
+        shutil.rmtree(self.tempdir)
+
+    def testSync(self):
+        """ Test copying nodes and then only the changes. """
+        with Mirror(self.path) as mirror:
+            self.assertTrue(mirror.last_sync is None)
+
+            report = mirror.sync()
+
+            self.assertEqual(report['added'], 4)
+            self.assertEqual(len(mirror), 4)
+            self.assertTrue(mirror.last_sync is not None)
+
+        # Change one node, add one and delete one
+        self.docs[0] = subject("subject1", 2, ["healthy"])
+        self.docs[3] = visit("visit3", 1, "subject1")
+
+        with Mirror(self.path) as mirror:
+            report = mirror.sync()
+
+            self.assertEqual(report, {'added': 1, 'updated': 1,
+                                      'unchanged': 2, 'removed': 1})
+            self.assertEqual(mirror.version("subject1"), 2)
+            self.assertFalse("visit2" in mirror)
+
+            report = mirror.sync(["visit"], prune=False)
+            self.assertEqual(report['unchanged'], 2)
+
+            with self.assertRaises(ValueError):
+                mirror.sync(["not_a_node_type"])
+
+    def testReadDuringSync(self):
+        """ Test that the mirror can be read while pages are retrieved. """
+        with Mirror(self.path) as mirror:
+            mirror.sync(["subject"])
+
+            oql_query = self.fake_session.client().oql_query
+            found = []
+
+            def read():
+                found.append(mirror.get("subject1")['id'])
+
+            def slow_oql_query(namespace, query, page=1):
+                reader = threading.Thread(target=read)
+                reader.start()
+                reader.join(5)
+
+                return oql_query(namespace, query, page)
+
+            self.fake_session.answer_with(slow_oql_query)
+
+            mirror.sync(["subject"])
+
+            self.assertEqual(found, ["subject1"])
+
+    def testLookups(self):
+        """ Test looking up nodes by ID, type, tag and linkage. """
+        with Mirror(":memory:") as mirror:
+            mirror.sync()
+
+            self.assertEqual(mirror.get("subject2")['meta']['rand_subject_id'],
+                             "subject2")
+            self.assertTrue(mirror.get("missing") is None)
+            self.assertEqual(mirror.count("visit"), 2)
+
+            self.assertEqual([doc['id'] for doc in mirror.of_type("subject")],
+                             ["subject1", "subject2"])
+            self.assertEqual([doc['id'] for doc in mirror.tagged("healthy")],
+                             ["subject1"])
+
+            visits = mirror.linked_to(["subject1", "subject2"], "by")
+            self.assertEqual([doc['id'] for doc in visits], ["visit1", "visit2"])
+
+            subjects = mirror.linked_to("study1", types=["visit"])
+            self.assertEqual(list(subjects), [])
+
+            self.assertEqual(mirror.links_from("visit1"), [("by", "subject1")])
+
+            # Indexed and unindexed terms may be mixed
+            docs = mirror.query('"subject1"[linkage.by] || "visit2"[meta.visit_id]')
+            self.assertEqual([doc['id'] for doc in docs], ["visit1", "visit2"])
+
+            docs = mirror.query('"visit"[node_type] && "visit2"[visit_id]')
+            self.assertEqual([doc['id'] for doc in docs], ["visit2"])
+
+            docs = mirror.query('"subject1"[linkage.by] and "visit"[node_type]')
+            self.assertEqual([doc['id'] for doc in docs], ["visit1"])
+
+            self.assertTrue(isinstance(mirror.load("subject1"), Subject))
+
+            self.assertTrue(mirror.remove("visit1"))
+            self.assertFalse(mirror.remove("visit1"))
+            self.assertEqual(mirror.links_from("visit1"), [])
+
+    def testNamespace(self):
+        """ Test that a mirror only holds one namespace. """
+        Mirror(self.path).close()
+
+        with self.assertRaises(ValueError):
+            Mirror(self.path, namespace="other")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+""" A unittest script for the NodeCache module. """
+
+import time
+import unittest
+from cutlass.NodeCache import NodeCache
+
+# pylint: disable=W0703, C1801
+
+def make_doc(node_id, version=1):
+    """ Build a minimal OSDF document. """
+    return {'id': node_id, 'ver': version, 'node_type': "subject",
+            'linkage': {}, 'meta': {'tags': []}}
+
+class NodeCacheTest(unittest.TestCase):
+    """ A unit test class for the NodeCache module. """
+
+    def testInvalidSize(self):
+        """ Test that the cache size must be a positive integer. """
+        with self.assertRaises(ValueError):
+            NodeCache(0)
+
+    def testPutGet(self):
+        """ Test storing and retrieving a node. """
+        cache = NodeCache(10)
+
+        self.failUnless(cache.get_node("a") is None)
+
+        cache.put_node(make_doc("a"))
+
+        self.assertEqual(cache.get_node("a"), make_doc("a"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def testCopies(self):
+        """ Test that modifying returned documents leaves the cache intact. """
+        cache = NodeCache(10)
+        doc = make_doc("a")
+        cache.put_node(doc)
+
+        doc['meta']['tags'].append("changed")
+        retrieved = cache.get_node("a")
+        retrieved['meta']['tags'].append("changed")
+
+        self.assertEqual(cache.get_node("a")['meta']['tags'], [])
+
+    def testVersions(self):
+        """ Test looking up nodes by version. """
+        cache = NodeCache(10)
+        cache.put_node(make_doc("a", 2))
+        cache.put_node(make_doc("a", 1), latest=False)
+
+        self.assertEqual(cache.get_node("a")['ver'], 2)
+        self.assertEqual(cache.get_node("a", 2)['ver'], 2)
+        self.assertEqual(cache.get_node("a", 1)['ver'], 1)
+        self.failUnless(cache.get_node("a", 3) is None)
+
+    def testLRUEviction(self):
+        """ Test that the least recently used node is evicted first. """
+        cache = NodeCache(2)
+        cache.put_node(make_doc("a"))
+        cache.put_node(make_doc("b"))
+
+        # Touch "a" so that "b" becomes the least recently used
+        cache.get_node("a")
+        cache.put_node(make_doc("c"))
+
+        self.assertEqual(len(cache), 2)
+        self.failIf(cache.get_node("a") is None)
+        self.failUnless(cache.get_node("b") is None)
+        self.failIf(cache.get_node("c") is None)
+
+    def testTTL(self):
+        """ Test that entries expire after the time-to-live. """
+        cache = NodeCache(10, ttl=0.05)
+        cache.put_node(make_doc("a"))
+
+        self.failIf(cache.get_node("a") is None)
+
+        time.sleep(0.1)
+
+        self.failUnless(cache.get_node("a") is None)
+
+    def testQueries(self):
+        """ Test caching query pages and the nodes within them. """
+        cache = NodeCache(10)
+        page = {'result_count': 2, 'page': 1,
+                'results': [make_doc("a"), make_doc("b")]}
+
+        cache.put_query("ihmp", '"x"[linkage.by]', 1, page)
+
+        self.assertEqual(cache.get_query("ihmp", '"x"[linkage.by]', 1), page)
+        self.failUnless(cache.get_query("ihmp", '"x"[linkage.by]', 2) is None)
+        self.failIf(cache.get_node("b") is None)
+
+    def testInvalidate(self):
+        """ Test that invalidation drops the node and all query pages. """
+        cache = NodeCache(10)
+        cache.put_node(make_doc("a"))
+        cache.put_node(make_doc("b"))
+        cache.put_query("ihmp", "q", 1, {'results': []})
+
+        cache.invalidate("a")
+
+        self.failUnless(cache.get_node("a") is None)
+        self.failIf(cache.get_node("b") is None)
+        self.failUnless(cache.get_query("ihmp", "q", 1) is None)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
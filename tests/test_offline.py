@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+""" A unittest script for offline sessions served from a local mirror. """
+
+import time
+import unittest
+from cutlass import Cytokine, HostAssayPrep, iHMPSession, Subject, Visit
+from cutlass.mirror import Mirror
+from cutlass.RetryPolicy import CircuitBreaker, RetryPolicy, is_transient
+
+from CutlassTestUtil import FakeSession
+
+# pylint: disable=W0703, C1801
+
+DOCS = [
+    {'id': "subject1", 'ver': 1, 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]},
+     'meta': {'gender': "female", 'rand_subject_id': "r1", 'tags': ["a"]}},
+    {'id': "subject2", 'ver': 3, 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]},
+     'meta': {'gender': "male", 'rand_subject_id': "r2", 'tags': []}},
+    {'id': "visit1", 'ver': 1, 'node_type': "visit",
+     'linkage': {'by': ["subject1"]},
+     'meta': {'visit_id': "v1", 'visit_number': 1, 'interval': 0,
+              'date': "2000-01-01", 'tags': ["a"]}},
+    {'id': "visit2", 'ver': 1, 'node_type': "visit",
+     'linkage': {'by': ["subject1"]},
+     'meta': {'visit_id': "v2", 'visit_number': 2, 'interval': 30,
+              'date': "2000-01-31", 'tags': []}},
+    {'id': "visit3", 'ver': 2, 'node_type': "visit",
+     'linkage': {'by': ["subject2"]},
+     'meta': {'visit_id': "v3", 'visit_number': 1, 'interval': 0,
+              'date': "2000-02-01", 'tags': []}},
+    {'id': "cytokine1", 'ver': 1, 'node_type': "cytokine",
+     'linkage': {'derived_from': ["prep1"]},
+     'meta': {'checksums': {'md5': "d8e8fca2dc0f896fd7cb4cb0031ba249"},
+              'study': "prediabetes", 'tags': [], 'urls': ["fasp://c1"]}}
+]
+
+class OfflineTest(unittest.TestCase):
+    """ A unit test class for offline sessions. """
+
+    def setUp(self):
+        self.mirror = Mirror(":memory:")
+
+        for doc in DOCS:
+            self.mirror.store(doc)
+
+        self.fake_session = FakeSession(mirror=self.mirror)
+        self.session = self.fake_session.start()
+
+    def tearDown(self):
+        self.fake_session.stop()
+        self.mirror.close()
+
+    def testSession(self):
+        """ Test the properties of an offline session. """
+        self.assertTrue(self.session.offline)
+        self.assertTrue(self.session.mirror is self.mirror)
+
+        online = iHMPSession("test", "test")
+        self.assertFalse(online.offline)
+        self.assertTrue(online.mirror is None)
+
+    def testLoad(self):
+        """ Test loading nodes from the mirror. """
+        subject = Subject.load("subject2")
+
+        self.assertEqual(subject.rand_subject_id, "r2")
+        self.assertEqual(subject.version, 3)
+
+        with self.assertRaises(Exception):
+            Subject.load("missing")
+
+        (nodes, failed) = self.session.load_many(["visit1", "missing"])
+        self.assertTrue(isinstance(nodes[0], Visit))
+        self.assertEqual(list(failed), ["missing"])
+
+    def testSearch(self):
+        """ Test searching and traversing nodes in the mirror. """
+        subjects = Subject.search()
+        self.assertEqual([subject.id for subject in subjects],
+                         ["subject1", "subject2"])
+
+        visits = Visit.search('"a"[tags]')
+        self.assertEqual([visit.id for visit in visits], ["visit1"])
+
+        visits = Subject.load("subject1").visits()
+        self.assertEqual([visit.id for visit in visits], ["visit1", "visit2"])
+
+        grouped = Subject.visits_for(["subject1", "subject2"])
+        self.assertEqual([visit.id for visit in grouped["subject2"]], ["visit3"])
+
+        nodes = self.session.search_any('"a"[tags]')
+        self.assertEqual([node.id for node in nodes], ["subject1", "visit1"])
+
+    def testTypedQueries(self):
+        """ Test accessors whose queries combine terms with "and". """
+        prep = HostAssayPrep()
+        prep._set_id("prep1")
+
+        cytokines = list(prep.cytokines())
+
+        self.assertEqual([cytokine.id for cytokine in cytokines], ["cytokine1"])
+        self.assertTrue(isinstance(cytokines[0], Cytokine))
+        self.assertEqual(list(prep.lipidomes()), [])
+
+    def testReadOnly(self):
+        """ Test that offline sessions cannot change nodes. """
+        subject = Subject.load("subject1")
+
+        self.assertFalse(subject.delete())
+
+        subject.rand_subject_id = "changed"
+        self.assertFalse(subject.save())
+
+        self.assertEqual(self.mirror.get("subject1")['meta']['rand_subject_id'],
+                         "r1")
+
+    def testRefusalsNotRetried(self):
+        """ Test that refusing to change nodes offline is not retried. """
+        breaker = CircuitBreaker(failure_threshold=1)
+        fake_session = FakeSession(mirror=self.mirror,
+                                   retry_policy=RetryPolicy(base_delay=10),
+                                   circuit_breaker=breaker)
+
+        with fake_session as session:
+            started = time.time()
+
+            with self.assertRaises(Exception) as context:
+                session.get_osdf().delete_node("subject1")
+
+            self.assertTrue(time.time() - started < 5)
+            self.assertFalse(is_transient(context.exception))
+            self.assertEqual(breaker.state, "closed")
+
+if __name__ == '__main__':
+    unittest.main()
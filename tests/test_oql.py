@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+""" A unittest script for the oql module. """
+
+import unittest
+from cutlass.oql import And, Collection, Match, Or, evaluate, field_values, parse
+from cutlass.Util import linkage_query
+
+# pylint: disable=W0703, C1801
+
+DOCS = [
+    {'id': "visit1", 'node_type': "visit", 'linkage': {'by': ["subject1"]},
+     'meta': {'visit_number': 1, 'fasting': True, 'tags': ["a", "b"],
+              'mixs': {'biome': "gut"}}},
+    {'id': "visit2", 'node_type': "visit", 'linkage': {'by': ["subject1"]},
+     'meta': {'visit_number': 2, 'fasting': False, 'tags': ["a"]}},
+    {'id': "subject1", 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]},
+     'meta': {'gender': "male", 'tags': []}},
+    {'id': "subject2", 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]},
+     'meta': {'gender': "female", 'tags': []}}
+]
+
+class OQLTest(unittest.TestCase):
+    """ A unit test class for the oql module. """
+
+    def testParse(self):
+        """ Test parsing the queries cutlass builds. """
+        self.assertEqual(parse('"visit"[node_type]'),
+                         Match("node_type", "visit"))
+
+        self.assertEqual(parse(linkage_query(["a", "b"], "by", ["visit"])),
+                         And([Or([Match("linkage.by", "a"),
+                                  Match("linkage.by", "b")]),
+                              Match("node_type", "visit")]))
+
+        self.assertEqual(parse(' ("x \\"y\\"" [meta.name]) '),
+                         Match("meta.name", 'x "y"'))
+
+    def testOperatorWords(self):
+        """ Test that "and" and "or" stand for && and ||. """
+        self.assertEqual(parse('"a"[f] and "b"[g]'),
+                         And([Match("f", "a"), Match("g", "b")]))
+        self.assertEqual(parse('("a"[f] OR "b"[f]) And "c"[g]'),
+                         And([Or([Match("f", "a"), Match("f", "b")]),
+                              Match("g", "c")]))
+
+        # Words inside values and fields are not operators
+        self.assertEqual(parse('"x and y"[brand]'), Match("brand", "x and y"))
+
+    def testPrecedence(self):
+        """ Test that && binds more tightly than ||. """
+        self.assertEqual(parse('"a"[f] || "b"[f] && "c"[g]'),
+                         Or([Match("f", "a"),
+                             And([Match("f", "b"), Match("g", "c")])]))
+
+    def testInvalid(self):
+        """ Test that malformed queries are rejected. """
+        for query in ['', '"a"', '"a"[f] &&', '("a"[f]', '"a"[f])',
+                      '"a"[f] "b"[f]', 'a[f]']:
+            with self.assertRaises(ValueError):
+                parse(query)
+
+    def testFieldValues(self):
+        """ Test looking up the fields of a document. """
+        self.assertEqual(field_values(DOCS[0], "linkage.by"), ["subject1"])
+        self.assertEqual(field_values(DOCS[0], "tags"), ["a", "b"])
+        self.assertEqual(field_values(DOCS[0], "meta.tags"), ["a", "b"])
+        self.assertEqual(field_values(DOCS[0], "mixs.biome"), ["gut"])
+        self.assertEqual(field_values(DOCS[0], "missing.field"), [])
+
+    def testEvaluate(self):
+        """ Test filtering documents with a query. """
+        def ids(query):
+            return [doc['id'] for doc in evaluate(query, DOCS)]
+
+        self.assertEqual(ids('"visit"[node_type] && "a"[tags]'),
+                         ["visit1", "visit2"])
+        self.assertEqual(ids('"2"[visit_number]'), ["visit2"])
+        self.assertEqual(ids('"true"[meta.fasting]'), ["visit1"])
+        self.assertEqual(ids('"gut"[meta.mixs.biome] || "subject1"[id]'),
+                         ["visit1", "subject1"])
+        self.assertEqual(ids('"x"[linkage.by]'), [])
+
+    def testLibraryQueries(self):
+        """ Test evaluating queries as the node classes build them. """
+        docs = [
+            {'id': "c1", 'node_type': "cytokine",
+             'linkage': {'derived_from': ["x"]}, 'meta': {}},
+            {'id': "l1", 'node_type': "lipidome",
+             'linkage': {'derived_from': ["x"]}, 'meta': {}},
+            {'id': "c2", 'node_type': "cytokine",
+             'linkage': {'derived_from': ["y"]}, 'meta': {}}
+        ]
+        query = '"x"[linkage.derived_from] and "cytokine"[node_type]'
+
+        self.assertEqual([doc['id'] for doc in evaluate(query, docs)], ["c1"])
+        self.assertEqual([doc['id'] for doc in Collection(docs).query(query)],
+                         ["c1"])
+
+    def testCollection(self):
+        """ Test answering queries from indexed documents. """
+        collection = Collection(DOCS)
+
+        self.assertEqual(len(collection), 4)
+        self.assertEqual([doc['id'] for doc in
+                          collection.query('"subject1"[linkage.by] && "1"[visit_number]')],
+                         ["visit1"])
+        self.assertEqual([doc['id'] for doc in
+                          collection.query('"gut"[mixs.biome]')], ["visit1"])
+
+        # Indexed terms narrow down the documents to check
+        self.assertEqual(collection._candidates(parse(
+            '"subject"[node_type] && "male"[gender]')),
+                         set(["subject1", "subject2"]))
+        self.assertTrue(collection._candidates(parse(
+            '"subject"[node_type] || "male"[gender]')) is None)
+        self.assertEqual(collection._candidates(parse('"subject1"[id]')),
+                         set(["subject1"]))
+        self.assertEqual(collection._candidates(parse('"missing"[id]')), set())
+
+        collection.remove("visit1")
+        collection.add(dict(DOCS[1], meta={'tags': ["c"]}))
+
+        self.assertEqual(collection.query('"a"[tags]'), [])
+        self.assertEqual([doc['id'] for doc in collection.query('"c"[tags]')],
+                         ["visit2"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+
+""" A unittest script for the OSDFPool module. """
+
+import httplib
+import socket
+import threading
+import unittest
+from cutlass.OSDFPool import OSDFPool, KeepAliveOSDF, KeepAliveRequest, \
+                             MeteredRequest
+from cutlass.RetryPolicy import ServerStatusError
+
+# pylint: disable=W0703, C1801
+
+class FakeResponse(object):
+    """ A successful response on a fake connection. """
+    status = 200
+    will_close = False
+
+    def read(self):
+        return "{}"
+
+    def getheaders(self):
+        return []
+
+class FakeConnection(object):
+    """ A connection that fails at a given step, as stale ones do. """
+    def __init__(self, requests, fail_at=None):
+        self.requests = requests
+        self.fail_at = fail_at
+
+    def _step(self, name):
+        if name == self.fail_at:
+            if name == "getresponse":
+                raise httplib.BadStatusLine("")
+            raise socket.error("Broken pipe")
+
+    def putrequest(self, method, resource):
+        self.requests.append(method)
+
+    def putheader(self, name, value):
+        pass
+
+    def endheaders(self):
+        self._step("endheaders")
+
+    def send(self, data):
+        pass
+
+    def getresponse(self):
+        self._step("getresponse")
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+class OSDFPoolTest(unittest.TestCase):
+    """ A unit test class for the OSDFPool module. """
+
+    def testCreatePool(self):
+        """ Test the constructor for creating pools. """
+        pool = OSDFPool("localhost", "test", "test", size=3)
+
+        self.assertEqual(pool.size, 3)
+        self.assertEqual(len(pool._clients), 3)
+
+        for client in pool._clients:
+            self.assertTrue(isinstance(client, KeepAliveOSDF))
+
+    def testInvalidSize(self):
+        """ Test that a pool must have at least one connection. """
+        with self.assertRaises(ValueError):
+            OSDFPool("localhost", "test", "test", size=0)
+
+        with self.assertRaises(ValueError):
+            OSDFPool("localhost", "test", "test", size="2")
+
+    def testAcquireRelease(self):
+        """ Test that borrowed clients are exclusive until released. """
+        pool = OSDFPool("localhost", "test", "test", size=2, timeout=0.1)
+
+        first = pool.acquire()
+        second = pool.acquire()
+
+        self.assertIsNot(first, second)
+
+        with self.assertRaises(Exception):
+            pool.acquire()
+
+        pool.release(first)
+
+        with pool.connection() as client:
+            self.assertIs(client, first)
+
+        pool.release(second)
+
+    def testConcurrentBorrowing(self):
+        """ Test that no client is handed to two threads at once. """
+        pool = OSDFPool("localhost", "test", "test", size=2)
+        in_use = set()
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                with pool.connection() as client:
+                    with lock:
+                        if id(client) in in_use:
+                            errors.append(client)
+                        in_use.add(id(client))
+                    with lock:
+                        in_use.discard(id(client))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 0)
+
+    def testPropertiesPropagate(self):
+        """ Test that connection settings reach every pooled client. """
+        pool = OSDFPool("localhost", "test", "test", size=2)
+
+        pool.server = "example.org"
+        pool.port = 8124
+        pool.username = "user2"
+        pool.password = "pass2"
+        pool.ssl = True
+
+        for client in pool._clients:
+            self.assertEqual(client.server, "example.org")
+            self.assertEqual(client.port, 8124)
+            self.assertEqual(client.username, "user2")
+            self.assertEqual(client.password, "pass2")
+            self.assertTrue(client.ssl)
+
+    def testOSDFMethods(self):
+        """ Test that the pool exposes the OSDF client methods. """
+        pool = OSDFPool("localhost", "test", "test", size=1)
+
+        for method in ("get_node", "insert_node", "edit_node", "delete_node",
+                       "validate_node", "oql_query"):
+            self.assertTrue(callable(getattr(pool, method)))
+
+        with self.assertRaises(AttributeError):
+            getattr(pool, "not_a_method")
+
+    def testByteCounter(self):
+        """ Test that request and response sizes are reported. """
+        counts = []
+
+        pool = OSDFPool("localhost", "test", "test", size=2,
+                        byte_counter=lambda sent, received: counts.append((sent, received)))
+
+        with pool.connection() as client:
+            request = client._request
+            self.failUnless(isinstance(request, MeteredRequest))
+
+            request._count("abc", {'content': "hello"})
+            request._count(None, {'content': None})
+
+        self.assertEqual(counts, [(3, 5), (0, 0)])
+
+    def testServerStatus(self):
+        """ Test that responses from an unavailable server raise errors. """
+        unavailable = {'content': "", 'code': 503, 'headers': {}}
+
+        # Left to the OSDF client unless asked for
+        request = MeteredRequest("localhost", "test", "test")
+        self.assertEqual(request._count(None, unavailable), unavailable)
+
+        request = MeteredRequest("localhost", "test", "test",
+                                 status_errors=True)
+
+        with self.assertRaises(ServerStatusError) as context:
+            request._count(None, unavailable)
+
+        self.assertEqual(context.exception.status, 503)
+
+        pool = OSDFPool("localhost", "test", "test", size=1,
+                        status_errors=True)
+
+        with pool.connection() as client:
+            self.failUnless(client._request._status_errors)
+
+        results = {'content': "", 'code': 404,
+                   'headers': {'x-osdf-error': "Not found"}}
+        self.assertEqual(request._count(None, results), results)
+
+    def testStaleConnection(self):
+        """ Test which requests are sent again after a stale connection. """
+        requests = []
+        request = KeepAliveRequest("localhost", "test", "test")
+
+        def stale(fail_at):
+            request._conn = FakeConnection(requests, fail_at)
+
+        def get_connection():
+            if request._conn is None:
+                request._conn = FakeConnection(requests)
+            return request._conn
+
+        request._get_connection = get_connection
+
+        # Idempotent requests are repeated on a new connection
+        for (method, args) in (("get", ()), ("put", ("{}",)),
+                               ("delete", ())):
+            del requests[:]
+            stale("getresponse")
+
+            result = getattr(request, method)("/nodes/id", *args)
+
+            self.assertEqual(result['code'], 200)
+            self.assertEqual(len(requests), 2)
+
+        # So are queries and validations, although they are sent with POST
+        for (resource, fail_at) in (("/nodes/oql/ihmp", "getresponse"),
+                                    ("/nodes/validate", "endheaders")):
+            del requests[:]
+            stale(fail_at)
+
+            self.assertEqual(request.post(resource, "{}")['code'], 200)
+            self.assertEqual(requests, ["POST", "POST"])
+
+        # Inserts are not, as they could create duplicate nodes
+        del requests[:]
+        stale("getresponse")
+
+        with self.assertRaises(httplib.BadStatusLine):
+            request.post("/nodes", "{}")
+
+        self.assertEqual(requests, ["POST"])
+        self.assertTrue(request._conn is None)
+
+if __name__ == '__main__':
+    unittest.main()
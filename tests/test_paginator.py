@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+""" A unittest script for the Paginator module. """
+
+import time
+import unittest
+from cutlass import Sample
+from cutlass.Paginator import Paginator
+
+from CutlassTestUtil import FakeSession
+
+
+# pylint: disable=W0703, C1801
+
+class FakeOSDF(object):
+    """ Serves a fixed number of documents in pages of a fixed size. """
+    def __init__(self, total, page_size):
+        self.total = total
+        self.page_size = page_size
+        self.queries = []
+
+    def oql_query(self, namespace, query, page=1):
+        self.queries.append((namespace, query, page))
+
+        start = (page - 1) * self.page_size
+        stop = min(start + self.page_size, self.total)
+        docs = [{'id': "id%s" % n, 'node_type': "sample"}
+                for n in range(start, stop)]
+
+        return {'result_count': self.total, 'page': page, 'results': docs}
+
+class PaginatorTest(unittest.TestCase):
+    """ A unit test class for the Paginator module. """
+
+    def setUp(self):
+        self.fake = FakeOSDF(25, 10)
+        self.fake_session = FakeSession(oql_query=self.fake.oql_query)
+        self.session = self.fake_session.start()
+
+    def tearDown(self):
+        self.fake_session.stop()
+
+    def testResultCount(self):
+        """ Test that the result count is known before iterating. """
+        paginator = Paginator("ihmp", '"sample"[node_type]')
+
+        self.assertEqual(paginator.result_count, 25)
+        self.assertEqual(len(self.fake.queries), 1)
+
+        # The first page is not retrieved again
+        docs = list(paginator)
+        self.assertEqual(len(docs), 25)
+        self.assertEqual([query[2] for query in self.fake.queries], [1, 2, 3])
+
+    def testStreaming(self):
+        """ Test that pages are only retrieved as results are consumed. """
+        paginator = iter(Paginator("ihmp", '"sample"[node_type]',
+                                   read_ahead=0))
+
+        for _result in range(10):
+            next(paginator)
+
+        self.assertEqual(len(self.fake.queries), 1)
+
+        next(paginator)
+        self.assertEqual(len(self.fake.queries), 2)
+
+    def testReadAhead(self):
+        """ Test that later pages are retrieved in the background. """
+        self.fake.total = 95
+        self.session.read_ahead = 2
+
+        paginator = Paginator("ihmp", '"sample"[node_type]')
+        self.assertEqual(paginator.read_ahead, 2)
+
+        pages = paginator.pages()
+        first = next(pages)
+        self.assertEqual(len(first), 10)
+
+        # Wait for the background thread to fill its buffer
+        for _attempt in range(50):
+            if len(self.fake.queries) >= 4:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.fake.queries), 4)
+
+        ids = [doc['id'] for doc in first]
+        for results in pages:
+            ids.extend([doc['id'] for doc in results])
+
+        self.assertEqual(ids, ["id%s" % n for n in range(95)])
+        self.assertEqual([query[2] for query in self.fake.queries], range(1, 11))
+
+    def testReadAheadError(self):
+        """ Test that errors in the background are raised to the consumer. """
+        fetch = self.fake.oql_query
+
+        def failing_query(namespace, query, page=1):
+            if page == 2:
+                raise Exception("Unable to retrieve page 2.")
+            return fetch(namespace, query, page)
+
+        self.fake_session.answer_with(failing_query)
+
+        pages = Paginator("ihmp", "query", read_ahead=1).pages()
+        next(pages)
+
+        with self.assertRaises(Exception):
+            next(pages)
+
+    def testReadAheadAbandoned(self):
+        """ Test that the background thread stops if iteration stops. """
+        self.fake.total = 1000
+
+        pages = Paginator("ihmp", "query", read_ahead=1).pages()
+        next(pages)
+        next(pages)
+        pages.close()
+
+        time.sleep(0.3)
+        fetched = len(self.fake.queries)
+        time.sleep(0.3)
+
+        self.assertTrue(fetched < 100)
+        self.assertEqual(len(self.fake.queries), fetched)
+
+    def testEmpty(self):
+        """ Test a query without results. """
+        self.fake.total = 0
+
+        self.assertEqual(list(Paginator("ihmp", '"sample"[node_type]')), [])
+        self.assertEqual(len(self.fake.queries), 1)
+
+    def testLoader(self):
+        """ Test that documents are passed through the loader. """
+        paginator = Paginator("ihmp", "query", loader=lambda doc: doc['id'])
+
+        self.assertEqual(list(paginator)[:2], ["id0", "id1"])
+
+    def testIterSearch(self):
+        """ Test that node classes stream search results of their type. """
+        results = Sample.iter_search('"abc"[tags]')
+
+        self.assertEqual(results.result_count, 25)
+        self.assertEqual(self.fake.queries[0][1],
+                         '("abc"[tags]) && "sample"[node_type]')
+
+        self.fake.total = 0
+
+        self.assertEqual(Sample.search(), [])
+        self.assertEqual(self.fake.queries[-1][1], '"sample"[node_type]')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+""" A unittest script for the registry module. """
+
+import unittest
+from cutlass import Sample, Subject, WgsDnaPrep
+from cutlass import registry
+
+# pylint: disable=W0703, C1801
+
+class RegistryTest(unittest.TestCase):
+    """ A unit test class for the registry module. """
+
+    def testNodeClass(self):
+        """ Test looking up the class for a node type. """
+        self.assertTrue(registry.node_class("sample") is Sample)
+        self.assertTrue(registry.node_class("wgs_dna_prep") is WgsDnaPrep)
+
+        # Every registered node type resolves to a class
+        for node_type in registry.NODE_TYPES:
+            self.assertTrue(isinstance(registry.node_class(node_type), type))
+
+        with self.assertRaises(ValueError):
+            registry.node_class("not_a_node_type")
+
+    def testNodeLoader(self):
+        """ Test looking up the loader for a node type. """
+        self.assertEqual(registry.node_loader("subject"), Subject.load_subject)
+
+        with self.assertRaises(ValueError):
+            registry.node_loader("not_a_node_type")
+
+    def testLoadDocument(self):
+        """ Test converting documents of any node type into objects. """
+        doc = {
+            'id': "subjectid",
+            'ver': 1,
+            'node_type': "subject",
+            'linkage': {"participates_in": ["studyid"]},
+            'meta': {"gender": "male", "rand_subject_id": "rand",
+                     "tags": []}
+        }
+
+        subject = registry.load_document(doc)
+
+        self.assertTrue(isinstance(subject, Subject))
+        self.assertEqual(subject.id, "subjectid")
+
+        with self.assertRaises(ValueError):
+            registry.load_document({'node_type': "not_a_node_type"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+""" A unittest script for the RetryPolicy module. """
+
+import errno
+import socket
+import unittest
+from cutlass.RetryPolicy import RetryPolicy, CircuitBreaker, CircuitOpenError
+from cutlass.RetryPolicy import ServerStatusError, is_transient
+
+# pylint: disable=W0703, C1801
+
+class FlakyCall(object):
+    """ Fails with the given exceptions before succeeding. """
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+
+        if self.failures:
+            raise self.failures.pop(0)
+
+        return value
+
+def refused():
+    """ A connection refused error. """
+    return socket.error(errno.ECONNREFUSED, "Connection refused")
+
+class RetryPolicyTest(unittest.TestCase):
+    """ A unit test class for the RetryPolicy module. """
+
+    def testTransient(self):
+        """ Test the classification of errors. """
+        self.failUnless(is_transient(refused()))
+        self.failUnless(is_transient(ServerStatusError(503)))
+        self.failIf(is_transient(ServerStatusError(400)))
+
+        # Failures are classified on their status, not their message
+        self.failIf(is_transient(Exception("Unable to retrieve node document.")))
+        self.failIf(is_transient(Exception("Unable to retrieve node document. " + \
+                                           "Reason: Not found")))
+        self.failIf(is_transient(ValueError("Unable to parse")))
+        self.failIf(is_transient(CircuitOpenError("open")))
+
+    def testInvalidAttempts(self):
+        """ Test that the number of attempts must be a positive integer. """
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def testBackoff(self):
+        """ Test that the backoff doubles up to the maximum. """
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+
+        self.assertEqual([policy.backoff(n) for n in range(1, 6)], [1, 2, 4, 5, 5])
+
+        policy.jitter = True
+        self.failUnless(0 <= policy.backoff(3) <= 4)
+
+    def testRetry(self):
+        """ Test that transient failures are retried. """
+        policy = RetryPolicy(base_delay=0, jitter=False)
+        call = FlakyCall(refused(), ServerStatusError(502))
+
+        self.assertEqual(policy.call(call, ("done",)), "done")
+        self.assertEqual(call.calls, 3)
+
+    def testGiveUp(self):
+        """ Test that retries stop after the maximum attempts. """
+        policy = RetryPolicy(max_attempts=2, base_delay=0)
+        call = FlakyCall(refused(), refused(), refused())
+
+        with self.assertRaises(socket.error):
+            policy.call(call, ("done",))
+
+        self.assertEqual(call.calls, 2)
+
+    def testMaxElapsed(self):
+        """ Test that retries stop once they would take too long. """
+        policy = RetryPolicy(base_delay=10, jitter=False, max_elapsed=1)
+        call = FlakyCall(refused(), refused())
+
+        with self.assertRaises(socket.error):
+            policy.call(call, ("done",))
+
+        self.assertEqual(call.calls, 1)
+
+    def testPermanentFailure(self):
+        """ Test that errors explained by OSDF are not retried. """
+        policy = RetryPolicy(base_delay=0)
+        call = FlakyCall(Exception("Unable to edit node document. Reason: bad"))
+
+        with self.assertRaises(Exception):
+            policy.call(call, ("done",))
+
+        self.assertEqual(call.calls, 1)
+
+    def testNonIdempotent(self):
+        """ Test that requests which may have been received are not repeated. """
+        policy = RetryPolicy(base_delay=0)
+        call = FlakyCall(refused(), socket.error(errno.ECONNRESET, "reset"))
+
+        with self.assertRaises(socket.error):
+            policy.call(call, ("done",), idempotent=False)
+
+        self.assertEqual(call.calls, 2)
+
+    def testCircuitBreaker(self):
+        """ Test that the breaker opens, fails fast and recovers. """
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        policy = RetryPolicy(max_attempts=1)
+
+        for _attempt in range(2):
+            with self.assertRaises(socket.error):
+                policy.call(FlakyCall(refused()), ("done",), breaker=breaker)
+
+        self.assertEqual(breaker.state, "half-open")
+
+        # A successful trial call closes the breaker
+        self.assertEqual(policy.call(FlakyCall(), ("done",), breaker=breaker), "done")
+        self.assertEqual(breaker.state, "closed")
+
+        breaker.reset_timeout = 60
+
+        for _attempt in range(2):
+            with self.assertRaises(socket.error):
+                policy.call(FlakyCall(refused()), ("done",), breaker=breaker)
+
+        self.assertEqual(breaker.state, "open")
+
+        call = FlakyCall()
+
+        with self.assertRaises(CircuitOpenError):
+            policy.call(call, ("done",), breaker=breaker)
+
+        self.assertEqual(call.calls, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ from cutlass import Sample
 from cutlass import MIXS, MixsException
 
 from CutlassTestConfig import CutlassTestConfig
-from CutlassTestUtil import CutlassTestUtil
+from CutlassTestUtil import CutlassTestUtil, FakeSession
 
 # pylint: disable=W0703, C1801
 
@@ -405,5 +405,42 @@ class SampleTest(unittest.TestCase):
         with self.assertRaises(Exception):
             load_test = load_test.load(sample.id)
 
+class SampleQueryTest(unittest.TestCase):
+    """ Tests of the Sample class that need no OSDF server. """
+
+    def testTypedChildQueries(self):
+        """ Test that node type filtering of children is left to OSDF. """
+        fake_session = FakeSession([])
+        queries = fake_session.queries
+
+        with fake_session:
+            sample = Sample()
+            sample._set_id("sampleid")
+
+            self.assertEqual(list(sample.wgsDnaPreps()), [])
+            self.assertEqual(queries[-1], '"sampleid"[linkage.prepared_from] ' + \
+                             '&& "wgs_dna_prep"[node_type]')
+
+            self.assertEqual(list(sample.dnaPreps()), [])
+            self.assertEqual(queries[-1], '"sampleid"[linkage.prepared_from] ' + \
+                             '&& ("16s_dna_prep"[node_type] || ' + \
+                             '"wgs_dna_prep"[node_type])')
+
+            self.assertEqual(list(sample.linked("associated_with")), [])
+            self.assertEqual(queries[-1], '"sampleid"[linkage.associated_with]')
+
+            # Preps and attributes are found with a single query
+            del queries[:]
+            self.assertEqual(list(sample.allChildren()), [])
+            self.assertEqual(len(queries), 1)
+            self.assertTrue(queries[0].startswith(
+                '("sampleid"[linkage.prepared_from] && ("16s_dna_prep"[node_type]'))
+            self.assertTrue(queries[0].endswith(
+                ') || ("sampleid"[linkage.associated_with] && ' + \
+                '"sample_attr"[node_type])'))
+
+        with self.assertRaises(Exception):
+            Sample().linked("prepared_from")
+
 if __name__ == '__main__':
     unittest.main()
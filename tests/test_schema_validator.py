@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+""" A unittest script for the SchemaValidator module. """
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from cutlass.SchemaValidator import SchemaValidator
+
+# pylint: disable=W0703, C1801
+
+SCHEMAS = {
+    "subject": {
+        "type": "object",
+        "properties": {
+            "ns": {"type": "string"},
+            "node_type": {"enum": ["subject"]},
+            "meta": {
+                "type": "object",
+                "properties": {
+                    "rand_subject_id": {"type": "string"},
+                    "gender": {"$ref": "#/definitions/gender"}
+                },
+                "required": ["rand_subject_id", "gender"]
+            }
+        },
+        "required": ["ns", "node_type", "meta"]
+    }
+}
+
+AUX_SCHEMAS = {
+    "gender": {"enum": ["male", "female", "unknown"]}
+}
+
+class FakeOSDF(object):
+    """ Serves schemas the way an OSDF client would, counting requests. """
+    server = "localhost"
+    port = 8123
+
+    def __init__(self):
+        self.requests = 0
+
+    def get_schemas(self, namespace):
+        self.requests += 1
+        return SCHEMAS
+
+    def get_aux_schemas(self, namespace):
+        self.requests += 1
+        return AUX_SCHEMAS
+
+def make_doc(gender="male", node_type="subject"):
+    """ Build a subject document. """
+    return {'ns': "ihmp", 'node_type': node_type, 'linkage': {},
+            'meta': {'rand_subject_id': "abc", 'gender': gender}}
+
+@unittest.skipUnless(SchemaValidator.available(), "jsonschema is not installed")
+class SchemaValidatorTest(unittest.TestCase):
+    """ A unit test class for the SchemaValidator module. """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def testValid(self):
+        """ Test validating a correct document. """
+        validator = SchemaValidator(FakeOSDF(), cache_dir=None)
+
+        self.assertEqual(validator.validate(make_doc()), (True, None))
+
+    def testInvalid(self):
+        """ Test validating documents that break the schema. """
+        validator = SchemaValidator(FakeOSDF(), cache_dir=None)
+
+        (valid, error_message) = validator.validate(make_doc(gender="other"))
+        self.failIf(valid)
+        self.failUnless("other" in error_message)
+
+        doc = make_doc()
+        del doc['meta']['rand_subject_id']
+        (valid, error_message) = validator.validate(doc)
+        self.failIf(valid)
+        self.failUnless("rand_subject_id" in error_message)
+
+    def testUnknownType(self):
+        """ Test that unknown node types are left for the server. """
+        validator = SchemaValidator(FakeOSDF(), cache_dir=None)
+
+        self.failUnless(validator.validate(make_doc(node_type="visit")) is None)
+        self.failUnless(validator.validate({'meta': {}}) is None)
+
+    def testDiskCache(self):
+        """ Test that schemas are fetched once and then read from disk. """
+        osdf = FakeOSDF()
+        validator = SchemaValidator(osdf, cache_dir=self.cache_dir)
+        validator.validate(make_doc())
+        validator.validate(make_doc())
+
+        self.assertEqual(osdf.requests, 2)
+
+        cache_file = os.path.join(self.cache_dir, "localhost_8123", "ihmp.json")
+        self.failUnless(os.path.exists(cache_file))
+
+        with open(cache_file) as cache_fh:
+            self.assertEqual(json.load(cache_fh)['schemas'], SCHEMAS)
+
+        other_osdf = FakeOSDF()
+        validator = SchemaValidator(other_osdf, cache_dir=self.cache_dir)
+
+        self.assertEqual(validator.validate(make_doc()), (True, None))
+        self.assertEqual(other_osdf.requests, 0)
+
+        validator.refresh()
+        self.failIf(os.path.exists(cache_file))
+
+        validator.validate(make_doc())
+        self.assertEqual(other_osdf.requests, 2)
+
+    def testStaleCache(self):
+        """ Test that schemas cached on disk expire. """
+        SchemaValidator(FakeOSDF(), cache_dir=self.cache_dir).validate(make_doc())
+
+        osdf = FakeOSDF()
+        validator = SchemaValidator(osdf, cache_dir=self.cache_dir, max_age=-1)
+        validator.validate(make_doc())
+
+        self.assertEqual(osdf.requests, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+""" A unittest script for the SessionStats module. """
+
+import json
+import unittest
+from cutlass.SessionStats import SessionStats
+
+# pylint: disable=W0703, C1801
+
+class SessionStatsTest(unittest.TestCase):
+    """ A unit test class for the SessionStats module. """
+
+    def testOperations(self):
+        """ Test recording OSDF operations. """
+        stats = SessionStats()
+        stats.record_operation("get_node", 0.002)
+        stats.record_operation("get_node", 0.2, error=True)
+        stats.record_operation("oql_query", 100)
+
+        operations = stats.to_dict()['operations']
+
+        self.assertEqual(sorted(operations.keys()), ["get_node", "oql_query"])
+
+        get_node = operations['get_node']
+        self.assertEqual(get_node['count'], 2)
+        self.assertEqual(get_node['errors'], 1)
+        self.assertAlmostEqual(get_node['mean_time'], 0.101)
+        self.assertEqual(get_node['min_time'], 0.002)
+        self.assertEqual(get_node['max_time'], 0.2)
+        self.assertEqual(get_node['histogram_ms']['<=5'], 1)
+        self.assertEqual(get_node['histogram_ms']['<=250'], 1)
+        self.assertEqual(sum(get_node['histogram_ms'].values()), 2)
+
+        self.assertEqual(operations['oql_query']['histogram_ms']['>60000'], 1)
+
+    def testNetworkAndTransfers(self):
+        """ Test recording network traffic and file transfers. """
+        stats = SessionStats()
+        stats.record_bytes(10, 100)
+        stats.record_bytes(5, 0)
+        stats.record_transfer(3.5, True)
+        stats.record_transfer(1.5, False)
+
+        figures = stats.to_dict()
+
+        self.assertEqual(figures['network'], {'requests': 2, 'bytes_sent': 15,
+                                              'bytes_received': 100})
+        self.assertEqual(figures['transfers']['count'], 2)
+        self.assertEqual(figures['transfers']['errors'], 1)
+        self.assertEqual(figures['transfers']['total_time'], 5.0)
+
+    def testJSONAndReset(self):
+        """ Test dumping the statistics as JSON and resetting them. """
+        stats = SessionStats()
+        stats.record_operation("insert_node", 0.5)
+
+        parsed = json.loads(stats.to_json())
+        self.assertEqual(parsed['operations']['insert_node']['count'], 1)
+
+        stats.reset()
+
+        self.assertEqual(stats.to_dict()['operations'], {})
+        self.assertEqual(stats.to_dict()['network']['requests'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
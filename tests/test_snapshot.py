@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+
+""" A unittest script for the Snapshot module. """
+
+import json
+import unittest
+from cutlass import Project, Visit
+from cutlass.dependency import generator_flatten
+from cutlass.Snapshot import Snapshot
+
+from CutlassTestUtil import FakeNode, FakeSession
+
+# pylint: disable=W0703, C1801
+
+DOCS = [
+    {'id': "study1", 'node_type': "study", 'linkage': {'part_of': ["project1"]}},
+    {'id': "subject1", 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]}},
+    {'id': "subject2", 'node_type': "subject",
+     'linkage': {'participates_in': ["study1"]}},
+    {'id': "attr1", 'node_type': "subject_attr",
+     'linkage': {'associated_with': ["subject1"]}},
+    {'id': "visit1", 'node_type': "visit", 'linkage': {'by': ["subject1"]}},
+    {'id': "visit2", 'node_type': "visit", 'linkage': {'by': ["subject2"]}},
+    {'id': "sample1", 'node_type': "sample",
+     'linkage': {'collected_during': ["visit1", "visit2"]}},
+    {'id': "hostwgs1", 'node_type': "host_wgs_raw_seq_set",
+     'linkage': {'sequenced_from': ["hostprep1"]}},
+    {'id': "call1", 'node_type': "host_variant_call",
+     'linkage': {'computed_from': ["hostwgs1"]}},
+    {'id': "assembly1", 'node_type': "wgs_assembled_seq_set",
+     'linkage': {'computed_from': ["wgs1"]}},
+    {'id': "vattr1", 'node_type': "visit_attr",
+     'linkage': {'associated_with': ["visit3"]}},
+    {'id': "sample2", 'node_type': "sample",
+     'linkage': {'collected_during': ["visit3"]}}
+]
+
+class SnapshotTest(unittest.TestCase):
+    """ A unit test class for the Snapshot module. """
+
+    def setUp(self):
+        self.fake_session = FakeSession(DOCS, load_document=FakeNode)
+        self.fake_session.start()
+        self.queries = self.fake_session.queries
+
+        self.root = FakeNode({'id': "project1", 'node_type': "project",
+                              'linkage': {}})
+
+    def tearDown(self):
+        self.fake_session.stop()
+
+    def testBuild(self):
+        """ Test retrieving a whole tree level by level. """
+        snapshot = Snapshot.build(self.root)
+
+        self.assertEqual([node.id for node in snapshot],
+                         ["project1", "study1", "subject1", "subject2",
+                          "visit1", "attr1", "visit2", "sample1"])
+
+        # One query per level, covering every linkage, not one per node
+        self.assertEqual(len(self.queries), 5)
+
+        self.assertEqual(snapshot.depth("sample1"), 4)
+        self.assertEqual(sorted(node.id for node in snapshot.parents("sample1")),
+                         ["visit1", "visit2"])
+        self.assertEqual([node.id for node in snapshot.children("subject1")],
+                         ["visit1", "attr1"])
+        self.assertEqual([node.id for node in snapshot.of_type("visit")],
+                         ["visit1", "visit2"])
+        self.assertEqual(snapshot.node_type("attr1"), "subject_attr")
+        self.assertEqual(len(snapshot.descendants("subject2")), 2)
+        self.assertTrue("visit2" in snapshot)
+        self.assertTrue(snapshot.get("missing") is None)
+
+        visits = snapshot.filter(lambda node: node.id.startswith("visit"))
+        self.assertEqual(len(visits), 2)
+
+    def testLeafTypes(self):
+        """ Test that node types found only at the leaves are retrieved. """
+        root = FakeNode({'id': "hostwgs1", 'node_type': "host_wgs_raw_seq_set",
+                         'linkage': {}})
+        snapshot = Snapshot.build(root)
+
+        self.assertEqual([node.id for node in snapshot], ["hostwgs1", "call1"])
+        self.assertEqual(snapshot.node_type("call1"), "host_variant_call")
+
+        root = FakeNode({'id': "wgs1", 'node_type': "wgs_raw_seq_set",
+                         'linkage': {}})
+        snapshot = Snapshot.build(root)
+
+        self.assertEqual([node.id for node in snapshot], ["wgs1", "assembly1"])
+
+    def testLimits(self):
+        """ Test limiting the depth and node types of a snapshot. """
+        snapshot = Snapshot.build(self.root, max_depth=2)
+        self.assertEqual(len(snapshot), 4)
+
+        snapshot = Snapshot.build(self.root,
+                                  types=["study", "subject", "subject_attr"])
+        self.assertEqual(sorted(node.id for node in snapshot),
+                         ["attr1", "project1", "study1", "subject1", "subject2"])
+
+    def testSerialize(self):
+        """ Test converting a snapshot to JSON. """
+        snapshot = Snapshot.build(self.root, max_depth=2)
+
+        data = json.loads(snapshot.to_json())
+
+        self.assertEqual(data['root'], "project1")
+        self.assertEqual(len(data['nodes']), 4)
+        self.assertEqual(data['nodes'][1]['id'], "study1")
+        self.assertTrue(["study1", "subject2"] in data['edges'])
+
+    def testNodeSnapshot(self):
+        """ Test taking a snapshot from a node object. """
+        project = Project()
+        project._set_id("project1")
+
+        snapshot = project.snapshot(max_depth=1)
+
+        self.assertTrue(snapshot.root is project)
+        self.assertEqual(snapshot.node_type(project), "project")
+        self.assertEqual([node.id for node in snapshot.descendants()],
+                         ["study1"])
+
+        # Flattened children are walked lazily, depth first
+        del self.queries[:]
+        nodes = project.children(flatten=True)
+
+        self.assertEqual(len(self.queries), 0)
+        self.assertEqual(next(nodes).id, "study1")
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual([node.id for node in nodes],
+                         ["subject1", "visit1", "sample1", "attr1", "subject2",
+                          "visit2", "sample1"])
+
+        with self.assertRaises(Exception):
+            Project().snapshot()
+
+    def testPrunedChildren(self):
+        """ Test that children() only walks the branches it needs. """
+        project = Project()
+        project._set_id("project1")
+
+        visits = list(project.children(include_types=["visit"]))
+
+        self.assertEqual([node.id for node in visits], ["visit1", "visit2"])
+
+        # Neither attributes nor samples were queried
+        self.assertEqual(len(self.queries), 3)
+        self.assertFalse([query for query in self.queries
+                          if "subject_attr" in query or "sample" in query])
+
+        del self.queries[:]
+        nodes = list(project.children(exclude_types=["subject_attr", "visit"]))
+
+        self.assertEqual([node.id for node in nodes],
+                         ["study1", "subject1", "subject2"])
+        self.assertEqual(len(self.queries), 2)
+
+        nodes = list(project.children(max_depth=2))
+        self.assertEqual(len(nodes), 3)
+
+        with self.assertRaises(ValueError):
+            project.children(parallel=2, include_types=["visit"])
+
+    def testChildrenModes(self):
+        """ Test that every mode of children() finds the same nodes. """
+        visit = Visit()
+        visit._set_id("visit3")
+
+        nested = list(generator_flatten(visit.children()))
+        flattened = list(visit.children(flatten=True))
+        parallel = list(visit.children(parallel=2))
+
+        for nodes in (nested, flattened, parallel):
+            self.assertEqual(sorted(node.id for node in nodes),
+                             ["sample2", "vattr1"])
+
+    def testParallelChildren(self):
+        """ Test that parallel traversals find the same nodes as snapshots. """
+        project = Project()
+        project._set_id("project1")
+
+        expected = ["attr1", "sample1", "study1", "subject1", "subject2",
+                    "visit1", "visit2"]
+
+        for ordered in (True, False):
+            nodes = project.children(parallel=2, ordered=ordered)
+            self.assertEqual(sorted(set(node.id for node in nodes)), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+""" A unittest script for the Util module. """
+
+import threading
+import unittest
+from cutlass.Util import run_concurrently, collect_outcomes
+
+# pylint: disable=W0703, C1801
+
+class UtilTest(unittest.TestCase):
+    """ A unit test class for the Util module. """
+
+    def testRunConcurrentlyOrder(self):
+        """ Test that results come back in the order of the items. """
+        outcomes = run_concurrently(lambda x: x * 2, range(20), concurrency=5)
+
+        self.assertEqual(outcomes, [(x * 2, None) for x in range(20)])
+
+    def testRunConcurrentlyErrors(self):
+        """ Test that a failing item does not affect the others. """
+        outcomes = run_concurrently(lambda x: 10 / x, [5, 0, 2], concurrency=3)
+
+        self.assertEqual(outcomes[0], (2, None))
+        self.assertEqual(outcomes[2], (5, None))
+        self.assertTrue(outcomes[1][0] is None)
+        self.assertTrue(isinstance(outcomes[1][1], ZeroDivisionError))
+
+    def testRunConcurrentlyBounded(self):
+        """ Test that no more than the requested number of calls overlap. """
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+        release = threading.Event()
+
+        def work(_item):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            release.wait(0.05)
+            with lock:
+                state['running'] -= 1
+
+        run_concurrently(work, range(12), concurrency=3)
+
+        self.assertTrue(state['peak'] <= 3)
+
+    def testRunConcurrentlySerial(self):
+        """ Test that a concurrency of 1 runs on the calling thread. """
+        caller = threading.current_thread()
+
+        outcomes = run_concurrently(lambda _x: threading.current_thread(),
+                                    [1, 2], concurrency=1)
+
+        for (thread, _exception) in outcomes:
+            self.assertTrue(thread is caller)
+
+    def testCollectOutcomes(self):
+        """ Test splitting outcomes into results and errors. """
+        error = ValueError("bad")
+        (results, errors) = collect_outcomes(["a", "b", "c"],
+                                             [(1, None), (None, error), (3, None)])
+
+        self.assertEqual(results, [1, None, 3])
+        self.assertEqual(errors, {"b": error})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ import tempfile
 from cutlass import WgsRawSeqSet
 
 from CutlassTestConfig import CutlassTestConfig
-from CutlassTestUtil import CutlassTestUtil
+from CutlassTestUtil import CutlassTestUtil, FakeSession
 
 # pylint: disable=W0703, C1801
 
@@ -393,5 +393,21 @@ class WgsRawSeqSetTest(unittest.TestCase):
         with self.assertRaises(Exception):
             load_test = load_test.load(wgsRawSeqSet.id)
 
+class WgsRawSeqSetQueryTest(unittest.TestCase):
+    """ Tests of the WgsRawSeqSet class that need no OSDF server. """
+
+    def testTypedChildQueries(self):
+        """ Test that only viral sequence sets are asked for. """
+        fake_session = FakeSession([])
+
+        with fake_session:
+            seq_set = WgsRawSeqSet()
+            seq_set._set_id("seqsetid")
+
+            self.assertEqual(list(seq_set.viral_seq_sets()), [])
+            self.assertEqual(fake_session.queries,
+                             ['"seqsetid"[linkage.computed_from] ' + \
+                              '&& "viral_seq_set"[node_type]'])
+
 if __name__ == '__main__':
     unittest.main()